@@ -0,0 +1,61 @@
+"""Measures how long it takes to build GetItem and DeleteItem SOAP requests.
+
+Compares building the whole envelope with lxml for every request against
+Operation.get, which splices each body into a cached envelope template.
+
+    python bin/benchmark_envelope.py --count 100000
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lxml import etree
+from pyews import Authentication, GetItem, DeleteItem
+
+
+def build_full_envelope(operation, exchange_version):
+    return etree.tostring(
+        operation.SOAP_MESSAGE_ELEMENT.Envelope(
+            operation.SOAP_NAMESPACE.Header(
+                operation.T_NAMESPACE.RequestedServerVersion(Version=exchange_version),
+                operation._impersonation_header()
+            ),
+            operation.BODY_ELEMENT(
+                operation.soap()
+            )
+        )
+    )
+
+
+def measure(name, operations, build, exchange_version):
+    start = time.perf_counter()
+    for operation in operations:
+        build(operation, exchange_version)
+    elapsed = time.perf_counter() - start
+    print('{:<32} {:>8.3f}s {:>10.0f} requests/s'.format(name, elapsed, len(operations) / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000, help='The number of requests of each operation to build.')
+    parser.add_argument('--exchange-version', default='Exchange2016')
+    parser.add_argument('--impersonate-as', default='')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    Authentication.credentials = ('benchmark@company.com', 'password')
+    Authentication.impersonate_as = args.impersonate_as
+    for cls in (GetItem, DeleteItem):
+        operations = [cls('AAMkADk0N2E4NDEzLTc4{}'.format(i)) for i in range(args.count)]
+        assert build_full_envelope(operations[0], args.exchange_version) == operations[0].get(args.exchange_version)
+        measure('{} full envelope'.format(cls.__name__), operations, build_full_envelope, args.exchange_version)
+        measure('{} cached envelope'.format(cls.__name__), operations, lambda operation, version: operation.get(version), args.exchange_version)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from .ews import EWS
-from .core import Core, ExchangeVersion, Authentication, Endpoints, OAuth2Connector
+from .asyncews import AsyncEWS
+from .core import Core, ExchangeVersion, Authentication, Endpoints, OAuth2Connector, ConnectionPool, EndpointCache, SyncStateStore, MemorySyncStateStore, SQLiteSyncStateStore, TokenCache, RetryPolicy, ConcurrencyLimiter, RateLimiter, Pipeline, AdaptiveChunker, DateRangeSharder
 from .endpoint import *
 from .service import Autodiscover, Operation
 from .utils.searchfilter import SearchFilter
@@ -0,0 +1,457 @@
+import time
+import asyncio
+import contextvars
+import collections
+from .core import Authentication, EndpointCache, ConcurrencyLimiter, AdaptiveChunker, DateRangeSharder
+from .endpoint import GetSearchableMailboxes, GetUserSettings, ResolveNames, SearchMailboxes, ExecuteSearch, GetInboxRules, GetItem, ConvertId, GetHiddenInboxRules, CreateItem, GetServiceConfiguration, GetAttachment, SyncFolderHierarchy, SyncFolderItems, DeleteItem, GetDomainSettings, FindItem, CreateFolder, FindFolder, DeleteFolder
+
+
+class AsyncEWS:
+    """AsyncEWS mirrors the EWS interface using asyncio. Requests are built and
+    parsed by the same endpoint classes but are sent using an aiohttp session, so a
+    single process can keep thousands of requests in flight without a thread each.
+
+    Requires the optional aiohttp dependency (pip install py-ews[async]).
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 1000
+    DEFAULT_LIMIT_PER_HOST = 0
+
+    def __init__(self,
+        username, password, ews_url=None, exchange_version=None, impersonate_as=None,
+        tenant_id=None, client_id=None, client_secret=None, oauth2_authorization_type='auth_code_grant', redirect_uri=None, oauth2_scope=None,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY, limit_per_host=DEFAULT_LIMIT_PER_HOST, verify=True,
+        endpoint_cache_path=EndpointCache.DEFAULT_PATH, endpoint_cache_ttl=EndpointCache.DEFAULT_TTL, sync_state_store=None, retry_policy=None, concurrency_limiter=None, rate_limiter=None, chunker=None):
+        """Creates a new asynchronous EWS interface.
+
+        Use it as an async context manager (or call close) so the HTTP session is closed.
+
+        Args:
+            max_concurrency (int, optional): The maximum number of requests in flight at once. Defaults to 1000.
+            limit_per_host (int, optional): The maximum number of connections per host. 0 means no limit. Defaults to 0.
+            verify (bool, optional): Whether or not to verify SSL certificates. Defaults to True.
+            concurrency_limiter (ConcurrencyLimiter, optional): Adapts the number of requests in flight.
+                Defaults to a ConcurrencyLimiter raising its limit up to max_concurrency.
+
+        All other arguments are the same as the EWS class.
+        """
+        self.authentication = Authentication.scoped()
+        with self.authentication.bind():
+            self.authentication.tenant_id = tenant_id
+            self.authentication.client_id = client_id
+            self.authentication.client_secret = client_secret
+            self.authentication.redirect_uri = redirect_uri
+            self.authentication.oauth2_scope = oauth2_scope
+            self.authentication.credentials = (username, password)
+            self.authentication.oauth2_authorization_type = oauth2_authorization_type
+            self.authentication.ews_url = ews_url
+            self.authentication.exchange_versions = exchange_version
+            self.authentication.impersonate_as = impersonate_as
+            self.authentication.endpoint_cache = EndpointCache(path=endpoint_cache_path, ttl=endpoint_cache_ttl)
+            self.authentication.sync_state_store = sync_state_store
+            self.authentication.retry_policy = retry_policy
+            self.authentication.concurrency_limiter = concurrency_limiter or ConcurrencyLimiter(
+                initial_limit=min(ConcurrencyLimiter.DEFAULT_INITIAL_LIMIT, max_concurrency),
+                max_limit=max_concurrency
+            )
+            self.authentication.rate_limiter = rate_limiter
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.verify = verify
+        self.chunker = chunker or AdaptiveChunker()
+        self.session = None
+        self.__semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __get_session(self):
+        if self.session is None or self.session.closed:
+            import aiohttp
+            connector_kwargs = {} if self.verify else {'ssl': False}
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.limit_per_host, **connector_kwargs)
+            )
+        return self.session
+
+    async def close(self):
+        """Closes the HTTP session and its connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __run(self, endpoint):
+        session = self.__get_session()
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self.__semaphore:
+            return await endpoint.run_async(session)
+
+    def __create(self, endpoint_class, *args, **kwargs):
+        with self.authentication.bind():
+            return endpoint_class(*args, **kwargs)
+
+    async def __run_in_executor(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, contextvars.copy_context().run, function, *args)
+
+    def __fan_out(self):
+        concurrency_limiter = self.authentication.concurrency_limiter
+        if concurrency_limiter:
+            return max(1, int(concurrency_limiter.limit))
+        return self.max_concurrency
+
+    async def __search_lazily(self, shards, search):
+        # a shard is only taken once fewer searches than the concurrency limit are running,
+        # so adaptive chunks and date windows are sized from the requests which completed.
+        # Results are yielded in the order of their shards as soon as they are available.
+        pending = collections.deque()
+        running = set()
+        try:
+            for shard in shards:
+                while len(running) >= self.__fan_out():
+                    done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                task = asyncio.ensure_future(search(*shard))
+                pending.append(task)
+                running.add(task)
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+            while pending:
+                yield await pending[0]
+                pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __gather_lazily(self, shards, search):
+        response = []
+        async for result in self.__search_lazily(shards, search):
+            response.extend(result)
+        return response
+
+    def __sharder(self, date_range):
+        if not date_range or isinstance(date_range, DateRangeSharder):
+            return date_range
+        return DateRangeSharder(*date_range)
+
+    def __chunks(self, reference_id, chunk_size):
+        if chunk_size:
+            return self.chunk(reference_id, chunk_size)
+        return self.chunker.chunks(reference_id)
+
+    def chunk(self, items, n):
+        n = max(1, n)
+        return (items[i:i+n] for i in range(0, len(items), n))
+
+    async def get_service_configuration(self, configuration_name=None, acting_as=None):
+        return await self.__run(self.__create(GetServiceConfiguration, configuration_name=configuration_name, acting_as=acting_as))
+
+    async def get_searchable_mailboxes(self, search_filter=None, expand_group_memberhip=True):
+        return await self.__run(self.__create(GetSearchableMailboxes, search_filter=search_filter, expand_group_memberhip=expand_group_memberhip))
+
+    async def get_user_settings(self, user=None):
+        return await self.__run(self.__create(GetUserSettings, user=user))
+
+    async def resolve_names(self, user=None):
+        return await self.__run(self.__create(ResolveNames, user=user))
+
+    async def __search_shard(self, search_scope, page_size, sharder, window, query, reference_id):
+        # queries restricted to a window are echoed back restricted, so hits are tagged with the original query
+        queries = {DateRangeSharder.aqs(item, window) if window else item: item for item in (query if isinstance(query, list) else [query])}
+        search_query = list(queries) if isinstance(query, list) else next(iter(queries))
+        search_mailboxes = self.__create(SearchMailboxes, query=search_query, reference_id=reference_id, search_scope=search_scope, page_size=page_size)
+        start = time.monotonic()
+        page = await self.__run(search_mailboxes)
+        item_count = search_mailboxes.item_count or 0
+        # a request given up on after throttling is not split, which would only send more requests
+        rejected = page is None and search_mailboxes.rejected
+        if page is not None or rejected:
+            self.chunker.record(len(reference_id), time.monotonic() - start, item_count, failed=rejected)
+        if rejected and isinstance(query, list) and len(query) > 1:
+            # the server may limit the number of queries per request, so they are retried in halves first
+            shards = [(window, half, reference_id) for half in self.chunker.split(query)]
+        elif rejected:
+            # the chunk is retried in halves, which the chunker sizes for the following chunks too
+            shards = [(window, query, half) for half in self.chunker.split(reference_id)]
+        elif window:
+            sharder.record(window, item_count)
+            shards = [(half, query, reference_id) for half in sharder.split(window, item_count)]
+        else:
+            shards = []
+        response = []
+        if page is None or shards:
+            for result in await asyncio.gather(*[self.__search_shard(search_scope, page_size, sharder, *shard) for shard in shards]):
+                response.extend(result)
+            return response
+        while isinstance(page, list):
+            response.extend(page)
+            if not search_mailboxes._next_page(page):
+                break
+            page = await self.__run(search_mailboxes)
+        for item in response:
+            if item and 'query' in item:
+                item['query'] = queries.get(item['query'], item['query'])
+        return response
+
+    def __search_mailboxes(self, query, reference_id, search_scope, chunk_size, page_size=None, sharder=None, queries_per_request=SearchMailboxes.MAX_QUERIES):
+        if not isinstance(reference_id, list):
+            reference_id = [reference_id]
+        queries = list(self.chunk(query, queries_per_request)) if isinstance(query, list) else [query]
+        windows = sharder.windows() if sharder else [None]
+        shards = (
+            (window, batch, chunk)
+            for window in windows for chunk in self.__chunks(reference_id, chunk_size) for batch in queries
+        )
+        return self.__search_lazily(shards, lambda window, batch, chunk: self.__search_shard(search_scope, page_size, sharder, window, batch, chunk))
+
+    async def execute_ews_search(self, query, reference_id, search_scope='All', chunk_size=None, batch_size=GetItem.DEFAULT_BATCH_SIZE, page_size=SearchMailboxes.DEFAULT_PAGE_SIZE, date_range=None, queries_per_request=SearchMailboxes.MAX_QUERIES):
+        return [item async for item in self.iter_ews_search(query, reference_id, search_scope=search_scope, chunk_size=chunk_size, batch_size=batch_size, page_size=page_size, date_range=date_range, queries_per_request=queries_per_request)]
+
+    async def iter_ews_search(self, query, reference_id, search_scope='All', chunk_size=None, batch_size=GetItem.DEFAULT_BATCH_SIZE, page_size=SearchMailboxes.DEFAULT_PAGE_SIZE, date_range=None, queries_per_request=SearchMailboxes.MAX_QUERIES):
+        sharder = self.__sharder(date_range)
+        async for response in self.__search_mailboxes(query, reference_id, search_scope, chunk_size, page_size, sharder, queries_per_request):
+            hits = [item for item in response if item and (not sharder or sharder.first_seen((item.get('query'), item['id'].get('id'))))]
+            for batch in self.chunk(hits, batch_size):
+                for item in await self.__with_details(batch, batch_size):
+                    yield item
+
+    async def __with_details(self, hits, batch_size):
+        return_list = []
+        items_by_id = await self.get_items(list(dict.fromkeys(item['id'].get('id') for item in hits)), batch_size=batch_size)
+        for item in hits:
+            return_dict = item
+            get_item_response = items_by_id.get(return_dict['id'].get('id'))
+            if get_item_response:
+                for item_response in get_item_response:
+                    if item_response and item_response.get('message').get('attachments') and item_response.get('message').get('attachments').get('file_attachment').get('attachment_id').get('id'):
+                        attachment_details_list = []
+                        attachment = await self.get_attachment(item_response.get('message').get('attachments').get('file_attachment').get('attachment_id').get('id'))
+                        for attach in attachment or []:
+                            attachment_dict = {}
+                            if attach:
+                                for key,val in attach.items():
+                                    for k,v in val.items():
+                                        attachment_dict[k] = v
+                            if attachment_dict:
+                                attachment_details_list.append(attachment_dict)
+                        if attachment_details_list:
+                            return_dict.update({'attachment_details': attachment_details_list})
+                    return_dict.update(item_response.get('message'))
+            return_list.append(return_dict)
+        return return_list
+
+    async def __statistics(self, query, reference_id, search_scope):
+        return [await self.__run(self.__create(SearchMailboxes, query=query, reference_id=reference_id, search_scope=search_scope, result_type='StatisticsOnly'))]
+
+    async def estimate(self, query, reference_id, search_scope='All', chunk_size=None):
+        if not isinstance(reference_id, list):
+            reference_id = [reference_id]
+        statistics = await self.__gather_lazily(
+            ((query, chunk, search_scope) for chunk in self.__chunks(reference_id, chunk_size)),
+            self.__statistics
+        )
+        return SearchMailboxes.merge_statistics(statistics)
+
+    async def execute_outlook_search(self, query, result_row_count='25', max_results_count='-1'):
+        return await self.__run(self.__create(ExecuteSearch, query=query, result_row_count=result_row_count, max_results_count=max_results_count))
+
+    async def get_inbox_rules(self, user=None):
+        return await self.__run(self.__create(GetInboxRules, user=user))
+
+    async def get_hidden_inbox_rules(self):
+        return await self.__run(self.__create(GetHiddenInboxRules))
+
+    async def get_item(self, item_id, change_key=None, additional_properties=None):
+        response = await self.__run(self.__create(GetItem, item_id, change_key=change_key, additional_properties=additional_properties))
+        if isinstance(response, list) and response:
+            if any(item in response for item in ConvertId.ID_FORMATS):
+                convert_id_response = await self.__run(self.__create(ConvertId, self.authentication.credentials[0], item_id, id_type=response[0], convert_to=response[1]))
+                get_item_response = await self.__run(self.__create(GetItem, convert_id_response[0], additional_properties=additional_properties))
+                return get_item_response if get_item_response else None
+        return response
+
+    async def get_items(self, item_ids, batch_size=GetItem.DEFAULT_BATCH_SIZE, additional_properties=None):
+        get_items = [self.__create(GetItem, chunk, batch_size=batch_size, additional_properties=additional_properties) for chunk in self.chunk(list(item_ids), batch_size)]
+        await asyncio.gather(*[self.__run(get_item) for get_item in get_items])
+        results_by_id = {}
+        for get_item in get_items:
+            results_by_id.update(get_item.results_by_id)
+        return_dict = {}
+        for item_id in item_ids:
+            message = results_by_id.get(item_id)
+            if message and message.get('response_class') == 'Success' and message.get('items'):
+                return_dict[item_id] = [message.get('items')]
+            elif GetItem.needs_convert_id(message):
+                return_dict[item_id] = await self.get_item(item_id, additional_properties=additional_properties)
+            else:
+                return_dict[item_id] = None
+        return return_dict
+
+    async def get_attachment(self, attachment_id):
+        return await self.__run(self.__create(GetAttachment, attachment_id=attachment_id))
+
+    async def sync_folder_hierarchy(self, well_known_folder_name=None, sync_state=None):
+        return await self.__run(self.__create(SyncFolderHierarchy, well_known_folder_name=well_known_folder_name, sync_state=sync_state))
+
+    async def iter_sync_folder_hierarchy(self, well_known_folder_name=None, sync_state=None, reset_sync_state=False):
+        sync_state_store = self.authentication.sync_state_store
+        sync_folder_hierarchy = self.__create(SyncFolderHierarchy, well_known_folder_name=well_known_folder_name, sync_state=sync_state, sync_state_store=sync_state_store)
+        if reset_sync_state and sync_state_store:
+            await self.__run_in_executor(sync_state_store.delete, sync_folder_hierarchy._mailbox, sync_folder_hierarchy._sync_state_key)
+        async for change in sync_folder_hierarchy.changes_async(self.__get_session()):
+            yield change
+
+    async def sync_folder_items(self, folder_id, change_key=None, sync_state=None, max_changes_returned=SyncFolderItems.MAX_CHANGES_RETURNED, additional_properties=None):
+        return await self.__run(self.__create(SyncFolderItems, folder_id, change_key=change_key, sync_state=sync_state, max_changes_returned=max_changes_returned, additional_properties=additional_properties))
+
+    async def iter_sync_folder_items(self, folder_id, change_key=None, sync_state=None, max_changes_returned=SyncFolderItems.MAX_CHANGES_RETURNED, reset_sync_state=False, additional_properties=None):
+        sync_state_store = self.authentication.sync_state_store
+        sync_folder_items = self.__create(SyncFolderItems, folder_id, change_key=change_key, sync_state=sync_state, max_changes_returned=max_changes_returned, sync_state_store=sync_state_store, additional_properties=additional_properties)
+        if reset_sync_state and sync_state_store:
+            await self.__run_in_executor(sync_state_store.delete, sync_folder_items._mailbox, folder_id)
+        async for change in sync_folder_items.changes_async(self.__get_session()):
+            yield change
+
+    async def create_item(self, subject, sender, to_recipients, body_type='HTML'):
+        return await self.__run(self.__create(CreateItem, **{'Subject': subject, 'BodyType': body_type, 'Sender': sender, 'ToRecipients': to_recipients}))
+
+    async def delete_item(self, item_id, delete_type='MoveToDeletedItems', batch_size=DeleteItem.DEFAULT_BATCH_SIZE):
+        if not isinstance(item_id, list):
+            item_id = [item_id]
+        item_id = [item for item in item_id if item]
+        delete_items = [self.__create(DeleteItem, chunk, delete_type=delete_type) for chunk in self.chunk(item_id, batch_size)]
+        await asyncio.gather(*[self.__run(delete_item) for delete_item in delete_items])
+        results_by_id = {}
+        for delete_item in delete_items:
+            results_by_id.update(delete_item.results_by_id)
+        return_list = []
+        for item in item_id:
+            result = results_by_id.get(item) or {}
+            return_list.append({
+                'item_id': item,
+                'response_class': result.get('response_class'),
+                'response_code': result.get('response_code'),
+                'message_text': result.get('message_text')
+            })
+        return return_list
+
+    async def search_and_delete_message(self, query, chunk_size=None, what_if=False):
+        reference_id_list = []
+        for mailbox in await self.get_searchable_mailboxes() or []:
+            if mailbox:
+                reference_id_list.append(mailbox.get('reference_id'))
+        if not reference_id_list:
+            print('No searchable mailboxes found')
+            return None
+        item_ids = []
+        async for response in self.__search_mailboxes(query, reference_id_list, 'All', chunk_size):
+            for item in response:
+                if item:
+                    if what_if:
+                        print('WHAT IF: About to delete message ID: {}'.format(item.get('id').get('id')))
+                    else:
+                        item_ids.append(item.get('id').get('id'))
+        return await self.delete_item(item_ids)
+
+    async def get_domain_settings(self, domain=None):
+        return await self.__run(self.__create(GetDomainSettings, domain=domain))
+
+    async def find_items(self,
+                    query_string,
+                    distinguished_folder_name='inbox',
+                    base_shape='AllProperties',
+                    include_mime_content=True,
+                    body_type='Best',
+                    traversal='Shallow',
+                    reset_cache=False,
+                    return_deleted_items=True,
+                    return_highlight_terms=True,
+                    page_size=None,
+                    batch_size=GetItem.DEFAULT_BATCH_SIZE,
+                    additional_properties=None,
+                    date_range=None
+        ):
+        kwargs = dict(query_string=query_string, distinguished_folder_name=distinguished_folder_name, base_shape=base_shape, include_mime_content=include_mime_content, body_type=body_type, traversal=traversal, reset_cache=reset_cache, return_deleted_items=return_deleted_items, return_highlight_terms=return_highlight_terms, page_size=page_size, additional_properties=additional_properties)
+        sharder = self.__sharder(date_range)
+        if sharder:
+            item_ids = await self.__gather_lazily(((window,) for window in sharder.windows()), lambda window: self.__find_window(sharder, kwargs, window))
+        else:
+            item_ids = await self.__find_item_ids(self.__create(FindItem, **kwargs))
+        return await self.__get_items_in_order(item_ids, batch_size, additional_properties)
+
+    async def iter_find_items(self,
+                    query_string,
+                    distinguished_folder_name='inbox',
+                    base_shape='AllProperties',
+                    include_mime_content=True,
+                    body_type='Best',
+                    traversal='Shallow',
+                    reset_cache=False,
+                    return_deleted_items=True,
+                    return_highlight_terms=True,
+                    page_size=None,
+                    batch_size=GetItem.DEFAULT_BATCH_SIZE,
+                    additional_properties=None
+        ):
+        find_item = self.__create(FindItem, query_string=query_string, distinguished_folder_name=distinguished_folder_name, base_shape=base_shape, include_mime_content=include_mime_content, body_type=body_type, traversal=traversal, reset_cache=reset_cache, return_deleted_items=return_deleted_items, return_highlight_terms=return_highlight_terms, page_size=page_size, additional_properties=additional_properties)
+        item_ids = []
+        async for message in find_item.paginate_async(self.__get_session()):
+            if message:
+                item_ids.append(message.get('item_id').get('id'))
+            if len(item_ids) >= batch_size:
+                for item in await self.__get_items_in_order(item_ids, batch_size, additional_properties):
+                    yield item
+                item_ids = []
+        for item in await self.__get_items_in_order(item_ids, batch_size, additional_properties):
+            yield item
+
+    async def __find_item_ids(self, find_item):
+        return [message.get('item_id').get('id') async for message in find_item.paginate_async(self.__get_session()) if message]
+
+    async def __find_window(self, sharder, kwargs, window):
+        item_ids = await self.__find_item_ids(self.__create(FindItem, date_range=window, **kwargs))
+        sharder.record(window, len(item_ids))
+        return [item_id for item_id in item_ids if sharder.first_seen(item_id)]
+
+    async def __get_items_in_order(self, item_ids, batch_size, additional_properties=None):
+        if not item_ids:
+            return []
+        items_by_id = await self.get_items(item_ids, batch_size=batch_size, additional_properties=additional_properties)
+        return [item for item_id in item_ids for item in items_by_id.get(item_id) or []]
+
+    async def __find_as(self, user, **kwargs):
+        with self.authentication.impersonation(user):
+            return await self.__run(self.__create(FindItem, **kwargs))
+
+    async def search_mailboxes_using_find_item(self,
+                    query_string,
+                    impersonation_list,
+                    distinguished_folder_name='inbox',
+                    base_shape='AllProperties',
+                    include_mime_content=True,
+                    body_type='Best',
+                    traversal='Shallow',
+                    reset_cache=False,
+                    return_deleted_items=True,
+                    return_highlight_terms=True):
+        results = await asyncio.gather(*[
+            self.__find_as(user, query_string=query_string, distinguished_folder_name=distinguished_folder_name, base_shape=base_shape, include_mime_content=include_mime_content, body_type=body_type, traversal=traversal, reset_cache=reset_cache, return_deleted_items=return_deleted_items, return_highlight_terms=return_highlight_terms)
+            for user in impersonation_list if user
+        ])
+        response = []
+        for result in results:
+            if isinstance(result, list):
+                response.extend(result)
+        return response
+
+    async def create_search_folder(self, search_string, display_name='Search Folder', base_folder='inbox', traversal='Deep'):
+        return await self.__run(self.__create(CreateFolder, search_string=search_string, search_folder=True, display_name=display_name, base_folder=base_folder, traversal=traversal))
+
+    async def find_search_folder(self):
+        return await self.__run(self.__create(FindFolder))
+
+    async def delete_search_folder(self, folder_id):
+        return await self.__run(self.__create(DeleteFolder, folder_id=folder_id))
@@ -2,4 +2,14 @@ from .authentication import Authentication
 from .core import Core
 from .endpoints import Endpoints
 from .exchangeversion import ExchangeVersion
-from .oauth2connector import OAuth2Connector
\ No newline at end of file
+from .oauth2connector import OAuth2Connector
+from .connectionpool import ConnectionPool
+from .endpointcache import EndpointCache
+from .syncstatestore import SyncStateStore, MemorySyncStateStore, SQLiteSyncStateStore
+from .tokencache import TokenCache
+from .retrypolicy import RetryPolicy
+from .concurrencylimiter import ConcurrencyLimiter
+from .ratelimiter import RateLimiter
+from .pipeline import Pipeline
+from .adaptivechunker import AdaptiveChunker
+from .daterangesharder import DateRangeSharder
\ No newline at end of file
@@ -0,0 +1,120 @@
+import threading
+
+
+class AdaptiveChunker:
+    """AdaptiveChunker sizes the chunks of mailboxes searched by each
+    SearchMailboxes request from the latency and number of results observed
+    for previous requests.
+
+    The time and results per mailbox are tracked as moving averages. Chunks
+    grow (at most doubling per request) towards the number of mailboxes which
+    can be searched within target_latency while returning at most max_results
+    items. A chunk which fails, for example because the search timed out, halves
+    the chunk size and is split in two so both halves can be retried.
+    """
+
+    DEFAULT_INITIAL_SIZE = 25
+    DEFAULT_MIN_SIZE = 1
+    DEFAULT_MAX_SIZE = 500
+    DEFAULT_TARGET_LATENCY = 20.0
+    DEFAULT_MAX_RESULTS = 10000
+    DEFAULT_SMOOTHING = 0.3
+
+    def __init__(self, initial_size=DEFAULT_INITIAL_SIZE, min_size=DEFAULT_MIN_SIZE, max_size=DEFAULT_MAX_SIZE, target_latency=DEFAULT_TARGET_LATENCY, max_results=DEFAULT_MAX_RESULTS, smoothing=DEFAULT_SMOOTHING):
+        """Creates a new adaptive chunker.
+
+        Args:
+            initial_size (int, optional): The number of mailboxes per request before any request has completed. Defaults to 25.
+            min_size (int, optional): The smallest number of mailboxes per request. Defaults to 1.
+            max_size (int, optional): The largest number of mailboxes per request. Defaults to 500.
+            target_latency (float, optional): The number of seconds a request should take. Defaults to 20.0.
+            max_results (int, optional): The number of results a request should match at most. Defaults to 10000.
+            smoothing (float, optional): The weight of the latest request in the moving averages. Defaults to 0.3.
+        """
+        if not 1 <= min_size <= initial_size <= max_size:
+            raise ValueError('The sizes must satisfy 1 <= min_size <= initial_size <= max_size')
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.max_results = max_results
+        self.smoothing = smoothing
+        self.size = initial_size
+        self.latency_per_mailbox = None
+        self.results_per_mailbox = None
+        self.success_count = 0
+        self.failure_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        """A dictionary of the current chunk size, the moving averages per
+        mailbox and the number of successful and failed requests.
+        """
+        with self._lock:
+            return {
+                'size': self.size,
+                'latency_per_mailbox': self.latency_per_mailbox,
+                'results_per_mailbox': self.results_per_mailbox,
+                'successes': self.success_count,
+                'failures': self.failure_count
+            }
+
+    def __average(self, average, value):
+        if average is None:
+            return value
+        return average + self.smoothing * (value - average)
+
+    def record(self, mailbox_count, latency, result_count=0, failed=False):
+        """Records the outcome of a request and adjusts the chunk size.
+
+        Args:
+            mailbox_count (int): The number of mailboxes searched by the request.
+            latency (float): The number of seconds the request took.
+            result_count (int, optional): The number of items matched by the request. Defaults to 0.
+            failed (bool, optional): Whether or not the request failed. Defaults to False.
+        """
+        mailbox_count = max(1, mailbox_count)
+        with self._lock:
+            if failed:
+                self.failure_count += 1
+                self.size = max(self.min_size, min(self.size, mailbox_count // 2))
+                return
+            self.success_count += 1
+            self.latency_per_mailbox = self.__average(self.latency_per_mailbox, latency / mailbox_count)
+            self.results_per_mailbox = self.__average(self.results_per_mailbox, result_count / mailbox_count)
+            target = self.max_size
+            if self.latency_per_mailbox > 0:
+                target = min(target, self.target_latency / self.latency_per_mailbox)
+            if self.results_per_mailbox > 0:
+                target = min(target, self.max_results / self.results_per_mailbox)
+            self.size = int(max(self.min_size, min(self.size * 2, target, self.max_size)))
+
+    def chunks(self, items):
+        """Yields consecutive chunks of items, each sized by the chunk size at the time it is taken.
+
+        Args:
+            items (list): The mailboxes to split into chunks.
+
+        Yields:
+            list: A chunk of items.
+        """
+        index = 0
+        while index < len(items):
+            with self._lock:
+                size = self.size
+            yield items[index:index + size]
+            index += size
+
+    def split(self, chunk):
+        """Splits a failed chunk in two halves which can be retried.
+
+        Args:
+            chunk (list): The chunk which failed.
+
+        Returns:
+            list: The halves of the chunk or an empty list if it can not be split.
+        """
+        if len(chunk) < 2:
+            return []
+        middle = len(chunk) // 2
+        return [chunk[:middle], chunk[middle:]]
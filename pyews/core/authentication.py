@@ -1,7 +1,18 @@
+import copy
 from os import access
+from contextlib import contextmanager
+from contextvars import ContextVar
 from .exchangeversion import ExchangeVersion
 from .core import Core
 from .oauth2connector import OAuth2Connector
+from .connectionpool import ConnectionPool
+from .endpointcache import EndpointCache
+from .tokencache import TokenCache
+from .retrypolicy import RetryPolicy
+
+
+_impersonations = ContextVar('impersonations', default={})
+_authentication = ContextVar('authentication', default=None)
 
 
 class AuthenticationProperties(type):
@@ -15,14 +26,54 @@ class AuthenticationProperties(type):
                 cls.auth_header = None
             cls.ews_url = None
             cls.exchange_versions = None
+            cls.token_cache.clear()
             if cls.tenant_id and cls.client_id and cls.client_secret:
                 if not cls.oauth2_authorization_type:
                     print('Please provide an OAuth2 Authorization Types before continuing')
                 else:
-                    try:
-                        cls.access_token = getattr(OAuth2Connector(), cls.oauth2_authorization_type)()
-                    except:
-                        cls.access_token = getattr(OAuth2Connector(endpoint_version='v2'), cls.oauth2_authorization_type)()
+                    cls.token_cache.get(cls.__fetch_token, cls.__refresh_token)
+
+    def __fetch_token(cls):
+        try:
+            connector = OAuth2Connector(authentication=cls)
+            getattr(connector, cls.oauth2_authorization_type)()
+        except:
+            connector = OAuth2Connector(endpoint_version='v2', authentication=cls)
+            getattr(connector, cls.oauth2_authorization_type)()
+        cls._oauth2_endpoint_version = connector.endpoint_version
+        return connector.token
+
+    def __refresh_token(cls, refresh_token):
+        return OAuth2Connector(endpoint_version=cls._oauth2_endpoint_version or 'v1', authentication=cls).refresh_token_grant(refresh_token)
+
+    def scoped(cls):
+        """Creates a new Authentication class with its own credentials, endpoints,
+        token cache, connection pool and caches. Changing it does not affect
+        Authentication or any other scoped class, so a single process can
+        serve many accounts or tenants at once.
+
+        Returns:
+            Authentication: A new Authentication class with default values.
+        """
+        defaults = {key: copy.copy(value) for key, value in _DEFAULTS.items()}
+        return type(cls)(cls.__name__, (cls,), defaults)
+
+    @contextmanager
+    def bind(cls):
+        """Uses this Authentication class for every endpoint created in the
+        current thread (or asyncio task) while the context is active.
+        """
+        token = _authentication.set(cls)
+        try:
+            yield cls
+        finally:
+            _authentication.reset(token)
+
+    def current(cls):
+        """Returns the Authentication class bound to the current context
+        or Authentication if none is bound.
+        """
+        return _authentication.get() or Authentication
 
     @property
     def oauth2_authorization_type(cls):
@@ -60,11 +111,27 @@ class AuthenticationProperties(type):
 
     @property
     def access_token(cls):
+        if cls.oauth2_authorization_type and cls.tenant_id and cls.client_id and cls.client_secret:
+            return cls.token_cache.get(cls.__fetch_token, cls.__refresh_token)
         return cls._access_token
 
     @access_token.setter
     def access_token(cls, value):
         cls._access_token = value
+        if value:
+            cls.token_cache.set(value)
+        else:
+            cls.token_cache.clear()
+
+    @property
+    def token_cache(cls):
+        if not cls._token_cache:
+            cls._token_cache = TokenCache()
+        return cls._token_cache
+
+    @token_cache.setter
+    def token_cache(cls, value):
+        cls._token_cache = value
 
     @property
     def redirect_uri(cls):
@@ -84,12 +151,17 @@ class AuthenticationProperties(type):
 
     @property
     def auth_header(cls):
-        cls.__set_initial_property_values()
-        if cls.access_token:
-            cls._auth_header.update({
-                'Authorization': 'Bearer {}'.format(cls.access_token)
+        impersonate_as = cls.impersonate_as
+        if impersonate_as != '':
+            header = {'X-AnchorMailbox': impersonate_as}
+        else:
+            header = dict(cls._auth_header)
+        access_token = cls.access_token
+        if access_token:
+            header.update({
+                'Authorization': 'Bearer {}'.format(access_token)
             })
-        return cls._auth_header
+        return header
 
     @auth_header.setter
     def auth_header(cls, value):
@@ -106,6 +178,9 @@ class AuthenticationProperties(type):
 
     @property
     def impersonate_as(cls):
+        impersonations = _impersonations.get()
+        if cls in impersonations:
+            return impersonations[cls]
         if not cls._impersonate_as:
             cls._impersonate_as = ''
         return cls._impersonate_as
@@ -117,6 +192,22 @@ class AuthenticationProperties(type):
         else:
             cls._impersonate_as = value
 
+    @contextmanager
+    def impersonation(cls, value):
+        """Impersonates the provided user for every request sent from the current
+        thread (or asyncio task) while the context is active. Unlike setting
+        impersonate_as, this does not affect requests sent from other threads.
+
+        Args:
+            value (str): The user to impersonate. A falsy value disables impersonation within the context.
+        """
+        # keyed by class so impersonating with one scoped class leaves the others untouched
+        token = _impersonations.set({**_impersonations.get(), cls: value or ''})
+        try:
+            yield
+        finally:
+            _impersonations.reset(token)
+
     @property
     def credentials(cls):
         return cls._credentials
@@ -156,6 +247,62 @@ class AuthenticationProperties(type):
         else:
             cls._ews_url = value
 
+    @property
+    def connection_pool(cls):
+        if not cls._connection_pool:
+            cls._connection_pool = ConnectionPool()
+        return cls._connection_pool
+
+    @connection_pool.setter
+    def connection_pool(cls, value):
+        if cls._connection_pool and cls._connection_pool is not value:
+            cls._connection_pool.close()
+        cls._connection_pool = value
+
+    @property
+    def endpoint_cache(cls):
+        if not cls._endpoint_cache:
+            cls._endpoint_cache = EndpointCache()
+        return cls._endpoint_cache
+
+    @endpoint_cache.setter
+    def endpoint_cache(cls, value):
+        cls._endpoint_cache = value
+
+    @property
+    def retry_policy(cls):
+        if not cls._retry_policy:
+            cls._retry_policy = RetryPolicy()
+        return cls._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(cls, value):
+        cls._retry_policy = value
+
+    @property
+    def concurrency_limiter(cls):
+        return cls._concurrency_limiter
+
+    @concurrency_limiter.setter
+    def concurrency_limiter(cls, value):
+        cls._concurrency_limiter = value
+
+    @property
+    def rate_limiter(cls):
+        return cls._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(cls, value):
+        cls._rate_limiter = value
+
+    @property
+    def sync_state_store(cls):
+        return cls._sync_state_store
+
+    @sync_state_store.setter
+    def sync_state_store(cls, value):
+        cls._sync_state_store = value
+
     @property
     def domain(cls):
         return cls._domain
@@ -182,9 +329,23 @@ class Authentication(object, metaclass=AuthenticationProperties):
     _client_secret = None
     _tenant_id = None
     _access_token = None
+    _token_cache = None
+    _oauth2_endpoint_version = None
     _impersonate_as = None
     _credentials = tuple()
     _exchange_versions = []
     _ews_url = []
     _domain = None
+    _connection_pool = None
+    _endpoint_cache = None
+    _sync_state_store = None
+    _retry_policy = None
+    _concurrency_limiter = None
+    _rate_limiter = None
     _redirect_uri = 'https://google.com'
+
+
+_DEFAULTS = {
+    key: copy.copy(value) for key, value in Authentication.__dict__.items()
+    if key.startswith('_') and not key.startswith('__')
+}
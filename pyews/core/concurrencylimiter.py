@@ -0,0 +1,122 @@
+import time
+import asyncio
+import threading
+
+
+class ConcurrencyLimiter:
+    """ConcurrencyLimiter bounds the number of EWS requests in flight and
+    adapts the bound using additive increase / multiplicative decrease (AIMD).
+
+    Every healthy response raises the limit by 1/limit, so the limit grows by
+    about one request per round trip. A throttled response or a response slower
+    than latency_threshold multiplies the limit by backoff_factor. A request
+    which failed without a response, for example because a fallback endpoint is
+    unreachable, only frees its slot and leaves the limit unchanged. Requests
+    which were already in flight when the limit was cut do not cut it again,
+    so a burst of throttled responses only counts once.
+
+    A single limiter is shared by every request of an ``EWS`` or ``AsyncEWS``
+    instance, so all of its fan-out methods tune themselves to the tenant's
+    throttling budget.
+    """
+
+    DEFAULT_INITIAL_LIMIT = 8
+    DEFAULT_MIN_LIMIT = 1
+    DEFAULT_MAX_LIMIT = 64
+    DEFAULT_BACKOFF_FACTOR = 0.5
+    DEFAULT_LATENCY_THRESHOLD = 30.0
+
+    def __init__(self, initial_limit=DEFAULT_INITIAL_LIMIT, min_limit=DEFAULT_MIN_LIMIT, max_limit=DEFAULT_MAX_LIMIT, backoff_factor=DEFAULT_BACKOFF_FACTOR, latency_threshold=DEFAULT_LATENCY_THRESHOLD):
+        """Creates a new concurrency limiter.
+
+        Args:
+            initial_limit (int, optional): The number of requests allowed in flight at first. Defaults to 8.
+            min_limit (int, optional): The lowest the limit is reduced to. Defaults to 1.
+            max_limit (int, optional): The highest the limit is raised to. Defaults to 64.
+            backoff_factor (float, optional): The factor the limit is multiplied by when requests are throttled. Defaults to 0.5.
+            latency_threshold (float, optional): Responses slower than this number of seconds are treated as congestion. Defaults to 30.0.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('The limits must satisfy 1 <= min_limit <= initial_limit <= max_limit')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_factor = backoff_factor
+        self.latency_threshold = latency_threshold
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.increase_count = 0
+        self.decrease_count = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self._waiters = []
+
+    @property
+    def stats(self):
+        """A dictionary of the current limit, the requests in flight and the
+        number of times the limit was raised and cut.
+        """
+        with self._condition:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'increases': self.increase_count,
+                'decreases': self.decrease_count
+            }
+
+    def acquire(self):
+        """Waits until another request may be sent.
+
+        Returns:
+            float: A token which must be passed to release once the response has been received.
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+            return time.monotonic()
+
+    async def acquire_async(self):
+        """Waits without blocking the event loop until another request may be sent.
+
+        Returns:
+            float: A token which must be passed to release once the response has been received.
+        """
+        while True:
+            with self._condition:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return time.monotonic()
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+    @staticmethod
+    def __wake(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def release(self, token, throttled=False, error=False):
+        """Records the outcome of a request and adjusts the limit.
+
+        Args:
+            token (float): The token returned by acquire.
+            throttled (bool, optional): Whether or not the request was throttled. Defaults to False.
+            error (bool, optional): Whether or not the request failed without a response, in which case the limit is not adjusted. Defaults to False.
+        """
+        now = time.monotonic()
+        with self._condition:
+            self.in_flight -= 1
+            if throttled or (not error and now - token > self.latency_threshold):
+                if token >= self._last_decrease:
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff_factor)
+                    self._last_decrease = now
+                    self.decrease_count += 1
+            elif not error and self.limit < self.max_limit:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                self.increase_count += 1
+            self._condition.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self.__wake, waiter)
@@ -0,0 +1,87 @@
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ConnectionPool:
+    """ConnectionPool keeps one keep-alive ``requests.Session`` per
+    EWS host so TCP/TLS connections (and NTLM/Basic negotiation) are
+    reused between SOAP requests instead of being renegotiated for each call.
+
+    Sessions are created lazily and are safe to share between the
+    worker threads used by the ``EWS`` fan-out methods.
+    """
+
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 50
+    DEFAULT_MAX_RETRIES = 3
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, max_retries=DEFAULT_MAX_RETRIES, keep_alive=True, verify=True):
+        """Creates a pool of HTTP sessions keyed by host.
+
+        Args:
+            pool_connections (int, optional): The number of connection pools to cache per session. Defaults to 10.
+            pool_maxsize (int, optional): The maximum number of connections kept open per host. Defaults to 50.
+            max_retries (int, optional): The number of retries for failed connections (not failed EWS responses). Defaults to 3.
+            keep_alive (bool, optional): Whether or not connections are kept alive between requests. Defaults to True.
+            verify (bool, optional): Whether or not to verify SSL certificates. Defaults to True.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.keep_alive = keep_alive
+        self.verify = verify
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __build_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=self.max_retries,
+            pool_block=False
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.verify = self.verify
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def session(self, url):
+        """Returns the shared session for the host of the provided url.
+
+        Args:
+            url (str): An EWS or Autodiscover url.
+
+        Returns:
+            requests.Session: A pooled session for the url's host.
+        """
+        host = urlparse(url).netloc.lower()
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self.__build_session()
+                    self._sessions[host] = session
+        return session
+
+    def post(self, url, **kwargs):
+        """Sends a POST request using the pooled session for the url's host.
+
+        Returns:
+            requests.Response: The response returned by the server.
+        """
+        return self.session(url).post(url, **kwargs)
+
+    def close(self):
+        """Closes all pooled sessions and their connections.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
@@ -1,5 +1,6 @@
 import xmltodict
 import json
+from lxml import etree
 
 from ..utils.logger import LoggingBase
 
@@ -9,6 +10,10 @@ class Core(metaclass=LoggingBase):
     required authentication details as well as parsing of results
     """
 
+    PARSER_BACKEND = 'lxml'
+    PARSER_BACKENDS = ['lxml', 'xmltodict']
+    XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+
     def camel_to_snake(self, s):
         if s != 'UserDN':
             return ''.join(['_'+c.lower() if c.isupper() else c for c in s]).lstrip('_')
@@ -51,17 +56,150 @@ class Core(metaclass=LoggingBase):
                                 fields_found.append(another_result)
         return fields_found
 
+    def _to_element(self, soap_response):
+        if isinstance(soap_response, etree._ElementTree):
+            return soap_response.getroot()
+        if isinstance(soap_response, etree._Element):
+            return soap_response
+        if isinstance(soap_response, str):
+            soap_response = soap_response.encode('utf-8')
+        elif not isinstance(soap_response, bytes):
+            soap_response = str(soap_response).encode('utf-8')
+        return etree.fromstring(soap_response, parser=self.XML_PARSER)
+
+    def _element_key(self, name, namespace_dict):
+        if name[0] != '{':
+            return name
+        namespace, _, local = name[1:].partition('}')
+        if namespace_dict is None:
+            return '{}:{}'.format(namespace, local)
+        short_namespace = namespace_dict.get(namespace, namespace)
+        if not short_namespace:
+            return local
+        return '{}:{}'.format(short_namespace, local)
+
+    def _namespace_declarations(self, root):
+        """Mirrors how xmltodict attaches namespace declarations: they are
+        collected in document order and attached (as an ``xmlns`` attribute)
+        to the next element which has attributes.
+        """
+        declarations = {}
+        pending = {}
+        parent_nsmaps = {None: {}}
+        for element in root.iter(tag=etree.Element):
+            nsmap = element.nsmap
+            parent_nsmap = parent_nsmaps.get(element.getparent(), {})
+            for prefix, uri in nsmap.items():
+                if parent_nsmap.get(prefix) != uri:
+                    pending[prefix or ''] = uri
+            if len(element):
+                parent_nsmaps[element] = nsmap
+            if element.attrib and pending:
+                declarations[element] = pending
+                pending = {}
+        return declarations
+
+    def _element_to_dict(self, element, namespace_dict, process, declarations):
+        """Converts an lxml element into the same structure xmltodict produces
+        and, when process is True, applies the snake_case key processing of
+        ``_process_dict`` in the same pass.
+        """
+        process_key = self.__process_keys if process else lambda key: key
+        item = None
+        if element.attrib:
+            item = {}
+            for key, value in element.attrib.items():
+                item[process_key('@' + self._element_key(key, namespace_dict))] = value
+            if element in declarations:
+                item[process_key('@xmlns')] = {process_key(key): value for key, value in declarations[element].items()}
+        data = [element.text] if element.text else []
+        children = {}
+        for child in element:
+            if child.tail:
+                data.append(child.tail)
+            if isinstance(child.tag, str):
+                children.setdefault(self._element_key(child.tag, namespace_dict), []).append(child)
+        if children:
+            if item is None:
+                item = {}
+            for key, values in children.items():
+                if len(values) == 1:
+                    item[process_key(key)] = self._element_to_dict(values[0], namespace_dict, process, declarations)
+                else:
+                    item[process_key(key)] = [self._element_to_dict(value, namespace_dict, False, declarations) for value in values]
+        text = ''.join(data).strip() or None
+        if item is None:
+            return text
+        if text:
+            item[process_key('#text')] = text
+        return item
+
+    def _find_results(self, element, field, namespace_dict, declarations):
+        """Finds every element named field in the same order as
+        ``_get_recursively`` does on the xmltodict output.
+        """
+        results = []
+        children = {}
+        for child in element:
+            if isinstance(child.tag, str):
+                children.setdefault(self._element_key(child.tag, namespace_dict), []).append(child)
+        for key, values in children.items():
+            if key == field:
+                results.append(values)
+            else:
+                for value in values:
+                    results.extend(self._find_results(value, field, namespace_dict, declarations))
+        return results
+
+    def _iter_response_messages(self, root):
+        """Yields each ResponseMessage element of a SOAP response in order.
+
+        Args:
+            root (lxml.etree._Element): The parsed SOAP response.
+        """
+        for response_messages in root.iter('{*}ResponseMessages'):
+            for element in response_messages:
+                if isinstance(element.tag, str):
+                    yield element
+
     def parse_response(self, soap_response, namespace_dict=None):
         """parse_response is standardized to parse all soap_responses from
         EWS requests
 
+        The default lxml backend walks the response tree once, locating
+        the RESULTS_KEY elements and building snake_case dictionaries
+        directly. The xmltodict backend is kept for compatibility.
+
         Args:
-            soap_response (BeautifulSoup): EWS SOAP response returned from the Base class
+            soap_response (lxml.etree._Element): EWS SOAP response returned from the Base class. bytes, str and BeautifulSoup objects are also accepted.
             namespace_dict (dict, optional): A dictionary of namespaces to process. Defaults to None.
 
         Returns:
             list: Returns a list of dictionaries containing parsed responses from EWS requests.
         """
+        if self.PARSER_BACKEND == 'xmltodict':
+            return self._parse_response_xmltodict(soap_response, namespace_dict=namespace_dict)
+        root = self._to_element(soap_response)
+        declarations = self._namespace_declarations(root)
+        root_key = self._element_key(root.tag, namespace_dict)
+        if hasattr(self, 'RESULTS_KEY'):
+            if root_key == self.RESULTS_KEY:
+                search_response = [[root]]
+            else:
+                search_response = self._find_results(root, self.RESULTS_KEY, namespace_dict, declarations)
+            if search_response:
+                return_list = []
+                for elements in search_response:
+                    for element in elements:
+                        return_list.append(self._element_to_dict(element, namespace_dict, True, declarations))
+                return return_list
+        return {
+            self.__process_keys(root_key): self._element_to_dict(root, namespace_dict, True, declarations)
+        }
+
+    def _parse_response_xmltodict(self, soap_response, namespace_dict=None):
+        if isinstance(soap_response, (etree._Element, etree._ElementTree)):
+            soap_response = etree.tostring(soap_response, encoding='unicode')
         ordered_dict = xmltodict.parse(str(soap_response), process_namespaces=True, namespaces=namespace_dict)
         item_dict = json.loads(json.dumps(ordered_dict))
         if hasattr(self, 'RESULTS_KEY'):
@@ -0,0 +1,151 @@
+import datetime
+import threading
+
+
+class DateRangeSharder:
+    """DateRangeSharder splits a search over a long period into windows of
+    received dates which are searched in parallel.
+
+    Windows are handed out lazily and sized from the hit density reported by
+    earlier windows, so each window matches about target_hits items. A window
+    matching more than max_hits items is split in two so no search runs into
+    the server's result caps. Results of all windows are merged by item id.
+    """
+
+    DEFAULT_WINDOW = datetime.timedelta(days=30)
+    DEFAULT_MIN_WINDOW = datetime.timedelta(days=1)
+    DEFAULT_MAX_WINDOW = datetime.timedelta(days=366)
+    DEFAULT_TARGET_HITS = 5000
+    DEFAULT_MAX_HITS = 50000
+
+    def __init__(self, start, end, window=DEFAULT_WINDOW, min_window=DEFAULT_MIN_WINDOW, max_window=DEFAULT_MAX_WINDOW, target_hits=DEFAULT_TARGET_HITS, max_hits=DEFAULT_MAX_HITS):
+        """Creates a new sharder for items received from start up to (but not including) end.
+
+        Args:
+            start (datetime.date): The first received date to search.
+            end (datetime.date): The received date the search stops before.
+            window (datetime.timedelta, optional): The length of the first windows. Defaults to 30 days.
+            min_window (datetime.timedelta, optional): The shortest window. Defaults to 1 day.
+            max_window (datetime.timedelta, optional): The longest window. Defaults to 366 days.
+            target_hits (int, optional): The number of items a window should match. Defaults to 5000.
+            max_hits (int, optional): Windows matching more items are split in two. Defaults to 50000.
+        """
+        self.start = self.__to_date(start)
+        self.end = self.__to_date(end)
+        self.min_days = max(1, min_window.days)
+        self.max_days = max(self.min_days, max_window.days)
+        self.days = min(self.max_days, max(self.min_days, window.days))
+        self.target_hits = target_hits
+        self.max_hits = max_hits
+        self.window_count = 0
+        self.split_count = 0
+        self.duplicate_count = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def __to_date(value):
+        if isinstance(value, datetime.datetime):
+            return value.date()
+        return value
+
+    @property
+    def stats(self):
+        """A dictionary of the current window length in days and the number of
+        windows searched, windows split and duplicate items dropped.
+        """
+        with self._lock:
+            return {
+                'days': self.days,
+                'windows': self.window_count,
+                'splits': self.split_count,
+                'duplicates': self.duplicate_count
+            }
+
+    def windows(self):
+        """Yields consecutive (start, end) windows covering the date range, each
+        sized by the window length at the time it is taken. Starting a new
+        iteration forgets the items seen by the previous one.
+
+        Yields:
+            tuple: The first received date of the window and the date it ends before.
+        """
+        with self._lock:
+            self._seen = set()
+            self.duplicate_count = 0
+        start = self.start
+        while start < self.end:
+            with self._lock:
+                days = self.days
+                self.window_count += 1
+            end = min(self.end, start + datetime.timedelta(days=days))
+            yield start, end
+            start = end
+
+    def record(self, window, hits):
+        """Records the number of items matched by a window and adjusts the
+        length of the following windows.
+
+        Args:
+            window (tuple): The window which was searched.
+            hits (int): The number of items it matched.
+        """
+        days = (window[1] - window[0]).days
+        with self._lock:
+            if hits:
+                target = days * self.target_hits / hits
+            else:
+                target = self.max_days
+            self.days = int(min(self.max_days, max(self.min_days, min(self.days * 2, target))))
+
+    def split(self, window, hits):
+        """Splits a window which matched more than max_hits items in two halves.
+
+        Args:
+            window (tuple): The window which was searched.
+            hits (int): The number of items it matched.
+
+        Returns:
+            list: The halves of the window or an empty list if it should not be split.
+        """
+        days = (window[1] - window[0]).days
+        if hits <= self.max_hits or days < 2 * self.min_days:
+            return []
+        with self._lock:
+            self.split_count += 1
+        middle = window[0] + datetime.timedelta(days=days // 2)
+        return [(window[0], middle), (middle, window[1])]
+
+    def first_seen(self, item_id):
+        """Checks whether an item is seen for the first time, so results of
+        overlapping or retried windows are only returned once.
+
+        Args:
+            item_id (str): The id of the item.
+
+        Returns:
+            bool: False if the item was already returned.
+        """
+        with self._lock:
+            if item_id in self._seen:
+                self.duplicate_count += 1
+                return False
+            self._seen.add(item_id)
+            return True
+
+    @staticmethod
+    def aqs(query, window):
+        """Restricts an Advanced Query Syntax (AQS) query to the items received within a window.
+
+        Args:
+            query (str): The query.
+            window (tuple): The first received date and the date the window ends before. Datetimes are searched by their date.
+
+        Returns:
+            str: The restricted query.
+        """
+        start, end = (DateRangeSharder.__to_date(value) for value in window)
+        received = 'received>={} AND received<{}'.format(start.isoformat(), end.isoformat())
+        if not query:
+            return received
+        return '({}) AND {}'.format(query, received)
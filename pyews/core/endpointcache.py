@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import threading
+
+
+class EndpointCache:
+    """EndpointCache remembers the EWS url and Exchange version which
+    last succeeded for an operation family (Operation or Autodiscover)
+    and mailbox domain, so later requests go straight to the working combination
+    instead of attempting every url and version.
+
+    Entries are kept in memory and expire after a configurable TTL. When a
+    path is provided they are also persisted to a JSON file between runs.
+    """
+
+    DEFAULT_PATH = None
+    DEFAULT_TTL = 86400
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL):
+        """Creates a new endpoint cache.
+
+        Args:
+            path (str, optional): The file used to persist entries between runs (e.g. ~/.pyews/endpoint_cache.json). Defaults to None (memory only).
+            ttl (int, optional): The number of seconds an entry is valid for. Defaults to 86400.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def __key(self, family, mailbox):
+        # every mailbox of a domain is served by the same endpoints
+        return '{}|{}'.format(family, (mailbox or '').rpartition('@')[2].lower())
+
+    def __load(self):
+        if self._entries is None:
+            self._entries = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError):
+                    self._entries = {}
+        return self._entries
+
+    def __save(self):
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+            with open(temp_path, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    def get(self, family, mailbox):
+        """Returns the cached (endpoint, exchange_version) pair.
+
+        Args:
+            family (str): The operation family. Either Operation or Autodiscover.
+            mailbox (str): The mailbox the request is sent for.
+
+        Returns:
+            tuple: A (endpoint, exchange_version) tuple or None if nothing valid is cached.
+        """
+        with self._lock:
+            entry = self.__load().get(self.__key(family, mailbox))
+            if entry and entry.get('expires', 0) > time.time():
+                return entry.get('endpoint'), entry.get('exchange_version')
+        return None
+
+    def set(self, family, mailbox, endpoint, exchange_version):
+        """Caches the (endpoint, exchange_version) pair which succeeded.
+
+        Args:
+            family (str): The operation family. Either Operation or Autodiscover.
+            mailbox (str): The mailbox the request was sent for.
+            endpoint (str): The EWS url which succeeded.
+            exchange_version (str): The Exchange version which succeeded.
+        """
+        key = self.__key(family, mailbox)
+        with self._lock:
+            entries = self.__load()
+            entry = entries.get(key)
+            if entry and entry.get('endpoint') == endpoint and entry.get('exchange_version') == exchange_version \
+                    and entry.get('expires', 0) - time.time() > self.ttl / 2:
+                return
+            entries[key] = {
+                'endpoint': endpoint,
+                'exchange_version': exchange_version,
+                'expires': time.time() + self.ttl
+            }
+            self.__save()
+
+    def invalidate(self, family, mailbox):
+        """Removes a cached pair which no longer works.
+
+        Args:
+            family (str): The operation family. Either Operation or Autodiscover.
+            mailbox (str): The mailbox the request was sent for.
+        """
+        with self._lock:
+            if self.__load().pop(self.__key(family, mailbox), None):
+                self.__save()
+
+    def clear(self):
+        """Removes all cached entries.
+        """
+        with self._lock:
+            self._entries = {}
+            self.__save()
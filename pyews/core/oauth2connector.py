@@ -22,7 +22,7 @@ class OAuth2Connector:
         }
     }
 
-    def __init__(self, endpoint_version='v1'):
+    def __init__(self, endpoint_version='v1', authentication=None):
         """OAuth2Connector is the base (parent) class of both Search and Delete classes.  It is used to perform either delegated authentication flows
         like: (Single-Page, Web Apps, Mobile & Native Apps - Grant Auth Flow) or you can use it in the application authentication auth flows like: (Client Credentials Grant Auth Flow)
 
@@ -35,36 +35,40 @@ class OAuth2Connector:
             password (str, optional): The password used to authenticate to Azure or Office 365. Defaults to None. If provided, will use delegated authentication flows
             scopes (list, optional): A list of scopes defined during your Azure AD application registration. Defaults to ['https://graph.microsoft.com/.default'].
             verify_ssl (bool, optional): Whether to verify SSL or not. Defaults to True.
+            authentication (Authentication, optional): The Authentication class to read settings from. Defaults to the Authentication class bound to the current context.
         """
         from .authentication import Authentication
+        if authentication is None:
+            authentication = Authentication.current()
         self.endpoint_version = endpoint_version
         self.verify = True
-        self.username = Authentication.credentials[0]
-        self.password = Authentication.credentials[1]
-        self.client_id = Authentication.client_id
-        self.client_secret = Authentication.client_secret
-        self.tenant_id = Authentication.tenant_id
-        self.access_token = Authentication.access_token
-        self.redirect_uri = Authentication.redirect_uri
+        self.username = authentication.credentials[0]
+        self.password = authentication.credentials[1]
+        self.client_id = authentication.client_id
+        self.client_secret = authentication.client_secret
+        self.tenant_id = authentication.tenant_id
+        self.access_token = authentication._access_token
+        self.redirect_uri = authentication.redirect_uri
         self.authorize_url = self.AUTH_MAP.get(endpoint_version).get('authorize_url').format(tenant_id=self.tenant_id)
         self.token_url = self.AUTH_MAP.get(endpoint_version).get('token_url').format(tenant_id=self.tenant_id)
         if endpoint_version == 'v1':
             self.resource = self.AUTH_MAP.get(endpoint_version).get('resource')
         else:
             self.resource = None
-        if not Authentication.oauth2_scope:
+        if not authentication.oauth2_scope:
             if endpoint_version == 'v2':
                 self.scope = [self.AUTH_MAP.get(endpoint_version).get('scope')]
             else:
                 self.scope = None
         else:
-            self.scope = Authentication.oauth2_scope
+            self.scope = authentication.oauth2_scope
         self.session = requests.Session()
         self.session.headers = {
             'Content-Type': 'application/x-www-form-urlencoded'
         }
         self.session.verify = self.verify
         self.expiration = None
+        self.token = None
 
     def __prompt_user(self, url, full_response=False):
         print('Please go here and authorize: ', url)
@@ -106,7 +110,8 @@ class OAuth2Connector:
                 "client_secret": self.client_secret
             }
         )
-        return response.json()
+        self.token = response.json()
+        return self.token
 
     def auth_code_grant(self):
         """Authorization Code Flow Grant
@@ -129,7 +134,8 @@ grant_type=authorization_code
 &redirect_uri={self.redirect_uri} 
 '''
         response = self.session.request('POST', self.token_url, data=body)
-        return response.json().get('access_token')
+        self.token = response.json()
+        return self.token.get('access_token')
 
     def client_credentials_grant(self):
         """Client Credentials Code Flow Grant
@@ -150,6 +156,7 @@ grant_type=authorization_code
                 'grant_type' : 'client_credentials'
             }
         response = self.session.request('POST', self.token_url, data=body).json()
+        self.token = response
         return response['access_token']
 
     def implicit_grant_flow(self):
@@ -166,7 +173,8 @@ grant_type=authorization_code
             'nonce': 678910
         }
         url = self.__build_query_param_url(self.authorize_url, params)
-        return self.__prompt_user(url)
+        self.token = self.__prompt_user(url)
+        return self.token
 
     def web_application_flow(self):
         oauth = OAuth2Session(
@@ -180,6 +188,7 @@ grant_type=authorization_code
             client_secret=self.client_secret,
             authorization_response=self.__prompt_user(authorization_url, full_response=True)
         )
+        self.token = token
         return token
 
     def legacy_app_flow(self):
@@ -211,6 +220,7 @@ grant_type=authorization_code
         except InvalidGrantError as e:
             print(e)
             raise Exception('Please use another authorization method. I suggest trying the auth_code_grant() method.') 
+        self.token = token
         return token['access_token']
 
     def backend_app_flow(self):
@@ -230,4 +240,30 @@ grant_type=authorization_code
                 client_secret=self.client_secret,
                 scope=self.scope
             )
+        self.token = token
         return token['access_token']
+
+    def refresh_token_grant(self, refresh_token):
+        """Refresh Token Grant
+        Reference: https://docs.microsoft.com/en-us/azure/active-directory/develop/v2-oauth2-auth-code-flow#refresh-the-access-token
+
+        Args:
+            refresh_token (str): The refresh_token returned by a previous grant.
+
+        Returns:
+            dict: The token response containing the new access_token and expires_in.
+        """
+        body = {
+            'client_id' : self.client_id,
+            'client_secret' : self.client_secret,
+            'grant_type' : 'refresh_token',
+            'refresh_token' : refresh_token
+        }
+        if self.resource:
+            body['resource'] = self.resource
+        elif self.scope:
+            body['scope'] = ' '.join(self.scope) if isinstance(self.scope, list) else self.scope
+        response = self.session.request('POST', self.token_url, data=body)
+        response.raise_for_status()
+        self.token = response.json()
+        return self.token
@@ -0,0 +1,116 @@
+import queue
+import threading
+import contextvars
+
+
+class Pipeline:
+    """Pipeline runs a series of stages, each with its own pool of worker threads,
+    connected by bounded queues.
+
+    Every stage is a function which receives one item from the previous stage and
+    returns an iterable of items for the next one. Results are yielded as soon as
+    they leave the last stage, and a stage blocks once the queue in front of the
+    next stage is full, so only a bounded number of items is held in memory.
+
+    Workers run in a copy of the context the pipeline was created in, so endpoints
+    created by a stage use the Authentication bound at that time.
+    """
+
+    DEFAULT_QUEUE_SIZE = 100
+
+    _DONE = object()
+
+    def __init__(self, source, stages, queue_size=DEFAULT_QUEUE_SIZE):
+        """Creates a new pipeline. Threads are started when it is iterated.
+
+        Args:
+            source (iterable): The items fed to the first stage.
+            stages (list): A list of (function, thread_count) tuples.
+            queue_size (int, optional): The maximum number of items waiting in front of each stage. Defaults to 100.
+        """
+        self.source = source
+        self.stages = [(function, max(1, int(thread_count))) for function, thread_count in stages]
+        self.queue_size = max(1, int(queue_size))
+        self._context = contextvars.copy_context()
+        self._stopped = threading.Event()
+        self._errors = []
+
+    def __put(self, target, item):
+        while not self._stopped.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __fail(self, error):
+        self._errors.append(error)
+        self._stopped.set()
+
+    def __feed(self, target):
+        try:
+            for item in self.source:
+                if not self.__put(target, item):
+                    return
+        except Exception as e:
+            self.__fail(e)
+        finally:
+            self.__put(target, self._DONE)
+
+    def __work(self, function, source, target, remaining, lock):
+        try:
+            while not self._stopped.is_set():
+                try:
+                    item = source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is self._DONE:
+                    # let the other workers of this stage see the end of the input
+                    self.__put(source, item)
+                    break
+                for result in function(item) or []:
+                    if not self.__put(target, result):
+                        return
+        except Exception as e:
+            self.__fail(e)
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last = not remaining[0]
+            if last:
+                self.__put(target, self._DONE)
+
+    def __start(self, target, *args):
+        thread = threading.Thread(target=self._context.copy().run, args=(target,) + args, daemon=True)
+        thread.start()
+        return thread
+
+    def __iter__(self):
+        self._stopped = threading.Event()
+        self._errors = []
+        # the source is only read as fast as the first stage's workers take items from it
+        queues = [queue.Queue(maxsize=self.stages[0][1] if self.stages else self.queue_size)]
+        queues.extend(queue.Queue(maxsize=self.queue_size) for _ in self.stages)
+        threads = [self.__start(self.__feed, queues[0])]
+        for index, (function, thread_count) in enumerate(self.stages):
+            remaining, lock = [thread_count], threading.Lock()
+            for _ in range(thread_count):
+                threads.append(self.__start(self.__work, function, queues[index], queues[index + 1], remaining, lock))
+        try:
+            while True:
+                try:
+                    item = queues[-1].get(timeout=0.1)
+                except queue.Empty:
+                    if self._stopped.is_set():
+                        break
+                    continue
+                if item is self._DONE:
+                    break
+                yield item
+        finally:
+            self._stopped.set()
+            for thread in threads:
+                thread.join()
+        if self._errors:
+            raise self._errors[0]
@@ -0,0 +1,167 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+
+
+class RateLimiter:
+    """RateLimiter enforces request budgets using token buckets keyed by
+    the mailbox a request is sent for (the impersonated user or the account
+    itself) and by the service account sending it, mirroring how Exchange
+    applies its throttling policies per user and per tenant.
+
+    Each bucket holds up to burst tokens and is refilled at rate tokens per
+    second. A request waits until both of its buckets hold a token.
+
+    Buckets are kept in memory by default. When a path is provided they are
+    stored in a SQLite database so several processes on one host share the
+    same budget.
+    """
+
+    def __init__(self, mailbox_rate=None, mailbox_burst=None, account_rate=None, account_burst=None, path=None, timeout=30, sleep=time.sleep):
+        """Creates a new rate limiter. A rate of None disables that bucket.
+
+        Args:
+            mailbox_rate (float, optional): The requests per second allowed per mailbox. Defaults to None.
+            mailbox_burst (int, optional): The number of requests a mailbox may send at once. Defaults to mailbox_rate (at least 1).
+            account_rate (float, optional): The requests per second allowed per service account. Defaults to None.
+            account_burst (int, optional): The number of requests an account may send at once. Defaults to account_rate (at least 1).
+            path (str, optional): A SQLite database used to share buckets between processes. Defaults to None.
+            timeout (int, optional): Seconds to wait for a lock held by another process. Defaults to 30.
+            sleep (callable, optional): The function used to wait for tokens. Defaults to time.sleep.
+        """
+        self.mailbox_rate = mailbox_rate
+        self.mailbox_burst = mailbox_burst or max(1, int(mailbox_rate or 1))
+        self.account_rate = account_rate
+        self.account_burst = account_burst or max(1, int(account_rate or 1))
+        self.path = path
+        self.sleep = sleep
+        self.wait_count = 0
+        self.total_wait = 0.0
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._connection = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+            with self._lock:
+                self._connection.execute(
+                    'CREATE TABLE IF NOT EXISTS token_bucket ('
+                    'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+                )
+
+    @property
+    def stats(self):
+        """A dictionary of the number of requests which had to wait and the total seconds waited.
+        """
+        with self._lock:
+            return {
+                'waits': self.wait_count,
+                'total_wait': self.total_wait
+            }
+
+    def __buckets(self, account, mailbox):
+        buckets = []
+        if self.account_rate:
+            buckets.append(('account:{}'.format((account or '').lower()), self.account_rate, self.account_burst))
+        if self.mailbox_rate:
+            buckets.append(('mailbox:{}'.format((mailbox or '').lower()), self.mailbox_rate, self.mailbox_burst))
+        return buckets
+
+    def __take(self, buckets, states, now):
+        refilled = {}
+        delay = 0.0
+        for key, rate, burst in buckets:
+            tokens, updated = states.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            refilled[key] = tokens
+            if tokens < 1:
+                delay = max(delay, (1 - tokens) / rate)
+        if not delay:
+            for key in refilled:
+                refilled[key] -= 1
+        return delay, {key: (tokens, now) for key, tokens in refilled.items()}
+
+    def __take_memory(self, buckets):
+        with self._lock:
+            delay, states = self.__take(buckets, self._buckets, time.time())
+            self._buckets.update(states)
+            return delay
+
+    def __take_sqlite(self, buckets):
+        keys = [key for key, rate, burst in buckets]
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                rows = cursor.execute(
+                    'SELECT key, tokens, updated FROM token_bucket WHERE key IN ({})'.format(','.join('?' * len(keys))),
+                    keys
+                ).fetchall()
+                delay, states = self.__take(buckets, {key: (tokens, updated) for key, tokens, updated in rows}, time.time())
+                cursor.executemany(
+                    'INSERT OR REPLACE INTO token_bucket (key, tokens, updated) VALUES (?, ?, ?)',
+                    [(key, tokens, updated) for key, (tokens, updated) in states.items()]
+                )
+                cursor.execute('COMMIT')
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+            return delay
+
+    def take(self, account, mailbox):
+        """Takes a token from the account and mailbox buckets if both have one.
+
+        Args:
+            account (str): The service account sending the request.
+            mailbox (str): The mailbox the request is sent for.
+
+        Returns:
+            float: 0.0 if the request may be sent, otherwise the number of seconds until it may be.
+        """
+        buckets = self.__buckets(account, mailbox)
+        if not buckets:
+            return 0.0
+        if self._connection is not None:
+            return self.__take_sqlite(buckets)
+        return self.__take_memory(buckets)
+
+    def __record_wait(self, delay):
+        with self._lock:
+            self.wait_count += 1
+            self.total_wait += delay
+
+    def wait(self, account, mailbox):
+        """Blocks until a request for the mailbox may be sent by the account.
+        """
+        delay = self.take(account, mailbox)
+        while delay:
+            self.__record_wait(delay)
+            self.sleep(delay)
+            delay = self.take(account, mailbox)
+
+    async def wait_async(self, account, mailbox):
+        """Waits without blocking the event loop until a request for the mailbox may be sent by the account.
+        Buckets stored in SQLite are taken in the default executor.
+        """
+        delay = await self.__take_async(account, mailbox)
+        while delay:
+            self.__record_wait(delay)
+            await asyncio.sleep(delay)
+            delay = await self.__take_async(account, mailbox)
+
+    async def __take_async(self, account, mailbox):
+        if self._connection is None:
+            return self.take(account, mailbox)
+        return await asyncio.get_running_loop().run_in_executor(None, self.take, account, mailbox)
+
+    def close(self):
+        """Closes the database connection when buckets are stored in SQLite.
+        """
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
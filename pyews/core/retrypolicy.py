@@ -0,0 +1,121 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy:
+    """RetryPolicy decides how long to wait before resending a request
+    which Exchange throttled, either with an HTTP 429 or 503 status code
+    or with an ErrorServerBusy response.
+
+    The delay requested by the server (the BackOffMilliseconds detail of
+    ErrorServerBusy or the Retry-After header) is always honoured. Otherwise
+    a jittered exponential backoff is used. Retry counts are kept so callers
+    can monitor how often they are being throttled.
+    """
+
+    THROTTLING_STATUS_CODES = (429, 503)
+    THROTTLING_ERROR_CODES = ('ErrorServerBusy',)
+    DEFAULT_MAX_RETRIES = 5
+    DEFAULT_BASE_DELAY = 1.0
+    DEFAULT_MAX_DELAY = 300.0
+    DEFAULT_JITTER = 0.5
+
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, jitter=DEFAULT_JITTER, sleep=time.sleep):
+        """Creates a new retry policy.
+
+        Args:
+            max_retries (int, optional): The number of times a throttled request is resent before giving up. Defaults to 5.
+            base_delay (float, optional): The backoff in seconds after the first throttled response. Doubles after each retry. Defaults to 1.0.
+            max_delay (float, optional): The maximum backoff in seconds when the server does not request a delay. Defaults to 300.0.
+            jitter (float, optional): The fraction of the backoff which is randomized. Defaults to 0.5.
+            sleep (callable, optional): The function used to wait between retries. Defaults to time.sleep.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.sleep = sleep
+        self.throttled_count = 0
+        self.retry_count = 0
+        self.gave_up_count = 0
+        self.total_delay = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        """A dictionary of the number of throttled responses, retries, requests
+        given up on and the total number of seconds spent waiting.
+        """
+        with self._lock:
+            return {
+                'throttled': self.throttled_count,
+                'retries': self.retry_count,
+                'gave_up': self.gave_up_count,
+                'total_delay': self.total_delay
+            }
+
+    def __retry_after(self, headers):
+        value = (headers or {}).get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def server_delay(self, status_code, headers=None, element=None):
+        """Checks whether a response was throttled.
+
+        Args:
+            status_code (int): The HTTP status code of the response.
+            headers (dict, optional): The HTTP response headers. Defaults to None.
+            element (lxml.etree._Element, optional): The parsed SOAP response. Defaults to None.
+
+        Returns:
+            float: The number of seconds the server asked us to wait (0.0 if it did not say) or None if the response was not throttled.
+        """
+        throttled = status_code in self.THROTTLING_STATUS_CODES
+        delay = None
+        if element is not None:
+            for name in ('ResponseCode', 'ErrorCode', 'faultcode'):
+                found = element.find('.//{*}' + name)
+                if found is not None and found.text and found.text.split(':')[-1] in self.THROTTLING_ERROR_CODES:
+                    throttled = True
+            if throttled:
+                back_off = element.find('.//{*}Value[@Name="BackOffMilliseconds"]')
+                if back_off is not None and back_off.text and back_off.text.strip().isdigit():
+                    delay = int(back_off.text) / 1000.0
+        if not throttled:
+            return None
+        if delay is None:
+            delay = self.__retry_after(headers)
+        return delay or 0.0
+
+    def next_delay(self, attempt, server_delay=0.0):
+        """Records a throttled response and returns how long to wait before retrying.
+
+        Args:
+            attempt (int): The number of retries already made for this request.
+            server_delay (float, optional): The delay requested by the server. Defaults to 0.0.
+
+        Returns:
+            float: The number of seconds to wait or None if the request should not be retried.
+        """
+        with self._lock:
+            self.throttled_count += 1
+            if attempt >= self.max_retries:
+                self.gave_up_count += 1
+                return None
+            backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+            delay = random.uniform(backoff * (1 - self.jitter), backoff)
+            if server_delay:
+                delay = server_delay + random.uniform(0, self.jitter * self.base_delay)
+            self.retry_count += 1
+            self.total_delay += delay
+            return delay
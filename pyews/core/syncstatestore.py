@@ -0,0 +1,112 @@
+import os
+import abc
+import time
+import sqlite3
+import threading
+
+
+class SyncStateStore:
+    """SyncStateStore is the base class for stores which persist the SyncState
+    returned by SyncFolderItems and SyncFolderHierarchy, keyed by mailbox and folder id,
+    so later synchronizations only transfer changes.
+
+    Subclass it and implement get, set and delete to provide another backend.
+    """
+
+    def _mailbox_key(self, mailbox):
+        return (mailbox or '').lower()
+
+    @abc.abstractmethod
+    def get(self, mailbox, folder_id):
+        """Returns the stored SyncState for a mailbox folder or None.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, mailbox, folder_id, sync_state):
+        """Atomically stores the SyncState for a mailbox folder.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, mailbox, folder_id):
+        """Removes the stored SyncState for a mailbox folder.
+        """
+        raise NotImplementedError
+
+
+class MemorySyncStateStore(SyncStateStore):
+    """Keeps sync states in memory for the lifetime of the process.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get(self, mailbox, folder_id):
+        with self._lock:
+            return self._states.get((self._mailbox_key(mailbox), folder_id))
+
+    def set(self, mailbox, folder_id, sync_state):
+        with self._lock:
+            self._states[(self._mailbox_key(mailbox), folder_id)] = sync_state
+
+    def delete(self, mailbox, folder_id):
+        with self._lock:
+            self._states.pop((self._mailbox_key(mailbox), folder_id), None)
+
+
+class SQLiteSyncStateStore(SyncStateStore):
+    """Persists sync states in a SQLite database. Every write is committed
+    in its own transaction so a crash never leaves a partially written state.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.pyews', 'sync_state.db')
+
+    def __init__(self, path=DEFAULT_PATH, timeout=30):
+        """Opens (and creates if needed) the sync state database.
+
+        Args:
+            path (str, optional): The SQLite database file. Defaults to ~/.pyews/sync_state.db.
+            timeout (int, optional): Seconds to wait for a lock held by another process. Defaults to 30.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS sync_state ('
+                'mailbox TEXT NOT NULL, folder_id TEXT NOT NULL, sync_state TEXT NOT NULL, updated REAL NOT NULL, '
+                'PRIMARY KEY (mailbox, folder_id))'
+            )
+
+    def get(self, mailbox, folder_id):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT sync_state FROM sync_state WHERE mailbox = ? AND folder_id = ?',
+                (self._mailbox_key(mailbox), folder_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, mailbox, folder_id, sync_state):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO sync_state (mailbox, folder_id, sync_state, updated) VALUES (?, ?, ?, ?)',
+                (self._mailbox_key(mailbox), folder_id, sync_state, time.time())
+            )
+
+    def delete(self, mailbox, folder_id):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM sync_state WHERE mailbox = ? AND folder_id = ?',
+                (self._mailbox_key(mailbox), folder_id)
+            )
+
+    def close(self):
+        """Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,90 @@
+import time
+import threading
+
+
+class TokenCache:
+    """TokenCache holds the OAuth2 access token returned by an authorization
+    grant together with its expiry, so the token is reused for every SOAP request
+    until shortly before it expires instead of being requested each time.
+
+    When the token is about to expire it is refreshed using the refresh_token
+    (if the grant returned one), otherwise a new token is requested. Refreshing is
+    guarded by a lock so only one of the ``EWS`` worker threads requests a new token.
+    """
+
+    DEFAULT_EXPIRES_IN = 3600
+    DEFAULT_REFRESH_MARGIN = 300
+
+    def __init__(self, refresh_margin=DEFAULT_REFRESH_MARGIN):
+        """Creates a new token cache.
+
+        Args:
+            refresh_margin (int, optional): The number of seconds before expiry at which a token is refreshed. Defaults to 300.
+        """
+        self.refresh_margin = refresh_margin
+        self.access_token = None
+        self.refresh_token = None
+        self.expires_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def valid(self):
+        """Whether or not the cached access token can still be used.
+        """
+        return bool(self.access_token) and self.expires_at is not None \
+            and self.expires_at - self.refresh_margin > time.time()
+
+    def set(self, token):
+        """Stores the token returned by an authorization grant.
+
+        Args:
+            token (dict or str): A token response (containing access_token and optionally expires_in, expires_at and refresh_token) or an access token.
+        """
+        if isinstance(token, dict):
+            access_token = token.get('access_token')
+            refresh_token = token.get('refresh_token') or self.refresh_token
+            if token.get('expires_at'):
+                expires_at = float(token['expires_at'])
+            else:
+                expires_at = time.time() + int(token.get('expires_in') or self.DEFAULT_EXPIRES_IN)
+        else:
+            access_token = token
+            refresh_token = None
+            expires_at = time.time() + self.DEFAULT_EXPIRES_IN
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at if access_token else None
+
+    def get(self, fetch, refresh=None):
+        """Returns a valid access token, requesting a new one if needed.
+
+        Args:
+            fetch (callable): Called without arguments to perform the authorization grant. Must return a token response or an access token.
+            refresh (callable, optional): Called with the refresh_token to perform a refresh grant. Defaults to None.
+
+        Returns:
+            str: The access token.
+        """
+        if self.valid:
+            return self.access_token
+        with self._lock:
+            if not self.valid:
+                token = None
+                if self.refresh_token and refresh:
+                    try:
+                        token = refresh(self.refresh_token)
+                    except Exception:
+                        token = None
+                if not token or (isinstance(token, dict) and not token.get('access_token')):
+                    self.refresh_token = None
+                    token = fetch()
+                self.set(token)
+            return self.access_token
+
+    def clear(self):
+        """Removes the cached token.
+        """
+        with self._lock:
+            self.access_token = None
+            self.refresh_token = None
+            self.expires_at = None
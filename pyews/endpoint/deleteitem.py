@@ -7,12 +7,16 @@ class DeleteItem(Operation):
     """
 
     DELETE_TYPES = ['HardDelete', 'SoftDelete', 'MoveToDeletedItems']
+    DEFAULT_BATCH_SIZE = 100
 
     def __init__(self, item_id, delete_type='MoveToDeletedItems'):
         """Deletes the provided Item ID from an Exchange store.
 
+        After running, results_by_id maps each item id to its parsed ResponseMessage
+        (or None if the request failed).
+
         Args:
-            item_id (str): The Item ID to delete
+            item_id (str or list): The Item ID (or list of Item IDs) to delete
             delete_type (str, optional): The delete type when deleting the item. Defaults to 'MoveToDeletedItems'.
         """
         if not isinstance(item_id, list):
@@ -21,6 +25,21 @@ class DeleteItem(Operation):
         if delete_type and delete_type not in self.DELETE_TYPES:
             UknownValueError(provided_value=delete_type, known_values=self.DELETE_TYPES)
         self.delete_type = delete_type
+        self.results_by_id = {}
+
+    def run(self):
+        self.raw_element = None
+        return self.__map_results(super().run())
+
+    async def run_async(self, session):
+        self.raw_element = None
+        return self.__map_results(await super().run_async(session))
+
+    def __map_results(self, response):
+        self.results_by_id = {item_id: None for item_id in self.item_id}
+        if self.raw_element is not None:
+            self.results_by_id.update(self._map_response_messages(self.item_id))
+        return response
 
     def soap(self):
         item_id_list = []
@@ -28,7 +47,7 @@ class DeleteItem(Operation):
             item_id_list.append(self.T_NAMESPACE.ItemId(Id=item))
         return self.M_NAMESPACE.DeleteItem(
             self.M_NAMESPACE.ItemIds(
-                item_id_list
+                *item_id_list
             ),
             **{'DeleteType':self.delete_type}
         )
@@ -1,4 +1,6 @@
+import datetime
 from ..service import Operation
+from ..core import DateRangeSharder
 from ..utils.exceptions import UknownValueError
 from ..utils.attributes import FOLDER_LIST, TRAVERSAL_LIST
 
@@ -19,7 +21,7 @@ class FindItem(Operation):
         'Text'
     ]
 
-    def __init__(self, query_string, distinguished_folder_name='inbox', base_shape='AllProperties', include_mime_content=True, body_type='Best', traversal='Shallow', reset_cache=False, return_deleted_items=True, return_highlight_terms=True):
+    def __init__(self, query_string, distinguished_folder_name='inbox', base_shape='AllProperties', include_mime_content=True, body_type='Best', traversal='Shallow', reset_cache=False, return_deleted_items=True, return_highlight_terms=True, page_size=None, offset=0, additional_properties=None, date_range=None):
         """Retrieves results from a query string
 
         Args:
@@ -28,6 +30,13 @@ class FindItem(Operation):
             base_shape (str, optional): The base shape of the returned item. Defaults to 'AllProperties'.
             include_mime_content (bool, optional): Whether or not to include MIME content. Defaults to True.
             body_type (str, optional): The item body type. Defaults to 'Best'.
+            page_size (int, optional): The maximum number of items returned per request using an IndexedPageItemView. Defaults to None (server default).
+            offset (int, optional): The offset of the first item to return when paging. Defaults to 0.
+            additional_properties (list, optional): The field URIs to return on an IdOnly base shape without MIME content (e.g. ['item:Subject']). Defaults to None.
+            date_range (tuple, optional): Only return items received from the first date up to (but not including) the second date. Defaults to None.
+                Exchange does not combine a QueryString with a Restriction, so the range is added to the query string if one is provided
+                and is sent as a Restriction on item:DateTimeReceived otherwise. Datetimes keep their time (in UTC) in a Restriction
+                and are searched by their date in a query string.
         """
         if distinguished_folder_name:
             self.folder_name = [self.T_NAMESPACE.DistinguishedFolderId(Id=distinguished_folder_name)]
@@ -41,9 +50,16 @@ class FindItem(Operation):
         if body_type not in self.BODY_TYPES:
             raise UknownValueError(provided_value=body_type, known_values=self.BODY_TYPES)
         self.body_type = body_type
+        self.additional_properties = self._validate_additional_properties(additional_properties)
+        if self.additional_properties:
+            self.base_shape = 'IdOnly'
+            self.include_mime_content = False
         if traversal not in TRAVERSAL_LIST:
             raise UknownValueError(provided_value=traversal, known_values=TRAVERSAL_LIST)
         self.traversal = traversal
+        self.page_size = page_size
+        self.offset = offset
+        self.date_range = date_range
 
         self.query_properties = {}
         if reset_cache:
@@ -65,17 +81,117 @@ class FindItem(Operation):
             return_list.append(self.T_NAMESPACE.DistinguishedFolderId(Id=item))
         return return_list
 
+    def paginate(self):
+        """Yields every item matching the query, following IndexedPagingOffset
+        page by page until IncludesLastItemInRange is returned.
+
+        Yields:
+            dict: A parsed item.
+        """
+        if not self.page_size:
+            for item in self.run() or []:
+                yield item
+            return
+        offset = self.offset
+        while True:
+            self.offset = offset
+            response = self.run()
+            if not isinstance(response, list):
+                break
+            for item in response:
+                yield item
+            offset = self.__next_offset(offset)
+            if offset is None:
+                break
+
+    async def paginate_async(self, session):
+        """Yields every item matching the query like paginate but over an asynchronous HTTP session.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the requests.
+
+        Yields:
+            dict: A parsed item.
+        """
+        if not self.page_size:
+            for item in await self.run_async(session) or []:
+                yield item
+            return
+        offset = self.offset
+        while True:
+            self.offset = offset
+            response = await self.run_async(session)
+            if not isinstance(response, list):
+                break
+            for item in response:
+                yield item
+            offset = self.__next_offset(offset)
+            if offset is None:
+                break
+
+    def __next_offset(self, offset):
+        root_folder = self.raw_element.find('.//{*}RootFolder')
+        if root_folder is None or root_folder.get('IncludesLastItemInRange', 'true') == 'true':
+            return None
+        next_offset = root_folder.get('IndexedPagingOffset')
+        if next_offset is None or int(next_offset) <= offset:
+            return None
+        return int(next_offset)
+
+    def __get_page_view(self):
+        if self.page_size:
+            return [self.M_NAMESPACE.IndexedPageItemView(MaxEntriesReturned=str(self.page_size), Offset=str(self.offset), BasePoint='Beginning')]
+        return []
+
+    def __format_date(self, value):
+        if isinstance(value, datetime.datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(datetime.timezone.utc)
+            return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+        return '{}T00:00:00Z'.format(value.isoformat())
+
+    def __get_restriction(self):
+        if not self.date_range or self.query_string:
+            return []
+        return [self.M_NAMESPACE.Restriction(
+            self.T_NAMESPACE.And(
+                self.T_NAMESPACE.IsGreaterThanOrEqualTo(
+                    self.T_NAMESPACE.FieldURI(FieldURI='item:DateTimeReceived'),
+                    self.T_NAMESPACE.FieldURIOrConstant(
+                        self.T_NAMESPACE.Constant(Value=self.__format_date(self.date_range[0]))
+                    )
+                ),
+                self.T_NAMESPACE.IsLessThan(
+                    self.T_NAMESPACE.FieldURI(FieldURI='item:DateTimeReceived'),
+                    self.T_NAMESPACE.FieldURIOrConstant(
+                        self.T_NAMESPACE.Constant(Value=self.__format_date(self.date_range[1]))
+                    )
+                )
+            )
+        )]
+
+    def __get_query_string(self):
+        if not self.query_string:
+            return []
+        query_string = self.query_string
+        if self.date_range:
+            query_string = DateRangeSharder.aqs(query_string, self.date_range)
+        return [self.M_NAMESPACE.QueryString(query_string, **self.query_properties)]
+
     def soap(self):
         return self.M_NAMESPACE.FindItem(
             self.M_NAMESPACE.ItemShape(
                 self.M_NAMESPACE.BaseShape(self.base_shape),
                 self.M_NAMESPACE.IncludeMimeContent(str(self.include_mime_content).lower()),
                 self.M_NAMESPACE.BodyType(self.body_type),
-                self.M_NAMESPACE.FilterHtmlContent('false')
+                self.M_NAMESPACE.FilterHtmlContent('false'),
+                *self._additional_properties(self.additional_properties)
             ),
+            *self.__get_page_view(),
+            *self.__get_restriction(),
             self.M_NAMESPACE.ParentFolderIds(
                 *self.folder_name
             ),
-            self.M_NAMESPACE.QueryString(self.query_string, **self.query_properties),
+            *self.__get_query_string(),
             Traversal=self.traversal
         )
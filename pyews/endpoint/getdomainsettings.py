@@ -1,4 +1,4 @@
-from ..service.autodiscover import Autodiscover, Authentication
+from ..service.autodiscover import Autodiscover
 
 
 class GetDomainSettings(Autodiscover):
@@ -18,7 +18,7 @@ class GetDomainSettings(Autodiscover):
         return self.A_NAMESPACE.GetDomainSettingsRequestMessage(
             self.A_NAMESPACE.Request(
                 self.A_NAMESPACE.Domains(
-                    self.A_NAMESPACE.Domain(Authentication.credentials[0].split('@')[-1])
+                    self.A_NAMESPACE.Domain(self.authentication.credentials[0].split('@')[-1])
                 ),
                 self.A_NAMESPACE.RequestedSettings(
                     self.A_NAMESPACE.Setting('InternalEwsUrl'),
@@ -7,6 +7,7 @@ class GetItem(Operation):
     """
 
     RESULTS_KEY = 'Items'
+    DEFAULT_BATCH_SIZE = 100
     BASE_SHAPES = [
         'IdOnly',
         'Default',
@@ -18,38 +19,132 @@ class GetItem(Operation):
         'Text'
     ]
 
-    def __init__(self, item_id, change_key=None, base_shape='AllProperties', include_mime_content=True, body_type='Best'):
+    def __init__(self, item_id, change_key=None, base_shape='AllProperties', include_mime_content=True, body_type='Best', batch_size=DEFAULT_BATCH_SIZE, additional_properties=None):
         """Retrieves details about a provided item id
 
+        When a list of item ids is provided, they are sent as multiple ItemId elements
+        in requests of up to batch_size ids. After running, results_by_id maps each
+        item id to its parsed ResponseMessage (or None if its request failed).
+
+        When additional_properties are provided only those fields are returned, using
+        the IdOnly base shape without MIME content (unless 'item:MimeContent' is requested).
+
         Args:
-            item_id (str): The item id you want to get information about.
+            item_id (str or list): The item id (or list of item ids) you want to get information about.
             change_key (str, optional): The change key of the item. Defaults to None.
             base_shape (str, optional): The base shape of the returned item. Defaults to 'AllProperties'.
             include_mime_content (bool, optional): Whether or not to include MIME content. Defaults to True.
             body_type (str, optional): The item body type. Defaults to 'Best'.
+            batch_size (int, optional): The number of item ids sent per request. Defaults to 100.
+            additional_properties (list, optional): The field URIs to return (e.g. ['item:Subject', 'message:From']). Defaults to None.
         """
         self.include_mime_content = include_mime_content
         if base_shape not in self.BASE_SHAPES:
             UknownValueError(provided_value=base_shape, known_values=self.BASE_SHAPES)
         self.base_shape = base_shape
+        self.additional_properties = self._validate_additional_properties(additional_properties)
+        if self.additional_properties:
+            self.base_shape = 'IdOnly'
+            self.include_mime_content = False
         if body_type not in self.BODY_TYPES:
             UknownValueError(provided_value=body_type, known_values=self.BODY_TYPES)
         self.body_type = body_type
         self.item_id = item_id
         self.change_key = change_key
+        self.batch_size = max(1, int(batch_size))
+        self.results_by_id = {}
+        self.__item_ids = None
+
+    @staticmethod
+    def needs_convert_id(message):
+        """Checks whether the server rejected an item id because of its format,
+        so the item must be retrieved again after converting the id with ConvertId.
+
+        Args:
+            message (dict): A parsed ResponseMessage from results_by_id.
+
+        Returns:
+            bool: True if the id was malformed or must be converted first.
+        """
+        if not message:
+            return False
+        return (message.get('response_code') or '').startswith('ErrorInvalidIdMalformed') or 'ConvertId' in (message.get('message_text') or '')
+
+    def run(self):
+        """Retrieves the item(s). A list of item ids is split into batches of batch_size ids.
+
+        Returns:
+            list: A list of parsed items.
+        """
+        if not isinstance(self.item_id, list):
+            return super().run()
+        batches = self.__batches()
+        response = None
+        while True:
+            try:
+                batches.send(response)
+            except StopIteration as stop:
+                return stop.value
+            response = super().run()
+
+    async def run_async(self, session):
+        """Retrieves the item(s) like run but over an asynchronous HTTP session.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the requests.
+
+        Returns:
+            list: A list of parsed items.
+        """
+        if not isinstance(self.item_id, list):
+            return await super().run_async(session)
+        batches = self.__batches()
+        response = None
+        while True:
+            try:
+                batches.send(response)
+            except StopIteration as stop:
+                return stop.value
+            response = await super().run_async(session)
+
+    def __batches(self):
+        """Splits the item ids into batches and collects the response of each batch.
+        It yields once per batch, after which the caller sends the request and sends back its response.
+
+        Returns:
+            list: A list of parsed items.
+        """
+        return_list = []
+        self.results_by_id = {}
+        for i in range(0, len(self.item_id), self.batch_size):
+            self.__item_ids = self.item_id[i:i + self.batch_size]
+            self.raw_element = None
+            response = yield
+            if self.raw_element is not None:
+                messages = self._map_response_messages(self.__item_ids)
+                self.results_by_id.update(messages)
+                if isinstance(response, list) and any(message.get('response_class') == 'Success' for message in messages.values()):
+                    return_list.extend(response)
+            for item_id in self.__item_ids:
+                self.results_by_id.setdefault(item_id, None)
+        self.__item_ids = None
+        return return_list
 
     def soap(self):
-        if self.change_key:
-            item_id_string = self.T_NAMESPACE.ItemId(Id=self.item_id, ChangeKey=self.change_key)
+        if self.__item_ids is not None:
+            item_id_string = [self.T_NAMESPACE.ItemId(Id=item_id) for item_id in self.__item_ids]
+        elif self.change_key:
+            item_id_string = [self.T_NAMESPACE.ItemId(Id=self.item_id, ChangeKey=self.change_key)]
         else:
-            item_id_string = self.T_NAMESPACE.ItemId(Id=self.item_id)
+            item_id_string = [self.T_NAMESPACE.ItemId(Id=self.item_id)]
         return self.M_NAMESPACE.GetItem(
             self.M_NAMESPACE.ItemShape(
                 self.T_NAMESPACE.BaseShape(self.base_shape),
                 self.T_NAMESPACE.IncludeMimeContent(str(self.include_mime_content).lower()),
-                self.T_NAMESPACE.BodyType(self.body_type)
+                self.T_NAMESPACE.BodyType(self.body_type),
+                *self._additional_properties(self.additional_properties)
             ),
             self.M_NAMESPACE.ItemIds(
-                item_id_string
+                *item_id_string
             )
         )
@@ -9,19 +9,42 @@ class SearchMailboxes(Operation):
 
     RESULTS_KEY = 'SearchPreviewItem'
     SEARCH_SCOPES = ['All', 'PrimaryOnly', 'ArchiveOnly']
+    RESULT_TYPES = ['PreviewOnly', 'StatisticsOnly']
+    PAGE_DIRECTIONS = ['Next', 'Previous']
+    DEFAULT_PAGE_SIZE = 500
+    MAX_QUERIES = 20
+    REJECTED_CODES = ('ErrorSearchTooManyMailboxes', 'ErrorSearchQueryHasTooManyKeywords', 'ErrorQueryFilterTooLong', 'ErrorExceededFindCountLimit', 'ErrorTimeoutExpired')
 
-    def __init__(self, query, reference_id, search_scope='All'):
+    def __init__(self, query, reference_id, search_scope='All', page_size=None, page_item_reference=None, page_direction='Next', result_type='PreviewOnly'):
         """Searches one or more reference id's using the provided query and search_scope.
 
+        A list of queries is sent as one MailboxQuery each in a single request, so
+        several indicators are searched in one pass over the mailboxes. Each result
+        is tagged with the query it matched, read from the query echoed back with it.
+
+        When a page_size is provided each request returns at most page_size results,
+        starting after the result whose SortValue is page_item_reference. Use pages
+        or paginate to retrieve every result one page at a time.
+
+        After running, item_count holds the total number of items matching the search.
+        With the StatisticsOnly result_type no previews are returned. Instead run
+        returns the number and size of the matching items in total, per mailbox and
+        per keyword of the query, so large searches can be planned before they are run.
+
         Args:
-            query (str): The Advanced Query Syntax (AQS) to search with.
+            query (str or list): The Advanced Query Syntax (AQS) to search with, or a list of queries.
             reference_id (list): One or more mailbox reference Id's
             search_scope (str, optional): The search scope. Defaults to 'All'.
+            page_size (int, optional): The maximum number of results returned per request. Defaults to None (server default).
+            page_item_reference (str, optional): The SortValue of the result the page starts after. Defaults to None.
+            page_direction (str, optional): The direction to page in from page_item_reference. Defaults to 'Next'.
+            result_type (str, optional): PreviewOnly to return search results or StatisticsOnly to return hit counts. Defaults to 'PreviewOnly'.
 
         Raises:
-            UknownValueError: The provided search scope is unknown.
+            UknownValueError: The provided search scope, page direction or result type is unknown.
         """
         self.query = query
+        self.queries = query if isinstance(query, list) else [query]
         if not isinstance(reference_id, list):
             reference_id = [reference_id]
         self.reference_id = reference_id
@@ -29,16 +52,213 @@ class SearchMailboxes(Operation):
             raise UknownValueError('The search_scope ({}) you provided is not one of {}'.format(search_scope, ','.join([x for x in self.SEARCH_SCOPES])))
         if search_scope in self.SEARCH_SCOPES:
             self.scope = search_scope
+        if page_direction not in self.PAGE_DIRECTIONS:
+            raise UknownValueError(provided_value=page_direction, known_values=self.PAGE_DIRECTIONS)
+        self.page_size = page_size
+        self.page_item_reference = page_item_reference
+        self.page_direction = page_direction
+        if result_type not in self.RESULT_TYPES:
+            raise UknownValueError(provided_value=result_type, known_values=self.RESULT_TYPES)
+        self.result_type = result_type
+        self.item_count = None
+        self._echoed = []
+        self.raw_element = None
+
+    @property
+    def rejected(self):
+        """Whether the server rejected the last request because the search was too
+        large, for example with too many mailboxes or keywords. Unlike a request which
+        was throttled or could not be sent, a rejected search can be retried in parts.
+        """
+        if self.raw_element is None:
+            return False
+        return any(found.text in self.REJECTED_CODES for found in self.raw_element.iter('{*}ResponseCode'))
+
+    def run(self):
+        """Runs the search.
+
+        Returns:
+            list: The parsed search results or, for the StatisticsOnly result type, a dictionary of statistics (see merge_statistics).
+        """
+        return self.__to_statistics(super().run())
+
+    async def run_async(self, session):
+        """Runs the search like run but over an asynchronous HTTP session.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the request.
+        """
+        return self.__to_statistics(await super().run_async(session))
+
+    def parse_response(self, soap_response, namespace_dict=None):
+        """Parses a SearchMailboxes response and tags each result with the
+        query it matched.
+
+        Returns:
+            list: A list of parsed search results, each with a query key.
+        """
+        response = super().parse_response(soap_response, namespace_dict=namespace_dict)
+        if not isinstance(response, list):
+            return response
+        queries = []
+        for result in self._to_element(soap_response).iter('{*}SearchMailboxesResult'):
+            query = self.__echoed_query(result)
+            queries.extend(query for _ in result.iterfind('{*}Items/{*}SearchPreviewItem'))
+        if len(queries) != len(response):
+            queries = [self.__echoed_query(None)] * len(response)
+        for item, query in zip(response, queries):
+            if isinstance(item, dict):
+                item['query'] = query
+        return response
+
+    def _stream_element(self, name, element):
+        if name == 'Query':
+            self._echoed.append(element.text)
+        elif name == 'SearchMailboxesResult':
+            self._echoed = []
+
+    def _stream_result(self, name, result):
+        result['query'] = self.__query(self._echoed)
+        return result
+
+    def __echoed_query(self, result):
+        if result is None:
+            return self.__query([])
+        return self.__query([query.text for query in result.iterfind('{*}SearchQueries/{*}MailboxQuery/{*}Query')])
+
+    def __query(self, echoed):
+        # a result can only be attributed to a query when it echoes exactly one
+        if len(echoed) == 1:
+            return echoed[0]
+        return self.queries[0] if len(self.queries) == 1 else None
+
+    def __to_statistics(self, response):
+        if response is None or self.raw_element is None:
+            return response
+        results = list(self.raw_element.iter('{*}SearchMailboxesResult'))
+        self.item_count = sum(self.__count(result, 'ItemCount') for result in results) if results else None
+        if self.result_type != 'StatisticsOnly':
+            return response
+        if not results:
+            return None
+        return self.merge_statistics([self.__statistics(result) for result in results])
+
+    def __statistics(self, result):
+        return {
+            'item_count': self.__count(result, 'ItemCount'),
+            'size': self.__count(result, 'Size'),
+            'mailbox_stats': [{
+                'mailbox_id': item.findtext('{*}MailboxId'),
+                'display_name': item.findtext('{*}DisplayName'),
+                'item_count': self.__count(item, 'ItemCount'),
+                'size': self.__count(item, 'Size')
+            } for item in result.iterfind('{*}MailboxStats/{*}MailboxStatisticsItem')],
+            'keyword_stats': [{
+                'keyword': item.findtext('{*}Keyword'),
+                'item_hits': self.__count(item, 'ItemHits'),
+                'size': self.__count(item, 'Size')
+            } for item in result.iterfind('{*}KeywordStats/{*}KeywordStat')],
+            'failed_mailboxes': [{
+                'mailbox': item.findtext('{*}Mailbox'),
+                'error_code': item.findtext('{*}ErrorCode'),
+                'error_message': item.findtext('{*}ErrorMessage')
+            } for item in result.iterfind('{*}FailedMailboxes/{*}FailedMailbox')]
+        }
+
+    def __count(self, element, name):
+        value = element.findtext('{*}' + name)
+        return int(value) if value and value.strip().isdigit() else 0
+
+    @staticmethod
+    def merge_statistics(statistics):
+        """Combines the StatisticsOnly results of searches over different mailboxes.
+
+        Args:
+            statistics (list): Dictionaries returned by run for the StatisticsOnly result type. None values are skipped.
+
+        Returns:
+            dict: The total item_count and size, the mailbox_stats of every mailbox, the keyword_stats summed per keyword
+                and the failed_mailboxes of every search.
+        """
+        merged = {'item_count': 0, 'size': 0, 'mailbox_stats': [], 'keyword_stats': [], 'failed_mailboxes': []}
+        keywords = {}
+        for item in statistics:
+            if not item:
+                continue
+            merged['item_count'] += item['item_count']
+            merged['size'] += item['size']
+            merged['mailbox_stats'].extend(item['mailbox_stats'])
+            merged['failed_mailboxes'].extend(item['failed_mailboxes'])
+            for keyword_stat in item['keyword_stats']:
+                if keyword_stat['keyword'] not in keywords:
+                    keywords[keyword_stat['keyword']] = {'keyword': keyword_stat['keyword'], 'item_hits': 0, 'size': 0}
+                    merged['keyword_stats'].append(keywords[keyword_stat['keyword']])
+                keywords[keyword_stat['keyword']]['item_hits'] += keyword_stat['item_hits']
+                keywords[keyword_stat['keyword']]['size'] += keyword_stat['size']
+        return merged
+
+    def _next_page(self, response):
+        """Moves page_item_reference to the last result of a page.
+
+        Args:
+            response (list): The results returned for the current page.
+
+        Returns:
+            bool: Whether or not another page should be requested.
+        """
+        if not self.page_size or not isinstance(response, list) or len(response) < self.page_size:
+            return False
+        sort_value = (response[-1] or {}).get('sort_value')
+        if not sort_value or sort_value == self.page_item_reference:
+            return False
+        self.page_item_reference = sort_value
+        return True
+
+    def pages(self):
+        """Yields the results one page at a time, requesting the next page
+        once the previous one has been consumed. Without a page_size a single
+        page holding the server's default number of results is yielded.
+
+        Yields:
+            list: A page of parsed search results.
+        """
+        while True:
+            response = self.run()
+            if not isinstance(response, list):
+                break
+            yield response
+            if not self._next_page(response):
+                break
+
+    def paginate(self):
+        """Yields every search result, following PageItemReference page by page.
+
+        Yields:
+            dict: A parsed search result.
+        """
+        for page in self.pages():
+            for item in page:
+                yield item
+
+    def __get_page_view(self):
+        if not self.page_size or self.result_type != 'PreviewOnly':
+            return []
+        page_view = [self.M_NAMESPACE.PageSize(str(self.page_size))]
+        if self.page_item_reference:
+            page_view.append(self.M_NAMESPACE.PageItemReference(self.page_item_reference))
+        page_view.append(self.M_NAMESPACE.PageDirection(self.page_direction))
+        return page_view
 
     def soap(self):
         return self.M_NAMESPACE.SearchMailboxes(
-            self.M_NAMESPACE.SearchQueries(
+            self.M_NAMESPACE.SearchQueries(*[
                 self.T_NAMESPACE.MailboxQuery(
-                    self.T_NAMESPACE.Query(self.query),
+                    self.T_NAMESPACE.Query(query),
                     self.T_NAMESPACE.MailboxSearchScopes(*self.__get_search_scope())
-                )
-            ),
-            self.M_NAMESPACE.ResultType('PreviewOnly')
+                ) for query in self.queries
+            ]),
+            self.M_NAMESPACE.ResultType(self.result_type),
+            *self.__get_page_view()
         )
 
     def __get_search_scope(self):
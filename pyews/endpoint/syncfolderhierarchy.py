@@ -35,23 +35,84 @@ class SyncFolderHierarchy(Operation):
         'favorites'
     ]
 
-    def __init__(self, well_known_folder_name=None):
+    def __init__(self, well_known_folder_name=None, sync_state=None, sync_state_store=None):
         """Retrieve the authenticated users mailbox folder hierarchy.
 
         Args:
             well_known_folder_name (str, optional): The well known folder name. Defaults to all known folder names.
+            sync_state (str, optional): The SyncState returned by a previous synchronization. Defaults to None.
+            sync_state_store (SyncStateStore, optional): A store changes reads the initial sync_state from and
+                commits the returned sync_state to. Defaults to None.
         """
-        self.attachment_id = well_known_folder_name
+        self.well_known_folder_name = well_known_folder_name
+        self.sync_state = sync_state
+        self.sync_state_store = sync_state_store
+
+    @property
+    def _sync_state_key(self):
+        return 'hierarchy:{}'.format(self.well_known_folder_name or '*')
+
+    def __iter__(self):
+        return self.changes()
+
+    def __batch_changes(self, response):
+        self.__next_sync_state = None
+        if response is None or self.raw_element is None:
+            return []
+        sync_state = self.raw_element.find('.//{*}SyncState')
+        self.__next_sync_state = sync_state.text if sync_state is not None else None
+        return response if isinstance(response, list) else [response]
+
+    def __advance(self):
+        if not self.__next_sync_state or self.__next_sync_state == self.sync_state:
+            return False
+        self.sync_state = self.__next_sync_state
+        return True
+
+    def changes(self):
+        """Yields every folder hierarchy change since sync_state. sync_state is only
+        advanced, and committed to the sync_state_store, once every change has been consumed.
+
+        Yields:
+            dict: A change record.
+        """
+        if self.sync_state_store and not self.sync_state:
+            self.sync_state = self.sync_state_store.get(self._mailbox, self._sync_state_key)
+        for change in self.__batch_changes(self.run()):
+            yield change
+        if self.__advance() and self.sync_state_store:
+            self.sync_state_store.set(self._mailbox, self._sync_state_key, self.sync_state)
+
+    async def changes_async(self, session):
+        """Yields every folder hierarchy change since sync_state like changes but over an
+        asynchronous HTTP session. The sync_state_store is read and written in the default executor.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the request.
+
+        Yields:
+            dict: A change record.
+        """
+        if self.sync_state_store and not self.sync_state:
+            self.sync_state = await self._run_in_executor(self.sync_state_store.get, self._mailbox, self._sync_state_key)
+        for change in self.__batch_changes(await self.run_async(session)):
+            yield change
+        if self.__advance() and self.sync_state_store:
+            await self._run_in_executor(self.sync_state_store.set, self._mailbox, self._sync_state_key, self.sync_state)
 
     def soap(self):
         folder_id_list = []
-        for folder in self.FOLDER_LIST:
+        for folder in [self.well_known_folder_name] if self.well_known_folder_name else self.FOLDER_LIST:
             folder_id_list.append(self.T_NAMESPACE.DistinguishedFolderId(Id=folder))
+        sync_state = []
+        if self.sync_state:
+            sync_state.append(self.M_NAMESPACE.SyncState(self.sync_state))
         return self.M_NAMESPACE.SyncFolderHierarchy(
             self.M_NAMESPACE.FolderShape(
                 self.T_NAMESPACE.BaseShape('AllProperties')
             ),
             self.M_NAMESPACE.SyncFolderId(
                 *folder_id_list
-            )
+            ),
+            *sync_state
         )
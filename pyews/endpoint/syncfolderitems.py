@@ -1,3 +1,4 @@
+from lxml import etree
 from ..service import Operation
 
 
@@ -6,6 +7,9 @@ class SyncFolderItems(Operation):
     """
 
     RESULTS_KEY = 'Changes'
+    MAX_CHANGES_RETURNED = 512
+    CHANGE_TYPES = ('Create', 'Update', 'Delete', 'ReadFlagChange')
+    STREAM_STATUS_ELEMENTS = Operation.STREAM_STATUS_ELEMENTS + ('SyncState', 'IncludesLastItemInRange')
     FIELD_ACTION_TYPE_MAP = {
         'create': [
             'Item',
@@ -380,32 +384,169 @@ class SyncFolderItems(Operation):
         "persona:Bodies"
     ]
 
-    def __init__(self, folder_id, change_key=None):
+    FIELD_URIS = FIELD_URI_PROPERTIES
+
+    def __init__(self, folder_id, change_key=None, sync_state=None, max_changes_returned=MAX_CHANGES_RETURNED, stream_changes=False, sync_state_store=None, additional_properties=None):
         """Retrieves details about a provided folder id.
 
+        run returns a single batch of changes. Iterating over a SyncFolderItems object (or
+        calling changes) yields every change since the provided sync_state, one record per
+        change, requesting further batches until IncludesLastItemInRange is returned.
+        Once iteration has finished, sync_state holds the state to provide on the next
+        synchronization so only new changes are returned.
+
         Args:
             folder_id (str): The folder id to retrieve details about.
             change_key (str, optional): The version key of the folder id. Defaults to None.
+            sync_state (str, optional): The SyncState returned by a previous synchronization. Defaults to None.
+            max_changes_returned (int, optional): The number of changes returned per request (1 to 512). Defaults to 512.
+            stream_changes (bool, optional): Whether or not changes streams each batch of changes. Defaults to False.
+            sync_state_store (SyncStateStore, optional): A store to read the initial sync_state from and to commit
+                the sync_state to after each fully consumed batch. Defaults to None.
+            additional_properties (list, optional): The field URIs to return for each changed item, one of FIELD_URI_PROPERTIES.
+                Changes are then returned using the IdOnly base shape without MIME content. Defaults to None (AllProperties).
+
+        Raises:
+            ValueError: The max_changes_returned value is not between 1 and 512.
         """
         self.folder_id = folder_id
         self.change_key = change_key
+        self.sync_state = sync_state
+        if not 1 <= int(max_changes_returned) <= self.MAX_CHANGES_RETURNED:
+            raise ValueError('max_changes_returned must be between 1 and {}'.format(self.MAX_CHANGES_RETURNED))
+        self.max_changes_returned = int(max_changes_returned)
+        self.stream_changes = stream_changes
+        self.sync_state_store = sync_state_store
+        self.additional_properties = self._validate_additional_properties(additional_properties)
+        self.includes_last_item_in_range = None
+        self.__next_sync_state = None
+        self.__streaming_changes = False
+
+    def __iter__(self):
+        return self.changes()
+
+    @property
+    def _stream_results_keys(self):
+        if self.__streaming_changes:
+            return self.CHANGE_TYPES
+        return super()._stream_results_keys
+
+    def _stream_result(self, name, result):
+        if self.__streaming_changes:
+            return {self.camel_to_snake(name): result}
+        return result
+
+    def __change_records(self, root):
+        namespace_dict = self._namespace_dict
+        for changes in root.iter('{*}Changes'):
+            for change in changes:
+                if isinstance(change.tag, str):
+                    yield {self.camel_to_snake(etree.QName(change).localname): self._element_to_dict(change, namespace_dict, True, {})}
+
+    def __get_batch(self):
+        if self.stream_changes:
+            self.stream_status = {}
+            self.__streaming_changes = True
+            try:
+                for change in self.stream():
+                    yield change
+            finally:
+                self.__streaming_changes = False
+            status = self.stream_status
+            self.__next_sync_state = status.get('SyncState')
+            self.includes_last_item_in_range = status.get('IncludesLastItemInRange', 'true') == 'true'
+        else:
+            for change in self.__batch_changes(self.run()):
+                yield change
+
+    def __batch_changes(self, response):
+        if response is None or self.raw_element is None:
+            self.__next_sync_state = None
+            return
+        sync_state = self.raw_element.find('.//{*}SyncState')
+        self.__next_sync_state = sync_state.text if sync_state is not None else None
+        includes_last_item_in_range = self.raw_element.find('.//{*}IncludesLastItemInRange')
+        self.includes_last_item_in_range = includes_last_item_in_range is None or includes_last_item_in_range.text == 'true'
+        for change in self.__change_records(self.raw_element):
+            yield change
+
+    def __advance(self):
+        if not self.__next_sync_state or self.__next_sync_state == self.sync_state:
+            return False
+        self.sync_state = self.__next_sync_state
+        return True
+
+    def changes(self):
+        """Yields every change since sync_state, one batch of up to max_changes_returned
+        changes per request. sync_state is only advanced once every change of a batch
+        has been consumed.
+
+        Yields:
+            dict: A change record, for example {'create': {'message': {...}}}.
+        """
+        if self.sync_state_store and not self.sync_state:
+            self.sync_state = self.sync_state_store.get(self._mailbox, self.folder_id)
+        while True:
+            self.__next_sync_state = None
+            for change in self.__get_batch():
+                yield change
+            if not self.__advance():
+                break
+            if self.sync_state_store:
+                self.sync_state_store.set(self._mailbox, self.folder_id, self.sync_state)
+            if self.includes_last_item_in_range:
+                break
+
+    async def changes_async(self, session):
+        """Yields every change since sync_state like changes but over an asynchronous HTTP session.
+        The sync_state_store is read and written in the default executor.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the requests.
+
+        Yields:
+            dict: A change record, for example {'create': {'message': {...}}}.
+        """
+        if self.sync_state_store and not self.sync_state:
+            self.sync_state = await self._run_in_executor(self.sync_state_store.get, self._mailbox, self.folder_id)
+        while True:
+            self.__next_sync_state = None
+            for change in self.__batch_changes(await self.run_async(session)):
+                yield change
+            if not self.__advance():
+                break
+            if self.sync_state_store:
+                await self._run_in_executor(self.sync_state_store.set, self._mailbox, self.folder_id, self.sync_state)
+            if self.includes_last_item_in_range:
+                break
 
     def soap(self):
         if self.change_key:
             folder_id = self.T_NAMESPACE.FolderId(Id=self.folder_id, ChangeKey=self.change_key)
         else:
             folder_id = self.T_NAMESPACE.FolderId(Id=self.folder_id)
-        return self.M_NAMESPACE.SyncFolderItems(
-            self.M_NAMESPACE.ItemShape(
+        sync_state = []
+        if self.sync_state:
+            sync_state.append(self.M_NAMESPACE.SyncState(self.sync_state))
+        if self.additional_properties:
+            item_shape = self.M_NAMESPACE.ItemShape(
+                self.T_NAMESPACE.BaseShape('IdOnly'),
+                *self._additional_properties(self.additional_properties)
+            )
+        else:
+            item_shape = self.M_NAMESPACE.ItemShape(
                 self.T_NAMESPACE.BaseShape('AllProperties'),
                 self.T_NAMESPACE.IncludeMimeContent('true'),
                 self.T_NAMESPACE.BodyType('Best'),
                 self.T_NAMESPACE.FilterHtmlContent('false'),
                 self.T_NAMESPACE.ConvertHtmlCodePageToUTF8('false')
-            ),
+            )
+        return self.M_NAMESPACE.SyncFolderItems(
+            item_shape,
             self.M_NAMESPACE.SyncFolderId(
                 folder_id
             ),
-            self.M_NAMESPACE.MaxChangesReturned('100'),
+            *sync_state,
+            self.M_NAMESPACE.MaxChangesReturned(str(self.max_changes_returned)),
             self.M_NAMESPACE.SyncScope('NormalAndAssociatedItems')
         )
@@ -1,45 +1,94 @@
-import os
+import time
+import functools
+import contextvars
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from .core import Authentication
+from .core import Authentication, ConnectionPool, EndpointCache, ConcurrencyLimiter, Pipeline, AdaptiveChunker, DateRangeSharder
 from .endpoint import GetSearchableMailboxes, GetUserSettings, ResolveNames, SearchMailboxes, ExecuteSearch, GetInboxRules, GetItem, ConvertId, GetHiddenInboxRules, CreateItem, GetServiceConfiguration, SyncFolderHierarchy, SyncFolderItems, GetAttachment, DeleteItem, GetDomainSettings, FindItem, CreateFolder, FindFolder, DeleteFolder
 
 
+def bound(method):
+    """Runs an EWS method with the instance's Authentication bound, so every
+    endpoint created by the method uses the instance's settings.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.authentication.bind():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class EWS:
 
+    DEFAULT_THREAD_COUNT = 16
+
     def __init__(self, 
         username, password, ews_url=None, exchange_version=None, impersonate_as=None, multi_threading=False, 
-        tenant_id=None, client_id=None, client_secret=None, oauth2_authorization_type='auth_code_grant', redirect_uri=None, oauth2_scope=None):
-        Authentication.credentials = (username, password)
-        Authentication.ews_url = ews_url
-        Authentication.exchange_versions = exchange_version
-        Authentication.impersonate_as = impersonate_as
-        Authentication.tenant_id = tenant_id
-        Authentication.client_id = client_id
-        Authentication.client_secret = client_secret
-        Authentication.oauth2_authorization_type = oauth2_authorization_type
-        Authentication.redirect_uri = redirect_uri
-        Authentication.oauth2_scope = oauth2_scope
+        tenant_id=None, client_id=None, client_secret=None, oauth2_authorization_type='auth_code_grant', redirect_uri=None, oauth2_scope=None,
+        pool_connections=ConnectionPool.DEFAULT_POOL_CONNECTIONS, pool_maxsize=ConnectionPool.DEFAULT_POOL_MAXSIZE, max_retries=ConnectionPool.DEFAULT_MAX_RETRIES, keep_alive=True,
+        endpoint_cache_path=EndpointCache.DEFAULT_PATH, endpoint_cache_ttl=EndpointCache.DEFAULT_TTL, sync_state_store=None, executor=None, retry_policy=None, concurrency_limiter=None, rate_limiter=None, chunker=None):
+        self.authentication = Authentication.scoped()
+        with self.authentication.bind():
+            self.authentication.tenant_id = tenant_id
+            self.authentication.client_id = client_id
+            self.authentication.client_secret = client_secret
+            self.authentication.redirect_uri = redirect_uri
+            self.authentication.oauth2_scope = oauth2_scope
+            self.authentication.credentials = (username, password)
+            self.authentication.oauth2_authorization_type = oauth2_authorization_type
+            self.authentication.ews_url = ews_url
+            self.authentication.exchange_versions = exchange_version
+            self.authentication.impersonate_as = impersonate_as
+            self.authentication.connection_pool = ConnectionPool(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=max_retries,
+                keep_alive=keep_alive
+            )
+            self.authentication.endpoint_cache = EndpointCache(path=endpoint_cache_path, ttl=endpoint_cache_ttl)
+            self.authentication.sync_state_store = sync_state_store
+            self.authentication.retry_policy = retry_policy
+            self.authentication.concurrency_limiter = concurrency_limiter or ConcurrencyLimiter()
+            self.authentication.rate_limiter = rate_limiter
         self.multi_threading = multi_threading
+        self.executor = executor
+        self.chunker = chunker or AdaptiveChunker()
+
+    def __thread_count(self, thread_count):
+        # the concurrency limiter decides how many of the threads' requests are in flight
+        return thread_count or self.DEFAULT_THREAD_COUNT
+
+    @contextmanager
+    def __executor(self, thread_count):
+        if self.executor:
+            yield self.executor
+        else:
+            with ThreadPoolExecutor(max_workers=thread_count) as executor:
+                yield executor
+
+    def __submit(self, executor, function, *args):
+        return executor.submit(contextvars.copy_context().run, function, *args)
 
     def chunk(self, items, n):
         n = max(1, n)
         return (items[i:i+n] for i in range(0, len(items), n))
 
+    @bound
     def get_service_configuration(self, configuration_name=None, acting_as=None):
         return GetServiceConfiguration(configuration_name=configuration_name, acting_as=acting_as).run()
 
+    @bound
     def get_searchable_mailboxes(self, search_filter=None, expand_group_memberhip=True):
         return GetSearchableMailboxes(search_filter=search_filter, expand_group_memberhip=expand_group_memberhip).run()
 
+    @bound
     def get_user_settings(self, user=None):
         return GetUserSettings(user=user).run()
 
+    @bound
     def resolve_names(self, user=None):
         return ResolveNames(user=user).run()
 
-    def __execute_multithreaded_search(self, query, reference_id, scope):
-        return SearchMailboxes(query=query, reference_id=reference_id, search_scope=scope).run()
-
     def __execute_multithreaded_find(
             self, 
             query_string, 
@@ -56,49 +105,140 @@ class EWS:
         return_list = []
         for user in user_list:
             if user:
-                Authentication.impersonate_as = user
-                return_list.extend(FindItem(query_string=query_string, distinguished_folder_name=distinguished_folder_name, base_shape=base_shape, include_mime_content=include_mime_content, body_type=body_type, traversal=traversal, reset_cache=reset_cache, return_deleted_items=return_deleted_items, return_highlight_terms=return_highlight_terms).run())
+                with self.authentication.impersonation(user):
+                    return_list.extend(FindItem(query_string=query_string, distinguished_folder_name=distinguished_folder_name, base_shape=base_shape, include_mime_content=include_mime_content, body_type=body_type, traversal=traversal, reset_cache=reset_cache, return_deleted_items=return_deleted_items, return_highlight_terms=return_highlight_terms).run())
         return return_list
 
-    def execute_ews_search(self, query, reference_id, search_scope='All', thread_count=os.cpu_count()*5):
-        response = []
-        return_list = []
-        if self.multi_threading:
-            threads = []
-            chunks = self.chunk(reference_id, int(len(reference_id) / thread_count))
-            with ThreadPoolExecutor(max_workers=thread_count) as executor:
-                for chunk in chunks:
-                    threads.append(executor.submit(self.__execute_multithreaded_search, query, chunk, search_scope))
-                for task in as_completed(threads):
-                    result = task.result()
-                    if isinstance(result, list):
-                        for item in result:
-                            response.append(item)
-        else:
-            response = SearchMailboxes(query, reference_id=reference_id, search_scope=search_scope).run()
-        for item in response:
-            if item:
-                return_dict = item
-                get_item_response = self.get_item(return_dict['id'].get('id'))
-                if get_item_response:
-                    for item_response in get_item_response:
-                        if item_response and item_response.get('message').get('attachments') and item_response.get('message').get('attachments').get('file_attachment').get('attachment_id').get('id'):
-                            attachment_details_list = []
-                            attachment = self.get_attachment(item_response.get('message').get('attachments').get('file_attachment').get('attachment_id').get('id'))
-                            for attach in attachment:
-                                attachment_dict = {}
-                                if attach:
-                                    for key,val in attach.items():
-                                        for k,v in val.items():
-                                            attachment_dict[k] = v
-                                if attachment_dict:
-                                    attachment_details_list.append(attachment_dict)
-                            if attachment_details_list:
-                                return_dict.update({'attachment_details': attachment_details_list})
-                        return_dict.update(item_response.pop('message'))
-                return_list.append(return_dict)
-        return return_list
+    def __search_mailboxes(self, query, reference_id, search_scope, thread_count, page_size=SearchMailboxes.DEFAULT_PAGE_SIZE):
+        thread_count = self.__thread_count(thread_count)
+        for hits in Pipeline(self.__shards(query, reference_id, None, SearchMailboxes.MAX_QUERIES), [
+            (functools.partial(self.__search_stage, search_scope, page_size, page_size, None), thread_count if self.multi_threading else 1)
+        ]):
+            for item in hits:
+                yield item
+
+    @bound
+    def execute_ews_search(self, query, reference_id, search_scope='All', thread_count=None, batch_size=GetItem.DEFAULT_BATCH_SIZE, queue_size=Pipeline.DEFAULT_QUEUE_SIZE, page_size=SearchMailboxes.DEFAULT_PAGE_SIZE, date_range=None, queries_per_request=SearchMailboxes.MAX_QUERIES):
+        return list(self.iter_ews_search(query, reference_id, search_scope=search_scope, thread_count=thread_count, batch_size=batch_size, queue_size=queue_size, page_size=page_size, date_range=date_range, queries_per_request=queries_per_request))
+
+    @bound
+    def iter_ews_search(self, query, reference_id, search_scope='All', thread_count=None, batch_size=GetItem.DEFAULT_BATCH_SIZE, queue_size=Pipeline.DEFAULT_QUEUE_SIZE, page_size=SearchMailboxes.DEFAULT_PAGE_SIZE, date_range=None, queries_per_request=SearchMailboxes.MAX_QUERIES):
+        thread_count = self.__thread_count(thread_count) if self.multi_threading else 1
+        sharder = self.__sharder(date_range)
+        return iter(Pipeline(self.__shards(query, reference_id, sharder, queries_per_request), [
+            (functools.partial(self.__search_stage, search_scope, batch_size, page_size, sharder), thread_count),
+            (self.__fetch_stage, thread_count),
+            (self.__attachment_stage, thread_count)
+        ], queue_size=queue_size))
+
+    def __sharder(self, date_range):
+        if not date_range or isinstance(date_range, DateRangeSharder):
+            return date_range
+        return DateRangeSharder(*date_range)
+
+    def __shards(self, query, reference_id, sharder, queries_per_request):
+        if not isinstance(reference_id, list):
+            reference_id = [reference_id]
+        queries = list(self.chunk(query, queries_per_request)) if isinstance(query, list) else [query]
+        windows = sharder.windows() if sharder else [None]
+        for window in windows:
+            for chunk in self.chunker.chunks(reference_id):
+                for batch in queries:
+                    yield window, batch, chunk
+
+    def __search_stage(self, search_scope, batch_size, page_size, sharder, shard):
+        window, query, reference_id = shard
+        # queries restricted to a window are echoed back restricted, so hits are tagged with the original query
+        queries = {DateRangeSharder.aqs(item, window) if window else item: item for item in (query if isinstance(query, list) else [query])}
+        search_query = list(queries) if isinstance(query, list) else next(iter(queries))
+        search_mailboxes = SearchMailboxes(search_query, reference_id=reference_id, search_scope=search_scope, page_size=page_size)
+        first_page = True
+        while True:
+            start = time.monotonic()
+            page = search_mailboxes.run()
+            if first_page:
+                item_count = search_mailboxes.item_count or 0
+                # a request given up on after throttling is not split, which would only send more requests
+                rejected = page is None and search_mailboxes.rejected
+                if page is not None or rejected:
+                    self.chunker.record(len(reference_id), time.monotonic() - start, item_count, failed=rejected)
+                if rejected and isinstance(query, list) and len(query) > 1:
+                    # the server may limit the number of queries per request, so they are retried in halves first
+                    shards = [(window, half, reference_id) for half in self.chunker.split(query)]
+                elif rejected:
+                    # the chunk is retried in halves, which the chunker sizes for the following chunks too
+                    shards = [(window, query, half) for half in self.chunker.split(reference_id)]
+                elif window:
+                    sharder.record(window, item_count)
+                    shards = [(half, query, reference_id) for half in sharder.split(window, item_count)]
+                else:
+                    shards = []
+                if page is None or shards:
+                    for shard in shards:
+                        for hits in self.__search_stage(search_scope, batch_size, page_size, sharder, shard):
+                            yield hits
+                    return
+                first_page = False
+            if not isinstance(page, list):
+                return
+            hits = []
+            for item in page:
+                if not item:
+                    continue
+                if 'query' in item:
+                    item['query'] = queries.get(item['query'], item['query'])
+                if not sharder or sharder.first_seen((item.get('query'), item['id'].get('id'))):
+                    hits.append(item)
+            for hits in self.chunk(hits, batch_size):
+                yield hits
+            if not search_mailboxes._next_page(page):
+                return
+
+    def __fetch_stage(self, hits):
+        # an item matching several queries is fetched once and shared by each of its hits
+        items_by_id = self.get_items(list(dict.fromkeys(item['id'].get('id') for item in hits)), batch_size=len(hits))
+        for item in hits:
+            get_item_response = items_by_id.get(item['id'].get('id'))
+            yield item, [dict(response) if response else response for response in get_item_response] if get_item_response else get_item_response
+
+    def __attachment_stage(self, hit):
+        return_dict, get_item_response = hit
+        if get_item_response:
+            for item_response in get_item_response:
+                if item_response and item_response.get('message').get('attachments') and item_response.get('message').get('attachments').get('file_attachment').get('attachment_id').get('id'):
+                    attachment_details_list = []
+                    attachment = self.get_attachment(item_response.get('message').get('attachments').get('file_attachment').get('attachment_id').get('id'))
+                    for attach in attachment or []:
+                        attachment_dict = {}
+                        if attach:
+                            for key,val in attach.items():
+                                for k,v in val.items():
+                                    attachment_dict[k] = v
+                        if attachment_dict:
+                            attachment_details_list.append(attachment_dict)
+                    if attachment_details_list:
+                        return_dict.update({'attachment_details': attachment_details_list})
+                return_dict.update(item_response.pop('message'))
+        return [return_dict]
+
+    @bound
+    def estimate(self, query, reference_id, search_scope='All', thread_count=None):
+        if not isinstance(reference_id, list):
+            reference_id = [reference_id]
+        if not self.multi_threading:
+            return SearchMailboxes.merge_statistics([self.__estimate(query, chunk, search_scope) for chunk in self.chunker.chunks(reference_id)])
+        statistics = []
+        thread_count = self.__thread_count(thread_count)
+        with self.__executor(thread_count) as executor:
+            threads = [self.__submit(executor, self.__estimate, query, chunk, search_scope) for chunk in self.chunker.chunks(reference_id)]
+            for task in as_completed(threads):
+                statistics.append(task.result())
+        return SearchMailboxes.merge_statistics(statistics)
 
+    def __estimate(self, query, reference_id, search_scope):
+        return SearchMailboxes(query, reference_id=reference_id, search_scope=search_scope, result_type='StatisticsOnly').run()
+
+    @bound
     def execute_outlook_search(self, query, result_row_count='25', max_results_count='-1'):
         return ExecuteSearch(
                 query=query, 
@@ -106,44 +246,104 @@ class EWS:
                 max_results_count=max_results_count
             ).run()
 
+    @bound
     def get_inbox_rules(self, user=None):
         return GetInboxRules(user=user).run()
 
+    @bound
     def get_hidden_inbox_rules(self):
         return GetHiddenInboxRules().run()
 
-    def get_item(self, item_id, change_key=None):
-        response = GetItem(item_id, change_key=change_key).run()
+    @bound
+    def get_item(self, item_id, change_key=None, additional_properties=None):
+        response = GetItem(item_id, change_key=change_key, additional_properties=additional_properties).run()
         if isinstance(response, list) and response:
             if any(item in response for item in ConvertId.ID_FORMATS):
-                convert_id_response = ConvertId(Authentication.credentials[0], item_id, id_type=response[0], convert_to=response[1]).run()
-                get_item_response = GetItem(convert_id_response[0]).run()
+                convert_id_response = ConvertId(self.authentication.credentials[0], item_id, id_type=response[0], convert_to=response[1]).run()
+                get_item_response = GetItem(convert_id_response[0], additional_properties=additional_properties).run()
                 return get_item_response if get_item_response else None
-        return GetItem(item_id, change_key=change_key).run()
+        return response
+
+    @bound
+    def get_items(self, item_ids, batch_size=GetItem.DEFAULT_BATCH_SIZE, additional_properties=None):
+        get_item = GetItem(list(item_ids), batch_size=batch_size, additional_properties=additional_properties)
+        get_item.run()
+        return_dict = {}
+        for item_id in item_ids:
+            message = get_item.results_by_id.get(item_id)
+            if message and message.get('response_class') == 'Success' and message.get('items'):
+                return_dict[item_id] = [message.get('items')]
+            elif GetItem.needs_convert_id(message):
+                return_dict[item_id] = self.get_item(item_id, additional_properties=additional_properties)
+            else:
+                return_dict[item_id] = None
+        return return_dict
 
-    def get_attachment(self, attachment_id):
+    @bound
+    def get_attachment(self, attachment_id, stream=False):
+        if stream:
+            return GetAttachment(attachment_id=attachment_id).stream()
         return GetAttachment(attachment_id=attachment_id).run()
 
-    def sync_folder_hierarchy(self, well_known_folder_name=None):
-        return SyncFolderHierarchy(well_known_folder_name=well_known_folder_name).run()
+    @bound
+    def sync_folder_hierarchy(self, well_known_folder_name=None, sync_state=None):
+        return SyncFolderHierarchy(well_known_folder_name=well_known_folder_name, sync_state=sync_state).run()
+
+    @bound
+    def iter_sync_folder_hierarchy(self, well_known_folder_name=None, sync_state=None, reset_sync_state=False):
+        sync_folder_hierarchy = SyncFolderHierarchy(well_known_folder_name=well_known_folder_name, sync_state=sync_state, sync_state_store=self.authentication.sync_state_store)
+        if reset_sync_state and self.authentication.sync_state_store:
+            self.authentication.sync_state_store.delete(sync_folder_hierarchy._mailbox, sync_folder_hierarchy._sync_state_key)
+        return sync_folder_hierarchy
+
+    @bound
+    def sync_folder_items(self, folder_id, change_key=None, stream=False, sync_state=None, max_changes_returned=SyncFolderItems.MAX_CHANGES_RETURNED, additional_properties=None):
+        sync_folder_items = SyncFolderItems(folder_id, change_key=change_key, sync_state=sync_state, max_changes_returned=max_changes_returned, additional_properties=additional_properties)
+        if stream:
+            return sync_folder_items.stream()
+        return sync_folder_items.run()
 
-    def sync_folder_items(self, folder_id, change_key=None):
-        return SyncFolderItems(folder_id, change_key=change_key).run()
+    @bound
+    def iter_sync_folder_items(self, folder_id, change_key=None, sync_state=None, max_changes_returned=SyncFolderItems.MAX_CHANGES_RETURNED, stream=False, reset_sync_state=False, additional_properties=None):
+        sync_folder_items = SyncFolderItems(folder_id, change_key=change_key, sync_state=sync_state, max_changes_returned=max_changes_returned, stream_changes=stream, sync_state_store=self.authentication.sync_state_store, additional_properties=additional_properties)
+        if reset_sync_state and self.authentication.sync_state_store:
+            self.authentication.sync_state_store.delete(sync_folder_items._mailbox, folder_id)
+        return sync_folder_items
 
+    @bound
     def create_item(self, subject, sender, to_recipients, body_type='HTML'):
         return CreateItem(**{'Subject': subject, 'BodyType': body_type, 'Sender': sender, 'ToRecipients': to_recipients}).run()
 
-    def delete_item(self, item_id, delete_type='MoveToDeletedItems'):
+    @bound
+    def delete_item(self, item_id, delete_type='MoveToDeletedItems', batch_size=DeleteItem.DEFAULT_BATCH_SIZE, thread_count=None):
         if not isinstance(item_id, list):
             item_id = [item_id]
+        item_id = [item for item in item_id if item]
+        results_by_id = {}
+        chunks = list(self.chunk(item_id, batch_size))
+        if chunks:
+            with self.__executor(max(1, min(self.__thread_count(thread_count), len(chunks)))) as executor:
+                threads = [self.__submit(executor, self.__delete_items, chunk, delete_type) for chunk in chunks]
+                for task in as_completed(threads):
+                    results_by_id.update(task.result())
         return_list = []
         for item in item_id:
-            if item:
-                return_list.append(DeleteItem(item, delete_type=delete_type).run())
+            result = results_by_id.get(item) or {}
+            return_list.append({
+                'item_id': item,
+                'response_class': result.get('response_class'),
+                'response_code': result.get('response_code'),
+                'message_text': result.get('message_text')
+            })
         return return_list
 
-    def search_and_delete_message(self, query, thread_count=os.cpu_count()*5, what_if=False):
-        return_list = []
+    def __delete_items(self, item_ids, delete_type):
+        delete_item = DeleteItem(item_ids, delete_type=delete_type)
+        delete_item.run()
+        return delete_item.results_by_id
+
+    @bound
+    def search_and_delete_message(self, query, thread_count=None, what_if=False):
         reference_id_list = []
         for mailbox in self.get_searchable_mailboxes():
             if mailbox:
@@ -151,18 +351,20 @@ class EWS:
         if not reference_id_list:
             print('No searchable mailboxes found')
             return None
-        else:
-            for item in self.execute_ews_search(query, reference_id_list, thread_count=thread_count):
-                if item:
-                    if what_if:
-                        print('WHAT IF: About to delete message ID: {}'.format(item.get('id').get('id')))
-                    else:
-                        return_list.extend(self.delete_item(item.get('id').get('id')))
-        return return_list
+        item_ids = []
+        for item in self.__search_mailboxes(query, reference_id_list, 'All', thread_count):
+            if item:
+                if what_if:
+                    print('WHAT IF: About to delete message ID: {}'.format(item.get('id').get('id')))
+                else:
+                    item_ids.append(item.get('id').get('id'))
+        return self.delete_item(item_ids, thread_count=thread_count)
 
+    @bound
     def get_domain_settings(self, domain=None):
         return GetDomainSettings(domain=domain).run()
 
+    @bound
     def find_items(self, 
                     query_string, 
                     distinguished_folder_name='inbox', 
@@ -172,22 +374,71 @@ class EWS:
                     traversal='Shallow', 
                     reset_cache=False, 
                     return_deleted_items=True, 
-                    return_highlight_terms=True
+                    return_highlight_terms=True,
+                    page_size=None,
+                    batch_size=GetItem.DEFAULT_BATCH_SIZE,
+                    additional_properties=None,
+                    date_range=None,
+                    thread_count=None
         ):
-        return_list = []
-        for message in FindItem(query_string=query_string, distinguished_folder_name=distinguished_folder_name, base_shape=base_shape, include_mime_content=include_mime_content, body_type=body_type, traversal=traversal, reset_cache=reset_cache, return_deleted_items=return_deleted_items, return_highlight_terms=return_highlight_terms).run():
+        kwargs = dict(query_string=query_string, distinguished_folder_name=distinguished_folder_name, base_shape=base_shape, include_mime_content=include_mime_content, body_type=body_type, traversal=traversal, reset_cache=reset_cache, return_deleted_items=return_deleted_items, return_highlight_terms=return_highlight_terms, page_size=page_size, additional_properties=additional_properties)
+        sharder = self.__sharder(date_range)
+        if sharder:
+            thread_count = self.__thread_count(thread_count)
+            item_ids = list(Pipeline(sharder.windows(), [
+                (functools.partial(self.__find_window, sharder, kwargs), thread_count if self.multi_threading else 1)
+            ]))
+            return self.__get_items_in_order(item_ids, batch_size, additional_properties)
+        item_ids = [message.get('item_id').get('id') for message in FindItem(**kwargs).paginate() if message]
+        return self.__get_items_in_order(item_ids, batch_size, additional_properties)
+
+    @bound
+    def iter_find_items(self, 
+                    query_string, 
+                    distinguished_folder_name='inbox', 
+                    base_shape='AllProperties', 
+                    include_mime_content=True, 
+                    body_type='Best', 
+                    traversal='Shallow', 
+                    reset_cache=False, 
+                    return_deleted_items=True, 
+                    return_highlight_terms=True,
+                    page_size=None,
+                    batch_size=GetItem.DEFAULT_BATCH_SIZE,
+                    additional_properties=None
+        ):
+        find_item = FindItem(query_string=query_string, distinguished_folder_name=distinguished_folder_name, base_shape=base_shape, include_mime_content=include_mime_content, body_type=body_type, traversal=traversal, reset_cache=reset_cache, return_deleted_items=return_deleted_items, return_highlight_terms=return_highlight_terms, page_size=page_size, additional_properties=additional_properties)
+        return self.__find_items_paged(find_item, batch_size, additional_properties)
+
+    def __find_window(self, sharder, kwargs, window):
+        item_ids = [message.get('item_id').get('id') for message in FindItem(date_range=window, **kwargs).paginate() if message]
+        sharder.record(window, len(item_ids))
+        return [item_id for item_id in item_ids if sharder.first_seen(item_id)]
+
+    def __find_items_paged(self, find_item, batch_size, additional_properties):
+        item_ids = []
+        for message in find_item.paginate():
             if message:
-                items = self.get_item(item_id=message.get('item_id').get('id'))
-                if items:
-                    for item in items:
-                        return_list.append(item)
-        return return_list
+                item_ids.append(message.get('item_id').get('id'))
+            if len(item_ids) >= batch_size:
+                for item in self.__get_items_in_order(item_ids, batch_size, additional_properties):
+                    yield item
+                item_ids = []
+        for item in self.__get_items_in_order(item_ids, batch_size, additional_properties):
+            yield item
+
+    def __get_items_in_order(self, item_ids, batch_size, additional_properties=None):
+        if not item_ids:
+            return []
+        items_by_id = self.get_items(item_ids, batch_size=batch_size, additional_properties=additional_properties)
+        return [item for item_id in item_ids for item in items_by_id.get(item_id) or []]
 
+    @bound
     def search_mailboxes_using_find_item(self, 
                     query_string, 
                     impersonation_list,
                     multi_threading=True,
-                    thread_count=os.cpu_count()*5,
+                    thread_count=None,
                     distinguished_folder_name='inbox', 
                     base_shape='AllProperties', 
                     include_mime_content=True, 
@@ -199,22 +450,27 @@ class EWS:
         if multi_threading:
             threads = []
             response = []
-            chunks = self.chunk(impersonation_list, int(len(impersonation_list) / thread_count))
-            with ThreadPoolExecutor(max_workers=thread_count) as executor:
-                for chunk in chunks:
-                    threads.append(executor.submit(self.__execute_multithreaded_find, query_string, distinguished_folder_name, base_shape, include_mime_content, body_type, traversal, reset_cache, return_deleted_items, return_highlight_terms, chunk))
+            thread_count = self.__thread_count(thread_count)
+            with self.__executor(thread_count) as executor:
+                # each user is searched with its own FindItem request, so every user is its own task
+                for user in impersonation_list:
+                    threads.append(self.__submit(executor, self.__execute_multithreaded_find, query_string, [user], distinguished_folder_name, base_shape, include_mime_content, body_type, traversal, reset_cache, return_deleted_items, return_highlight_terms))
                 for task in as_completed(threads):
                     result = task.result()
                     if isinstance(result, list):
                         for item in result:
                             response.append(item)
             return response
+        return self.__execute_multithreaded_find(query_string, impersonation_list, distinguished_folder_name, base_shape, include_mime_content, body_type, traversal, reset_cache, return_deleted_items, return_highlight_terms)
 
+    @bound
     def create_search_folder(self, search_string, display_name='Search Folder', base_folder='inbox', traversal='Deep'):
         return CreateFolder(search_string=search_string, search_folder=True, display_name=display_name, base_folder=base_folder, traversal=traversal).run()
 
+    @bound
     def find_search_folder(self):
         return FindFolder().run()
 
+    @bound
     def delete_search_folder(self, folder_id):
         return DeleteFolder(folder_id=folder_id)
@@ -1,4 +1,4 @@
-from .base import Base, ElementMaker, abc, etree, Authentication
+from .base import Base, ElementMaker, abc, etree
 
 
 class Autodiscover(Base):
@@ -23,10 +23,10 @@ class Autodiscover(Base):
 
     @property
     def to(self):
-        return Authentication.credentials[0]
+        return self.authentication.credentials[0]
 
     def get(self, exchange_version):
-        self.__logger.info('Building Autodiscover SOAP request for {current}'.format(current=self.__class__.__name__))
+        self.__logger.info('Building Autodiscover SOAP request for %s', self.__class__.__name__)
         ENVELOPE = self.AUTODISCOVER_NAMESPACE.Envelope
         HEADER = self.SOAP_NAMESPACE.Header   
         self.A_NAMESPACE = ElementMaker(namespace=self.AUTODISCOVER_MAP['a'], nsmap={'a': self.AUTODISCOVER_MAP['a']})
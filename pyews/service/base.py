@@ -1,11 +1,15 @@
 import abc
+import base64
+import asyncio
 import requests
+import contextvars
 from lxml.builder import ElementMaker
 from lxml import etree
 from bs4 import BeautifulSoup
 
 from ..core import Core, Authentication
 from ..utils.attributes import RESPONSE_CODES
+from ..utils.logger import LazyPayload
 
 
 class Base(Core):
@@ -52,13 +56,53 @@ class Base(Core):
     )
     BODY_ELEMENT = SOAP_MESSAGE_ELEMENT.Body
     EXCHANGE_VERSION_ELEMENT = T_NAMESPACE.RequestServerVersion
+    STREAM_STATUS_ELEMENTS = ('ResponseCode', 'ErrorCode', 'MessageText', 'faultcode', 'faultstring')
+    VERSION_ERROR_CODES = ('ErrorInvalidServerVersion', 'ErrorInvalidSchemaVersionForMailboxVersion', 'ErrorIncorrectSchemaVersion')
+    EXECUTOR_PARSE_SIZE = 64 * 1024
+
+    __raw_element = None
+    __raw_xml = None
+
+    def __new__(cls, *args, **kwargs):
+        instance = super().__new__(cls)
+        instance.__authentication = Authentication.current()
+        return instance
+
+    @property
+    def authentication(self):
+        """The Authentication class used by this request. Defaults to the
+        Authentication class bound to the context the endpoint was created in.
+        """
+        return self.__authentication
+
+    @authentication.setter
+    def authentication(self, value):
+        self.__authentication = value
+
+    @property
+    def raw_element(self):
+        """The last SOAP response as an lxml element, or None."""
+        return self.__raw_element
+
+    @raw_element.setter
+    def raw_element(self, value):
+        self.__raw_element = value
+        self.__raw_xml = None
 
     @property
     def raw_xml(self):
+        """The last SOAP response as a BeautifulSoup object, or None.
+
+        It is built from raw_element the first time it is accessed, so
+        raw_element should be preferred when the response is only searched.
+        """
+        if self.__raw_xml is None and self.__raw_element is not None:
+            self.__raw_xml = BeautifulSoup(etree.tostring(self.__raw_element), 'xml')
         return self.__raw_xml
 
     @raw_xml.setter
     def raw_xml(self, value):
+        self.__raw_element = None
         self.__raw_xml = value
 
     @abc.abstractmethod
@@ -66,10 +110,11 @@ class Base(Core):
         raise NotImplementedError
 
     def _impersonation_header(self):
-        if hasattr(Authentication, 'impersonate_as') and Authentication.impersonate_as:
+        impersonate_as = self.authentication.impersonate_as
+        if impersonate_as:
             return self.T_NAMESPACE.ExchangeImpersonation(
                 self.T_NAMESPACE.ConnectingSID(
-                    self.T_NAMESPACE.PrimarySmtpAddress(Authentication.impersonate_as)
+                    self.T_NAMESPACE.PrimarySmtpAddress(impersonate_as)
                 )
             )
         return ''
@@ -78,14 +123,187 @@ class Base(Core):
         result = error_message.split('Please use the ConvertId method to convert the Id from ')[1].split(' format.')[0]
         return result.split(' to ')
 
-    def __process_response(self, response):
-        self.__logger.debug('SOAP REQUEST: {}'.format(response))
-        self.raw_xml = response
-        namespace = self.NAMESPACE_MAP
+    def __find_text(self, element, name):
+        found = element.find('.//{*}' + name)
+        if found is not None:
+            return found.text
+        return None
+
+    @property
+    def _namespace_dict(self):
         namespace_dict = {}
-        for key,val in namespace.items():
+        for key,val in self.NAMESPACE_MAP.items():
             namespace_dict[val] = None
-        return self.parse_response(response, namespace_dict=namespace_dict)
+        return namespace_dict
+
+    def __any_response_succeeded(self, element):
+        for found in element.iter('{*}ResponseCode'):
+            if found.text == 'NoError':
+                return True
+        return False
+
+    def __processed(self, response_code):
+        # the server answered with ResponseMessages, so the request was processed and
+        # sending it to another endpoint or version would repeat it, unless it rejected the version
+        return response_code is not None and response_code not in self.VERSION_ERROR_CODES
+
+    def __log_payload(self, label, payload):
+        if LazyPayload.enabled(self.__logger):
+            self.__logger.debug('%s: %s', label, LazyPayload(payload))
+
+    def __process_response(self, response):
+        self.__log_payload('SOAP REQUEST', response)
+        self.raw_element = response
+        return self.parse_response(response, namespace_dict=self._namespace_dict)
+
+    def _send(self, endpoint, version, stream=False):
+        """Builds and sends the SOAP request for the provided endpoint and Exchange version.
+
+        Args:
+            endpoint (str): The EWS url to send the request to.
+            version (str): The Exchange version to request.
+            stream (bool, optional): Whether or not to stream the response body. Defaults to False.
+
+        Returns:
+            requests.Response: The response returned by the server.
+        """
+        self.__logger.info('Sending SOAP request to %s', endpoint)
+        self.__logger.info('Setting Exchange Version header to %s', version)
+        body = self.get(version)
+        self.__log_payload('EWS SOAP Request Body', body)
+        header_dict = self.authentication.auth_header
+        header_dict.update(self.SOAP_REQUEST_HEADER)
+        self.__logger.debug('Headers: %s', header_dict)
+        response = self.authentication.connection_pool.post(
+            endpoint,
+            data=body,
+            headers=header_dict,
+            auth=self.authentication.credentials,
+            verify=True,
+            stream=stream
+        )
+        self.__logger.debug('Response HTTP status code: %s', response.status_code)
+        return response
+
+    @property
+    def _stream_results_keys(self):
+        return (self.RESULTS_KEY,)
+
+    def _stream_result(self, name, result):
+        return result
+
+    def _stream_element(self, name, element):
+        pass
+
+    def __iterparse_results(self, response, status):
+        namespace_dict = self._namespace_dict
+        results_keys = self._stream_results_keys
+        response.raw.decode_content = True
+        depth = 0
+        pending = {}
+        declarations = {}
+        for event, element in etree.iterparse(response.raw, events=('start-ns', 'start', 'end'), resolve_entities=False, no_network=True, huge_tree=True):
+            if event == 'start-ns':
+                prefix, uri = element
+                pending[prefix or ''] = uri
+                continue
+            name = etree.QName(element).localname
+            if event == 'start':
+                if name in results_keys:
+                    depth += 1
+                if element.attrib and pending:
+                    if depth:
+                        declarations[element] = pending
+                    pending = {}
+                continue
+            if name in results_keys:
+                depth -= 1
+                if not depth:
+                    result = self._stream_result(name, self._element_to_dict(element, namespace_dict, True, declarations))
+                    declarations = {}
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+                    yield result
+            elif not depth:
+                if name in self.STREAM_STATUS_ELEMENTS and name not in status:
+                    status[name] = element.text
+                self._stream_element(name, element)
+                element.clear(keep_tail=True)
+
+    def stream(self):
+        """The Base class stream method sends the SOAP request like run but
+        parses the response incrementally while it is read from the socket.
+        Each RESULTS_KEY element is yielded as soon as it is complete and is
+        then discarded, so memory is bounded by a single result instead of
+        the whole response.
+
+        The first value of each of the STREAM_STATUS_ELEMENTS found outside of
+        the results is recorded in the stream_status dictionary.
+
+        Yields:
+            dict: A parsed result for each RESULTS_KEY element in the response.
+        """
+        if not hasattr(self, 'RESULTS_KEY'):
+            yield self.run()
+            return
+        results = self.__perform(self._request_flow(), self.__send_streamed, self.__handle_streamed)
+        for result in results or []:
+            yield result
+
+    def __send_streamed(self, endpoint, version):
+        response = self._send(endpoint, version, stream=True)
+        if response.status_code < 400:
+            return response.status_code, response.headers, None, response
+        # the body of an error response is read so throttling faults such as ErrorServerBusy are recognized
+        try:
+            return response.status_code, response.headers, response.content, None
+        finally:
+            response.close()
+
+    def __handle_streamed(self, parsed_response, response, family, mailbox, endpoint, version):
+        if response is None:
+            handled, result = self.__handle_response(parsed_response, family, mailbox, endpoint, version)
+            return handled, result if isinstance(result, list) else []
+        status = {}
+        self.stream_status = status
+        results = self.__iterparse_results(response, status)
+        try:
+            first = next(results)
+        except StopIteration:
+            response.close()
+        except etree.XMLSyntaxError as e:
+            response.close()
+            self.__logger.info('Unable to parse the response from %s: %s', endpoint, e)
+            return False, None
+        except Exception:
+            response.close()
+            raise
+        else:
+            self.authentication.endpoint_cache.set(family, mailbox, endpoint, version)
+            return True, self.__streamed_results(first, results, response)
+        if 'NoError' in (status.get('ResponseCode'), status.get('ErrorCode')):
+            self.authentication.endpoint_cache.set(family, mailbox, endpoint, version)
+            return True, []
+        self.__logger.info(self.__log_warning({
+            'response_code': status.get('ResponseCode'),
+            'error_code': status.get('ErrorCode'),
+            'from': self.__class__.__name__,
+            'message_text': status.get('MessageText') or status.get('faultcode'),
+            'additional_text': status.get('faultstring')
+        }))
+        if self.__processed(status.get('ResponseCode')):
+            self.authentication.endpoint_cache.set(family, mailbox, endpoint, version)
+            return True, []
+        return False, None
+
+    def __streamed_results(self, first, results, response):
+        try:
+            yield first
+            for result in results:
+                yield result
+        finally:
+            response.close()
 
     def __log_warning(self, kwargs):
         log_message = f'''
@@ -99,102 +317,349 @@ The server responded with:
             log_message += f'''\n\t{kwargs.get('additional_text')}'''
         return log_message
 
+    @property
+    def _operation_family(self):
+        for cls in self.__class__.__mro__:
+            if cls.__name__ in ('Operation', 'Autodiscover'):
+                return cls.__name__
+        return self.__class__.__name__
+
+    @property
+    def _mailbox(self):
+        impersonate_as = self.authentication.impersonate_as
+        if impersonate_as:
+            return impersonate_as
+        if self.authentication.credentials:
+            return self.authentication.credentials[0]
+        return None
+
+    def _candidates(self, cached=None):
+        """Returns the (exchange_version, endpoint) combinations to attempt
+        for this request. A cached combination which previously succeeded is
+        attempted first.
+
+        Args:
+            cached (tuple, optional): A cached (endpoint, exchange_version) pair. Defaults to None.
+
+        Returns:
+            list: A list of (exchange_version, endpoint) tuples.
+        """
+        candidates = []
+        for version in self.authentication.exchange_versions:
+            for endpoint in self.authentication.ews_url:
+                if self._operation_family == 'Operation' and 'autodiscover' in endpoint:
+                    self.__logger.debug('%s == Operation so skipping endpoint %s', self._operation_family, endpoint)
+                    continue
+                elif self._operation_family == 'Autodiscover' and 'autodiscover' not in endpoint:
+                    self.__logger.debug('%s == Autodiscover so skipping endpoint %s', self._operation_family, endpoint)
+                    continue
+                candidates.append((version, endpoint))
+        if cached:
+            endpoint, version = cached
+            if (version, endpoint) in candidates:
+                candidates.remove((version, endpoint))
+                candidates.insert(0, (version, endpoint))
+        return candidates
+
+    def __parse_content(self, content):
+        self.__log_payload('Response content', content)
+        if not content or not content.strip():
+            return None
+        try:
+            return self._to_element(content)
+        except etree.XMLSyntaxError as e:
+            self.__logger.info('Unable to parse the response from %s: %s', self.__class__.__name__, e)
+            return None
+
+    def __throttle_delay(self, attempt, status_code, headers, parsed_response):
+        """Returns the number of seconds to wait before resending a throttled request,
+        None if the request was not throttled or False if the retries are exhausted.
+        """
+        retry_policy = self.authentication.retry_policy
+        server_delay = retry_policy.server_delay(status_code, headers, parsed_response)
+        if server_delay is None:
+            return None
+        delay = retry_policy.next_delay(attempt, server_delay)
+        if delay is None:
+            self.__logger.warning('%s is still throttled after %s retries', self.__class__.__name__, attempt)
+            return False
+        self.__logger.info('%s was throttled. Retrying in %.1f seconds', self.__class__.__name__, delay)
+        return delay
+
+    @property
+    def __account(self):
+        credentials = self.authentication.credentials
+        return credentials[0] if credentials else None
+
+    def __wait_for_rate_limit(self):
+        rate_limiter = self.authentication.rate_limiter
+        if rate_limiter:
+            rate_limiter.wait(self.__account, self._mailbox)
+
+    def __acquire(self):
+        concurrency_limiter = self.authentication.concurrency_limiter
+        return concurrency_limiter.acquire() if concurrency_limiter else None
+
+    def __release(self, token, throttled=False, error=False):
+        concurrency_limiter = self.authentication.concurrency_limiter
+        if concurrency_limiter and token is not None:
+            concurrency_limiter.release(token, throttled=throttled, error=error)
+
+    def __handle_response(self, parsed_response, family, mailbox, endpoint, version):
+        """Checks the parsed response returned by an endpoint and Exchange version.
+
+        Returns:
+            tuple: (True, result) if the response was handled or (False, None) if the next endpoint and version should be attempted.
+        """
+        if parsed_response is None:
+            self.__logger.warning(
+                'The server responded with empty content to POST-request '
+                'from %s', self.__class__.__name__)
+            return False, None
+
+        response_code = self.__find_text(parsed_response, 'ResponseCode')
+        error_code = self.__find_text(parsed_response, 'ErrorCode')
+        message_text = self.__find_text(parsed_response, 'MessageText')
+        error_message = self.__find_text(parsed_response, 'ErrorMessage')
+        fault_message = self.__find_text(parsed_response, 'faultcode')
+        fault_string = self.__find_text(parsed_response, 'faultstring')
+
+        if 'NoError' in (response_code, error_code) or self.__any_response_succeeded(parsed_response):
+            self.authentication.endpoint_cache.set(family, mailbox, endpoint, version)
+            return True, self.__process_response(parsed_response)
+        if response_code in RESPONSE_CODES or error_code in RESPONSE_CODES or error_message:
+            warning_dict = {
+                'response_code': response_code,
+                'error_code': error_code,
+                'from': self.__class__.__name__,
+                'message_text': message_text
+            }
+            if message_text and 'ConvertId' in message_text:
+                self.authentication.endpoint_cache.set(family, mailbox, endpoint, version)
+                self.raw_element = parsed_response
+                return True, self.__parse_convert_id_error_message(message_text)
+            if 'ErrorAccessDenied' in (response_code, error_code) and endpoint in ('GetSearchableMailboxes', 'SearchMailboxes'):
+                warning_dict.update({
+                    'additional_text': 'Please make sure you have Discovery Management rights: https://docs.microsoft.com/en-us/Exchange/policy-and-compliance/ediscovery/assign-permissions?redirectedfrom=MSDN&view=exchserver-2019'
+                })
+            elif error_message:
+                warning_dict.update({
+                    'additional_text': error_message
+                })
+            self.__logger.info(self.__log_warning(warning_dict))
+            if self.__processed(response_code):
+                self.authentication.endpoint_cache.set(family, mailbox, endpoint, version)
+                self.raw_element = parsed_response
+                return True, None
+            return False, None
+        elif fault_message or fault_string:
+            warning_dict = {
+                'response_code': response_code,
+                'error_code': error_code,
+                'from': self.__class__.__name__,
+                'message_text': fault_message,
+                'additional_text': fault_string
+            }
+            self.__logger.info(self.__log_warning(warning_dict))
+            return False, None
+        else:
+            warning_dict = {
+                'response_code': 'Unknown',
+                'error_code': 'Unknown',
+                'from': self.__class__.__name__,
+                'message_text': message_text,
+                'additional_text': 'This error is unrecognized and is not a valid response code or error code.'
+            }
+            self.__logger.info(self.__log_warning(warning_dict))
+            return False, None
+
     def run(self):
         """The Base class run method is used for all SOAP requests for
         every endpoint defined
 
         Returns:
-            BeautifulSoup: Returns a BeautifulSoup object or None.
+            list: Returns a list of parsed results, a dictionary of the parsed response or None.
         """
-        for item in Authentication.__dict__.keys():
+        authentication = self.authentication
+        for item in authentication.__dict__.keys():
             if not item.startswith('_'):
-                if hasattr(Authentication, item):
-                    setattr(self, item, getattr(Authentication, item))
+                if hasattr(authentication, item):
+                    setattr(self, item, getattr(authentication, item))
 
-        for version in Authentication.exchange_versions:
-            for endpoint in Authentication.ews_url:
-                if self.__class__.__base__.__name__ == 'Operation' and 'autodiscover' in endpoint:
-                    self.__logger.debug('{} == Operation so skipping endpoint {}'.format(self.__class__.__base__.__name__, endpoint))
-                    continue
-                elif self.__class__.__base__.__name__ == 'Autodiscover' and 'autodiscover' not in endpoint:
-                    self.__logger.debug('{} == Autodiscover so skipping endpoint {}'.format(self.__class__.__base__.__name__, endpoint))
+        return self.__perform(self._request_flow(), self.__send, self.__handle_sent)
+
+    def __send(self, endpoint, version):
+        response = self._send(endpoint, version)
+        return response.status_code, response.headers, response.content, None
+
+    def __handle_sent(self, parsed_response, response, family, mailbox, endpoint, version):
+        return self.__handle_response(parsed_response, family, mailbox, endpoint, version)
+
+    def _request_flow(self):
+        """Attempts the request with each exchange version and endpoint candidate
+        and resends throttled responses. The flow performs no I/O itself, so run,
+        stream and run_async share it and only differ in how they perform its steps.
+
+        Each step is a tuple of a name and an argument:
+            ('acquire', None): Wait for the rate and concurrency limiters. Send back the limiter token.
+            ('send', (endpoint, version)): Send the request. Send back (status_code, headers, content, response),
+                where content is None when the body is left to be streamed from response, or None if it could not be sent.
+            ('sleep', delay): Wait delay seconds before the request is resent.
+            ('handle', (parsed_response, response, family, mailbox, endpoint, version)): Process the response.
+                Send back True if it was handled, otherwise the next candidate is attempted.
+
+        Yields:
+            tuple: The next step to perform.
+        """
+        family = self._operation_family
+        mailbox = self._mailbox
+        cached = self.authentication.endpoint_cache.get(family, mailbox)
+        for version, endpoint in self._candidates(cached):
+            if cached and cached != (endpoint, version):
+                self.authentication.endpoint_cache.invalidate(family, mailbox)
+                cached = None
+            attempt = 0
+            while True:
+                token = yield 'acquire', None
+                try:
+                    sent = yield 'send', (endpoint, version)
+                except BaseException:
+                    # the slot is also freed when the request is cancelled or the flow is closed
+                    self.__release(token, error=True)
+                    raise
+                if sent is None:
+                    self.__release(token, error=True)
+                    break
+                status_code, headers, content, response = sent
+                parsed_response = self.__parse_content(content) if content is not None else None
+                delay = self.__throttle_delay(attempt, status_code, headers, parsed_response)
+                self.__release(token, throttled=delay is not None)
+                if delay is False:
+                    return
+                if delay is not None:
+                    yield 'sleep', delay
+                    attempt += 1
                     continue
+                handled = yield 'handle', (parsed_response, response, family, mailbox, endpoint, version)
+                if handled:
+                    return
+                break
+
+    def __perform(self, flow, send, handle):
+        """Performs the steps of a request flow using blocking I/O.
+
+        Returns:
+            The result returned by handle for the response which was handled or None.
+        """
+        result = None
+        value = None
+        try:
+            while True:
+                try:
+                    step, argument = flow.send(value)
+                except StopIteration:
+                    return result
+                value = None
+                if step == 'acquire':
+                    self.__wait_for_rate_limit()
+                    value = self.__acquire()
+                elif step == 'send':
+                    try:
+                        value = send(*argument)
+                    except requests.RequestException as e:
+                        self.__logger.info('Unable to send SOAP request to %s: %s', argument[0], e)
+                elif step == 'sleep':
+                    self.authentication.retry_policy.sleep(argument)
+                else:
+                    value, result = handle(*argument)
+        finally:
+            # closing the flow releases the limiter slot of a request which raised or was interrupted
+            flow.close()
+
+    async def _send_async(self, session, endpoint, version):
+        """Builds and sends the SOAP request using an asynchronous HTTP session.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the request.
+            endpoint (str): The EWS url to send the request to.
+            version (str): The Exchange version to request.
+
+        Returns:
+            tuple: The HTTP status code, headers and content returned by the server.
+        """
+        self.__logger.info('Sending asynchronous SOAP request to %s', endpoint)
+        body = self.get(version)
+        self.__log_payload('EWS SOAP Request Body', body)
+        # fetching or refreshing an OAuth2 access token blocks
+        header_dict = await self._run_in_executor(lambda: self.authentication.auth_header)
+        header_dict.update(self.SOAP_REQUEST_HEADER)
+        if 'Authorization' not in header_dict:
+            # basic authentication is only used when no OAuth2 access token is sent
+            header_dict['Authorization'] = 'Basic {}'.format(base64.b64encode(':'.join(self.authentication.credentials).encode('latin1')).decode('ascii'))
+        async with session.post(endpoint, data=body, headers=header_dict) as response:
+            self.__logger.debug('Response HTTP status code: %s', response.status)
+            return response.status, response.headers, await response.read()
+
+    async def _run_in_executor(self, function, *args):
+        """Calls a blocking function in the default executor, within a copy of the
+        current context, so it does not block the event loop.
+
+        Returns:
+            The value returned by function.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, contextvars.copy_context().run, function, *args)
+
+    async def run_async(self, session):
+        """Sends the SOAP request like run but over an asynchronous HTTP session,
+        so many requests can be in flight without a thread each. Responses of at least
+        EXECUTOR_PARSE_SIZE bytes are parsed in the default executor, so parsing them
+        does not hold up the other requests on the event loop.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the request.
+
+        Returns:
+            list: Returns a list of parsed results, a dictionary of the parsed response or None.
+        """
+        return await self.__perform_async(self._request_flow(), session)
+
+    async def __perform_async(self, flow, session):
+        """Performs the steps of a request flow over an asynchronous HTTP session.
+
+        Returns:
+            The result of the response which was handled or None.
+        """
+        from aiohttp import ClientError
+        result = None
+        value = None
+        large = False
+        try:
+            while True:
                 try:
-                    self.__logger.info('Sending SOAP request to {}'.format(endpoint))
-                    self.__logger.info('Setting Exchange Version header to {}'.format(version))
-                    body = self.get(version).decode("utf-8")
-                    self.__logger.debug('EWS SOAP Request Body: {}'.format(body))
-                    if Authentication.auth_header:
-                        header_dict = Authentication.auth_header
-                        header_dict.update(self.SOAP_REQUEST_HEADER)
-                    else:
-                        header_dict = self.SOAP_REQUEST_HEADER
-                    self.__logger.debug(f"Headers: {header_dict}")
-                    response = requests.post(
-                        url=endpoint,
-                        data=body,
-                        headers=header_dict,
-                        auth=Authentication.credentials,
-                        verify=True
-                    )
-
-                    self.__logger.debug('Response HTTP status code: {}'.format(response.status_code))
-                    self.__logger.debug('Response text: {}'.format(response.text))
-                    self.__logger.debug('Response content: {}'.format(response.content))
-
-                    parsed_response = BeautifulSoup(response.content, 'xml')
-                    if not parsed_response.contents:
-                        self.__logger.warning(
-                            'The server responded with empty content to POST-request '
-                            'from {current}'.format(current=self.__class__.__name__))
-
-                    response_code = getattr(parsed_response.find('ResponseCode'), 'string', None)
-                    error_code = getattr(parsed_response.find('ErrorCode'), 'string', None)
-                    message_text = getattr(parsed_response.find('MessageText'), 'string', None)
-                    error_message = getattr(parsed_response.find('ErrorMessage'), 'string', None)
-                    fault_message = getattr(parsed_response.find('faultcode'), 'string', None)
-                    fault_string = getattr(parsed_response.find('faultstring'), 'string', None)
-
-                    if 'NoError' in (response_code, error_code):
-                        return self.__process_response(parsed_response)
-                    if response_code in RESPONSE_CODES or error_code in RESPONSE_CODES or error_message:
-                        warning_dict = {
-                            'response_code': response_code,
-                            'error_code': error_code,
-                            'from': self.__class__.__name__,
-                            'message_text': message_text
-                        }
-                        if 'ConvertId' in message_text:
-                            return self.__parse_convert_id_error_message(message_text)
-                        if 'ErrorAccessDenied' in (response_code, error_code) and endpoint in ('GetSearchableMailboxes', 'SearchMailboxes'):
-                            warning_dict.update({
-                                'additional_text': 'Please make sure you have Discovery Management rights: https://docs.microsoft.com/en-us/Exchange/policy-and-compliance/ediscovery/assign-permissions?redirectedfrom=MSDN&view=exchserver-2019'
-                            })
-                        elif error_message:
-                            warning_dict.update({
-                                'additional_text': error_message
-                            })
-                        self.__logger.info(self.__log_warning(warning_dict))
-                        continue
-                    elif fault_message or fault_string:
-                        warning_dict = {
-                            'response_code': response_code,
-                            'error_code': error_code,
-                            'from': self.__class__.__name__,
-                            'message_text': fault_message,
-                            'additional_text': fault_string
-                        }
-                        self.__logger.info(self.__log_warning(warning_dict))
-                        continue
-                    else:
-                        warning_dict = {
-                            'response_code': 'Unknown',
-                            'error_code': 'Unknown',
-                            'from': self.__class__.__name__,
-                            'message_text': message_text,
-                            'additional_text': 'This error is unrecognized and is not a valid response code or error code.'
-                        }
-                        self.__logger.info(self.__log_warning(warning_dict))
-                        continue
-                except:
-                    pass
+                    step, argument = flow.send(value)
+                except StopIteration:
+                    return result
+                value = None
+                if step == 'acquire':
+                    rate_limiter = self.authentication.rate_limiter
+                    if rate_limiter:
+                        await rate_limiter.wait_async(self.__account, self._mailbox)
+                    concurrency_limiter = self.authentication.concurrency_limiter
+                    if concurrency_limiter:
+                        value = await concurrency_limiter.acquire_async()
+                elif step == 'send':
+                    try:
+                        value = await self._send_async(session, *argument) + (None,)
+                        large = len(value[2] or b'') >= self.EXECUTOR_PARSE_SIZE
+                    except (ClientError, asyncio.TimeoutError) as e:
+                        self.__logger.info('Unable to send SOAP request to %s: %s', argument[0], e)
+                elif step == 'sleep':
+                    await asyncio.sleep(argument)
+                elif large or self.authentication.endpoint_cache.path:
+                    # parsing a large response or writing the persisted endpoint cache would block the event loop
+                    value, result = await self._run_in_executor(self.__handle_sent, *argument)
+                else:
+                    value, result = self.__handle_sent(*argument)
+        finally:
+            # closing the flow releases the limiter slot of a request which raised or was cancelled
+            flow.close()
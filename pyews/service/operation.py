@@ -1,4 +1,7 @@
+import functools
 from .base import Base, etree, abc
+from ..utils.exceptions import UknownValueError
+from ..utils.attributes import FIELD_URI_MAP
 
 
 class Operation(Base):
@@ -7,20 +10,90 @@ class Operation(Base):
     of EWS Operation SOAP request
     """
 
-    def get(self, exchange_version):
-        self.__logger.info('Building SOAP request for {current}'.format(current=self.__class__.__name__))
-        ENVELOPE = self.SOAP_MESSAGE_ELEMENT.Envelope
-        HEADER = self.SOAP_NAMESPACE.Header
-        self.envelope = ENVELOPE(
-            HEADER(
-                self.T_NAMESPACE.RequestedServerVersion(Version=exchange_version),
-                self._impersonation_header()
+    FIELD_URIS = ['{}:{}'.format(prefix, name) for prefix, names in FIELD_URI_MAP.items() for name in names]
+    BODY_PLACEHOLDER = 'pyews-body'
+    BODY_CLOSING_TAG = b'</soap:Body>'
+    ENVELOPE_CACHE_SIZE = 1024
+
+    @classmethod
+    @functools.lru_cache(maxsize=ENVELOPE_CACHE_SIZE)
+    def _envelope_template(cls, exchange_version, impersonate_as):
+        """Serializes the static part of the SOAP envelope for an Exchange version
+        and impersonated user once.
+
+        Returns:
+            tuple: The bytes before and after the contents of the SOAP body.
+        """
+        impersonation = ''
+        if impersonate_as:
+            impersonation = cls.T_NAMESPACE.ExchangeImpersonation(
+                cls.T_NAMESPACE.ConnectingSID(
+                    cls.T_NAMESPACE.PrimarySmtpAddress(impersonate_as)
+                )
+            )
+        envelope = cls.SOAP_MESSAGE_ELEMENT.Envelope(
+            cls.SOAP_NAMESPACE.Header(
+                cls.T_NAMESPACE.RequestedServerVersion(Version=exchange_version),
+                impersonation
             ),
-            self.BODY_ELEMENT(
-                self.soap()
+            cls.BODY_ELEMENT(
+                etree.Element(cls.BODY_PLACEHOLDER)
             )
         )
-        return etree.tostring(self.envelope)
+        prefix, suffix = etree.tostring(envelope).split(etree.tostring(etree.Element(cls.BODY_PLACEHOLDER)))
+        return prefix, suffix
+
+    def get(self, exchange_version):
+        self.__logger.info('Building SOAP request for %s', self.__class__.__name__)
+        prefix, suffix = self._envelope_template(exchange_version, self.authentication.impersonate_as or '')
+        # serializing the body inside a soap:Body declaring the envelope's namespaces
+        # drops the redundant declarations, exactly as when it is part of the envelope
+        body = etree.tostring(self.BODY_ELEMENT(self.soap()))
+        return prefix + body[body.index(b'>') + 1:-len(self.BODY_CLOSING_TAG)] + suffix
+
+    def _validate_additional_properties(self, additional_properties):
+        """Checks the field URIs requested as AdditionalProperties.
+
+        Args:
+            additional_properties (list): A list of field URIs (e.g. 'item:Subject') or None.
+
+        Raises:
+            UknownValueError: A field URI is not one of FIELD_URIS.
+
+        Returns:
+            list: The field URIs or None if none were provided.
+        """
+        if not additional_properties:
+            return None
+        for field_uri in additional_properties:
+            if field_uri not in self.FIELD_URIS:
+                raise UknownValueError(provided_value=field_uri, known_values=self.FIELD_URIS)
+        return list(additional_properties)
+
+    def _additional_properties(self, additional_properties):
+        if not additional_properties:
+            return []
+        return [self.T_NAMESPACE.AdditionalProperties(
+            *[self.T_NAMESPACE.FieldURI(FieldURI=field_uri) for field_uri in additional_properties]
+        )]
+
+    def _map_response_messages(self, ids):
+        """Maps each ResponseMessage of the last response to the id it was
+        requested for. EWS returns one ResponseMessage per requested id, in order.
+
+        Args:
+            ids (list): The ids sent in the last request.
+
+        Returns:
+            dict: A dictionary of parsed ResponseMessages keyed by id.
+        """
+        return_dict = {}
+        if getattr(self, 'raw_element', None) is None:
+            return return_dict
+        namespace_dict = self._namespace_dict
+        for item_id, message in zip(ids, self._iter_response_messages(self.raw_element)):
+            return_dict[item_id] = self._element_to_dict(message, namespace_dict, True, {})
+        return return_dict
 
     @abc.abstractmethod
     def soap(self):
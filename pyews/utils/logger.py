@@ -1,6 +1,8 @@
 import os
+import random
 import logging.config
 import yaml
+from lxml import etree
 
 from logging import FileHandler, DEBUG, INFO, ERROR, WARNING, CRITICAL
 import logging
@@ -42,3 +44,40 @@ class LoggingBase(type):
             logger = logging.config.dictConfig(config)
         else:
             logger = logging.basicConfig(level=default_level)
+
+
+class LazyPayload:
+    """Defers formatting a SOAP payload until a log record is emitted, so
+    payload logs cost nothing when DEBUG logging is disabled.
+
+    Set max_length to truncate logged payloads and sample_rate to only log
+    the payloads of a fraction of requests.
+    """
+
+    max_length = None
+    sample_rate = 1.0
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    @classmethod
+    def enabled(cls, logger):
+        """Whether or not a payload should be logged to the logger.
+        """
+        if not logger.isEnabledFor(DEBUG):
+            return False
+        return cls.sample_rate >= 1 or random.random() < cls.sample_rate
+
+    def __str__(self):
+        payload = self.payload
+        if isinstance(payload, etree._Element):
+            payload = etree.tostring(payload)
+        length = len(payload)
+        truncated = self.max_length is not None and length > self.max_length
+        if truncated:
+            payload = payload[:self.max_length]
+        if isinstance(payload, bytes):
+            payload = payload.decode('utf-8', 'replace')
+        if truncated:
+            payload += '... (truncated from {} characters)'.format(length)
+        return payload
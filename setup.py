@@ -13,6 +13,9 @@ setup(
     long_description=open('README.md').read(),
     long_description_content_type="text/markdown",
     install_requires=parse_requirements('./requirements.txt'),
+    extras_require={
+        'async': ['aiohttp']
+    },
     keywords=['ews', 'exchange', 'office365', 'email', 'ediscovery', 'swimlane'],
     url='https://github.com/swimlane/pyews',
     author='Swimlane',
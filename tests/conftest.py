@@ -1,3 +1,4 @@
+import io
 import os
 import pytest
 
@@ -10,3 +11,86 @@ def pyews_fixture():
 def pyews_ews_interface():
     from pyews import EWS
     yield EWS
+
+
+class FakeResponse:
+
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.raw = io.BytesIO(content)
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncResponse:
+
+    def __init__(self, content):
+        self.content = content
+        self.status = 200
+        self.headers = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+    async def read(self):
+        return self.content
+
+
+class FakeSession:
+
+    closed = False
+    response_class = FakeAsyncResponse
+
+    def __init__(self, content):
+        self.content = content
+        self.requests = []
+
+    def post(self, url, data=None, headers=None):
+        self.requests.append((url, data, headers))
+        return self.response_class(self.content)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_response():
+    """A requests response returning the provided content."""
+    yield FakeResponse
+
+@pytest.fixture
+def fake_session():
+    """An aiohttp session answering every request with the provided content."""
+    yield FakeSession
+
+@pytest.fixture
+def load_response():
+    """Reads a SOAP response from tests/data."""
+    def load(name):
+        with open(os.path.join(os.path.dirname(__file__), 'data', name), 'rb') as f:
+            return f.read()
+    yield load
+
+@pytest.fixture
+def authentication(monkeypatch):
+    """The Authentication class with test credentials and an endpoint cache which
+    is not persisted. Its endpoint cache, retry policy and limiters are restored
+    after the test, so tests may replace them.
+    """
+    from pyews import Authentication, EndpointCache
+    for name in ('_endpoint_cache', '_retry_policy', '_concurrency_limiter', '_rate_limiter'):
+        monkeypatch.setattr(Authentication, name, getattr(Authentication, name))
+    Authentication.credentials = ('user@company.com','mypassword')
+    Authentication.endpoint_cache = EndpointCache(path=None)
+    yield Authentication
@@ -0,0 +1,104 @@
+def test_adaptive_chunker_grows_towards_target_latency():
+    from pyews import AdaptiveChunker
+    chunker = AdaptiveChunker(initial_size=2, max_size=100, target_latency=10.0, smoothing=1.0)
+    chunker.record(2, 0.2)
+    assert chunker.stats['size'] == 4
+    for _ in range(10):
+        chunker.record(chunker.size, chunker.size * 0.5)
+    assert chunker.stats['size'] == 20
+    chunker.record(20, 10.0, result_count=20000)
+    assert chunker.stats['size'] == 10
+    assert chunker.stats['successes'] == 12
+
+
+def test_adaptive_chunker_splits_failed_chunks():
+    from pyews import AdaptiveChunker
+    chunker = AdaptiveChunker(initial_size=8)
+    assert [len(chunk) for chunk in chunker.chunks(list(range(20)))] == [8, 8, 4]
+    chunker.record(8, 60.0, failed=True)
+    assert chunker.stats['size'] == 4
+    assert chunker.stats['failures'] == 1
+    assert chunker.split([1, 2, 3]) == [[1], [2, 3]]
+    assert chunker.split([1]) == []
+
+
+def test_search_retries_failed_chunks_in_halves(monkeypatch):
+    import pyews.ews
+    from pyews import Authentication, EWS, AdaptiveChunker
+
+    searched = []
+
+    class FakeSearchMailboxes:
+
+        def __init__(self, query, reference_id=None, search_scope='All', page_size=None):
+            self.reference_id = reference_id
+            self.item_count = None
+            self.rejected = False
+
+        def run(self):
+            searched.append(list(self.reference_id))
+            if len(self.reference_id) > 2:
+                self.rejected = True
+                return None
+            self.item_count = len(self.reference_id)
+            return [{'id': {'id': mailbox}} for mailbox in self.reference_id]
+
+        def _next_page(self, response):
+            return False
+
+    monkeypatch.setattr(pyews.ews, 'SearchMailboxes', FakeSearchMailboxes)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    ews.multi_threading = False
+    ews.executor = None
+    ews.chunker = AdaptiveChunker(initial_size=8)
+    monkeypatch.setattr(ews, 'get_items', lambda item_ids, batch_size=100: {item_id: None for item_id in item_ids})
+    results = ews.execute_ews_search('subject:test', list('abcdefgh'), thread_count=1)
+    assert sorted(item['id']['id'] for item in results) == list('abcdefgh')
+    assert searched[:3] == [list('abcdefgh'), list('abcd'), list('ab')]
+    assert ews.chunker.stats['failures'] == 3
+
+
+def test_search_does_not_split_chunks_given_up_on_after_throttling(monkeypatch):
+    import pyews.ews
+    from pyews import Authentication, EWS, AdaptiveChunker
+
+    searched = []
+
+    class FakeSearchMailboxes:
+
+        def __init__(self, query, reference_id=None, search_scope='All', page_size=None):
+            self.reference_id = reference_id
+            self.item_count = None
+            self.rejected = False
+
+        def run(self):
+            searched.append(list(self.reference_id))
+            return None
+
+        def _next_page(self, response):
+            return False
+
+    monkeypatch.setattr(pyews.ews, 'SearchMailboxes', FakeSearchMailboxes)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    ews.multi_threading = False
+    ews.executor = None
+    ews.chunker = AdaptiveChunker(initial_size=8)
+    monkeypatch.setattr(ews, 'get_items', lambda item_ids, batch_size=100: {item_id: None for item_id in item_ids})
+    assert ews.execute_ews_search('subject:test', list('abcdefgh'), thread_count=1) == []
+    assert searched == [list('abcdefgh')]
+    assert ews.chunker.stats['failures'] == 0
+    assert ews.chunker.size == 8
+
+
+def test_search_mailboxes_rejected_by_response_code():
+    from lxml import etree
+    from pyews import SearchMailboxes
+    search_mailboxes = SearchMailboxes('subject:test', ['first.last'])
+    assert not search_mailboxes.rejected
+    response = '<m:SearchMailboxesResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages"><m:ResponseMessages><m:SearchMailboxesResponseMessage ResponseClass="Error"><m:ResponseCode>{}</m:ResponseCode></m:SearchMailboxesResponseMessage></m:ResponseMessages></m:SearchMailboxesResponse>'
+    search_mailboxes.raw_element = etree.fromstring(response.format('ErrorSearchTooManyMailboxes'))
+    assert search_mailboxes.rejected
+    search_mailboxes.raw_element = etree.fromstring(response.format('ErrorServerBusy'))
+    assert not search_mailboxes.rejected
@@ -0,0 +1,183 @@
+import asyncio
+
+
+def test_async_ews_get_items(fake_session, load_response):
+    from pyews import AsyncEWS
+    ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016', endpoint_cache_path=None)
+    session = fake_session(load_response('getitem_response.xml'))
+    ews.session = session
+    async def get_items():
+        async with ews:
+            return await ews.get_items(['AAMkADk0N2E4NDEzLTc4', 'MISSING', 'AAMkADk0N2E4NDEzLTc4', 'MISSING'], batch_size=2)
+    response = asyncio.run(get_items())
+    assert len(session.requests) == 2
+    assert session.closed
+    assert ews.session is None
+    assert response['AAMkADk0N2E4NDEzLTc4'][0]['message']['item_id']['id'] == 'AAMkADk0N2E4NDEzLTc4'
+    assert response['MISSING'] is None
+
+
+def test_async_ews_delete_item_sends_batches_concurrently(fake_session, load_response):
+    from lxml import etree
+    from pyews import AsyncEWS
+    ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016', endpoint_cache_path=None)
+    session = fake_session(load_response('deleteitem_response.xml'))
+    ews.session = session
+    response = asyncio.run(ews.delete_item(['AAMkADk0N2E4NDEzLTc4', 'MISSING', 'AAMkADk0N2E4NDEzLTc4', 'MISSING'], batch_size=2))
+    assert [item['response_code'] for item in response] == ['NoError', 'ErrorItemNotFound', 'NoError', 'ErrorItemNotFound']
+    assert len(session.requests) == 2
+    for url, data, headers in session.requests:
+        assert url == 'https://outlook.office365.com/EWS/Exchange.asmx'
+        assert [element.get('Id') for element in etree.fromstring(data).iter('{*}ItemId')] == ['AAMkADk0N2E4NDEzLTc4', 'MISSING']
+
+
+def test_async_ews_sends_either_a_bearer_token_or_basic_authentication(fake_session, load_response):
+    from pyews import AsyncEWS
+    session = fake_session(load_response('getitem_response.xml'))
+    for access_token in ('TOKEN', None):
+        ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016')
+        ews.authentication.access_token = access_token
+        ews.session = session
+        asyncio.run(ews.get_item('AAMkADk0N2E4NDEzLTc4'))
+    assert session.requests[0][2]['Authorization'] == 'Bearer TOKEN'
+    assert session.requests[1][2]['Authorization'] == 'Basic dXNlckBjb21wYW55LmNvbTpteXBhc3N3b3Jk'
+
+
+def test_async_ews_estimate_uses_the_adaptive_chunker(fake_session, load_response):
+    from lxml import etree
+    from pyews import AsyncEWS, AdaptiveChunker
+    ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016', chunker=AdaptiveChunker(initial_size=10))
+    session = fake_session(load_response('searchmailboxes_statistics_response.xml'))
+    ews.session = session
+    asyncio.run(ews.estimate('subject:test', ['mailbox{}'.format(i) for i in range(25)]))
+    assert [len(list(etree.fromstring(data).iter('{*}MailboxSearchScope'))) for url, data, headers in session.requests] == [10, 10, 5]
+
+
+def test_async_ews_sync_folder_hierarchy_uses_the_sync_state_store(fake_session):
+    from lxml import etree
+    from pyews import AsyncEWS, MemorySyncStateStore
+    ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016', sync_state_store=MemorySyncStateStore())
+    session = fake_session(
+        b'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+        b'<m:SyncFolderHierarchyResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages"><m:ResponseMessages>'
+        b'<m:SyncFolderHierarchyResponseMessage ResponseClass="Success"><m:ResponseCode>NoError</m:ResponseCode>'
+        b'<m:SyncState>STATE1</m:SyncState><m:IncludesLastFolderInRange>true</m:IncludesLastFolderInRange><m:Changes/>'
+        b'</m:SyncFolderHierarchyResponseMessage></m:ResponseMessages></m:SyncFolderHierarchyResponse></s:Body></s:Envelope>'
+    )
+    ews.session = session
+
+    async def sync(**kwargs):
+        return [change async for change in ews.iter_sync_folder_hierarchy(**kwargs)]
+
+    asyncio.run(sync())
+    asyncio.run(sync())
+    asyncio.run(sync(reset_sync_state=True))
+    sync_states = [[element.text for element in etree.fromstring(data).iter('{*}SyncState')] for url, data, headers in session.requests]
+    assert sync_states == [[], ['STATE1'], []]
+
+
+def test_async_ews_cancelled_requests_release_the_concurrency_limiter(fake_session, load_response):
+    from pyews import AsyncEWS
+
+    class HangingResponse(fake_session.response_class):
+
+        async def __aenter__(self):
+            await asyncio.sleep(10)
+            return self
+
+    class HangingSession(fake_session):
+        response_class = HangingResponse
+
+    ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016')
+    ews.session = HangingSession(load_response('getitem_response.xml'))
+    async def cancel():
+        for _ in range(3):
+            try:
+                await asyncio.wait_for(ews.get_item('AAMkADk0N2E4NDEzLTc4'), 0.01)
+            except asyncio.TimeoutError:
+                pass
+    asyncio.run(cancel())
+    assert len(ews.session.requests) == 3
+    assert ews.authentication.concurrency_limiter.stats['in_flight'] == 0
+
+
+FIND_ITEM_RESPONSE = (
+    '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+    '<m:FindItemResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">'
+    '<m:ResponseMessages><m:FindItemResponseMessage ResponseClass="Success"><m:ResponseCode>NoError</m:ResponseCode>'
+    '<m:RootFolder IndexedPagingOffset="{offset}" IncludesLastItemInRange="{last}"><t:Items>{items}</t:Items></m:RootFolder>'
+    '</m:FindItemResponseMessage></m:ResponseMessages></m:FindItemResponse></s:Body></s:Envelope>'
+)
+
+
+def test_async_ews_find_items_pages_shards_and_iterates(fake_session):
+    from lxml import etree
+    from pyews import AsyncEWS
+    ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016', endpoint_cache_path=None)
+
+    class FindItemSession(fake_session):
+
+        def post(self, url, data=None, headers=None):
+            self.requests.append((url, data, headers))
+            soap = etree.fromstring(data)
+            view = soap.find('.//{*}IndexedPageItemView')
+            offset = int(view.get('Offset')) if view is not None else 0
+            query = soap.findtext('.//{*}QueryString').replace('<', '&lt;')
+            item_ids = ['{}-{}'.format(query, index) for index in range(3)][offset:offset + 2]
+            items = ''.join('<t:Message><t:ItemId Id="{}" ChangeKey="1"/></t:Message>'.format(item_id) for item_id in item_ids)
+            content = FIND_ITEM_RESPONSE.format(offset=offset + 2, last='true' if offset + 2 >= 3 else 'false', items=items)
+            return self.response_class(content.encode('utf-8'))
+
+    fetched = []
+    async def get_items(item_ids, batch_size=100, additional_properties=None):
+        fetched.append(list(item_ids))
+        return {item_id: [{'message': {'subject': item_id}}] for item_id in item_ids}
+    ews.get_items = get_items
+    ews.session = FindItemSession(b'')
+    items = asyncio.run(ews.find_items('subject:invoice', page_size=2))
+    assert [item['message']['subject'] for item in items] == ['subject:invoice-0', 'subject:invoice-1', 'subject:invoice-2']
+    assert len(ews.session.requests) == 2
+
+    async def iterate():
+        return [item['message']['subject'] async for item in ews.iter_find_items('subject:invoice', page_size=2, batch_size=2)]
+    fetched.clear()
+    assert asyncio.run(iterate()) == ['subject:invoice-0', 'subject:invoice-1', 'subject:invoice-2']
+    assert fetched == [['subject:invoice-0', 'subject:invoice-1'], ['subject:invoice-2']]
+
+    import datetime
+    from pyews import DateRangeSharder
+    ews.session = FindItemSession(b'')
+    items = asyncio.run(ews.find_items('subject:invoice', date_range=DateRangeSharder(datetime.date(2021, 1, 1), datetime.date(2021, 1, 15), window=datetime.timedelta(days=7))))
+    queries = [etree.fromstring(data).findtext('.//{*}QueryString') for url, data, headers in ews.session.requests]
+    assert len(queries) == 2 and all('received>=' in query for query in queries)
+    assert len(items) == 4
+
+
+def test_async_ews_iter_ews_search_yields_items(fake_session, load_response):
+    from pyews import AsyncEWS
+    ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016', endpoint_cache_path=None)
+    ews.session = fake_session(load_response('searchmailboxes_response.xml'))
+    async def get_items(item_ids, batch_size=100, additional_properties=None):
+        return {item_id: [{'message': {'subject': item_id}}] for item_id in item_ids}
+    ews.get_items = get_items
+    async def search():
+        return [item['subject'] async for item in ews.iter_ews_search('subject:invoice', ['first.last', 'other.person'], chunk_size=1)]
+    assert asyncio.run(search()) == ['AAMkADk0N2E4NDEzLTc4', 'AAMkADk0N2E4NDEzLTc5'] * 2
+
+
+def test_async_ews_parses_large_responses_in_the_executor(monkeypatch, fake_session, load_response):
+    import threading
+    from pyews import AsyncEWS, GetItem
+    threads = []
+    parse_response = GetItem.parse_response
+    def recording_parse_response(self, *args, **kwargs):
+        threads.append(threading.current_thread())
+        return parse_response(self, *args, **kwargs)
+    monkeypatch.setattr(GetItem, 'parse_response', recording_parse_response)
+    ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016', endpoint_cache_path=None)
+    ews.session = fake_session(load_response('getitem_response.xml'))
+    assert asyncio.run(ews.get_item('AAMkADk0N2E4NDEzLTc4'))
+    monkeypatch.setattr(GetItem, 'EXECUTOR_PARSE_SIZE', 0)
+    assert asyncio.run(ews.get_item('AAMkADk0N2E4NDEzLTc4'))
+    assert threads[0] is threading.main_thread()
+    assert threads[-1] is not threading.main_thread()
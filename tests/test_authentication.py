@@ -21,4 +21,52 @@ def test_setting_authentication_details_directly():
     Authentication.domain = 'testcompany.com'
     assert Authentication.domain == 'testcompany.com'
     Authentication.domain = 'first.last@testcompany.com'
-    assert Authentication.domain == 'testcompany.com'
\ No newline at end of file
+    assert Authentication.domain == 'testcompany.com'
+
+def test_impersonation_is_context_local():
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from lxml import etree
+    from pyews import Authentication, FindItem
+    ews_url = Authentication.ews_url
+    Authentication.credentials = ('user@company.com','mypassword')
+    Authentication.ews_url = ews_url
+    Authentication.impersonate_as = None
+    def send_as(user):
+        with Authentication.impersonation(user):
+            time.sleep(0.01)
+            soap = etree.fromstring(FindItem('subject:test').get('Exchange2016'))
+            return user, Authentication.auth_header.get('X-AnchorMailbox'), [element.text for element in soap.iter('{*}PrimarySmtpAddress')]
+    users = ['user{}@company.com'.format(i) for i in range(20)]
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        for user, anchor, addresses in executor.map(send_as, users):
+            assert anchor == user
+            assert addresses == [user]
+    assert Authentication.impersonate_as == ''
+    with Authentication.impersonation('other@company.com'):
+        assert Authentication.impersonate_as == 'other@company.com'
+    assert Authentication.impersonate_as == ''
+
+def test_impersonation_is_isolated_between_scoped_classes():
+    from pyews import Authentication
+    first = Authentication.scoped()
+    second = Authentication.scoped()
+    with first.impersonation('first@company.com'):
+        assert first.impersonate_as == 'first@company.com'
+        assert second.impersonate_as == ''
+        assert Authentication.impersonate_as == ''
+        with second.impersonation('second@company.com'):
+            assert first.impersonate_as == 'first@company.com'
+            assert second.impersonate_as == 'second@company.com'
+        assert second.impersonate_as == ''
+    assert first.impersonate_as == ''
+
+def test_search_mailboxes_using_find_item_impersonates_with_the_instance_class(monkeypatch):
+    from pyews import Authentication, EWS, FindItem
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication.scoped()
+    ews.authentication.credentials = ('user@company.com', 'mypassword')
+    ews.executor = None
+    monkeypatch.setattr(FindItem, 'run', lambda self: [self.authentication.impersonate_as])
+    response = ews.search_mailboxes_using_find_item('subject:invoice', ['first@company.com', 'second@company.com'], thread_count=2)
+    assert sorted(response) == ['first@company.com', 'second@company.com']
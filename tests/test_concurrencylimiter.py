@@ -0,0 +1,116 @@
+import time
+import threading
+
+
+def test_concurrency_limiter_increases_additively():
+    from pyews import ConcurrencyLimiter
+    concurrency_limiter = ConcurrencyLimiter(initial_limit=2, max_limit=4)
+    for _ in range(2):
+        concurrency_limiter.release(concurrency_limiter.acquire())
+    assert concurrency_limiter.stats['limit'] == 2
+    concurrency_limiter.release(concurrency_limiter.acquire())
+    assert concurrency_limiter.stats['limit'] == 3
+    for _ in range(100):
+        concurrency_limiter.release(concurrency_limiter.acquire())
+    assert concurrency_limiter.stats['limit'] == 4
+    assert concurrency_limiter.stats['in_flight'] == 0
+
+
+def test_concurrency_limiter_cuts_once_per_burst():
+    from pyews import ConcurrencyLimiter
+    concurrency_limiter = ConcurrencyLimiter(initial_limit=8, max_limit=8)
+    tokens = [concurrency_limiter.acquire() for _ in range(8)]
+    for token in tokens:
+        concurrency_limiter.release(token, throttled=True)
+    assert concurrency_limiter.stats['limit'] == 4
+    assert concurrency_limiter.stats['decreases'] == 1
+    concurrency_limiter.release(concurrency_limiter.acquire(), throttled=True)
+    assert concurrency_limiter.stats['limit'] == 2
+
+
+def test_concurrency_limiter_ignores_failed_requests():
+    from pyews import ConcurrencyLimiter
+    concurrency_limiter = ConcurrencyLimiter(initial_limit=8, max_limit=8)
+    for _ in range(10):
+        concurrency_limiter.release(concurrency_limiter.acquire(), error=True)
+    assert concurrency_limiter.stats == {'limit': 8, 'in_flight': 0, 'increases': 0, 'decreases': 0}
+
+
+def test_concurrency_limiter_bounds_requests_in_flight():
+    from pyews import ConcurrencyLimiter
+    concurrency_limiter = ConcurrencyLimiter(initial_limit=3, max_limit=3)
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+    def request():
+        token = concurrency_limiter.acquire()
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.pop()
+        concurrency_limiter.release(token)
+    threads = [threading.Thread(target=request) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 3
+
+
+def test_run_reports_throttling_to_concurrency_limiter(monkeypatch, authentication, fake_response, load_response):
+    from pyews import GetItem, RetryPolicy, ConcurrencyLimiter
+    content = load_response('getitem_response.xml')
+    authentication.retry_policy = RetryPolicy(sleep=lambda delay: None)
+    authentication.concurrency_limiter = ConcurrencyLimiter(initial_limit=8)
+    responses = [fake_response(b'', status_code=503), fake_response(content)]
+    get_item = GetItem('AAMkADk0N2E4NDEzLTc4')
+    monkeypatch.setattr(get_item, '_send', lambda endpoint, version, stream=False: responses.pop(0))
+    assert get_item.run()
+    stats = authentication.concurrency_limiter.stats
+    assert stats['decreases'] == 1
+    assert stats['increases'] == 1
+    assert stats['in_flight'] == 0
+
+
+def test_concurrency_limiter_acquire_async_waits_for_release():
+    import asyncio
+    from pyews import ConcurrencyLimiter
+    concurrency_limiter = ConcurrencyLimiter(initial_limit=2, max_limit=2)
+    peak = []
+    async def request():
+        token = await concurrency_limiter.acquire_async()
+        peak.append(concurrency_limiter.stats['in_flight'])
+        await asyncio.sleep(0.01)
+        concurrency_limiter.release(token)
+    async def requests():
+        await asyncio.gather(*[request() for _ in range(6)])
+    asyncio.run(requests())
+    assert max(peak) == 2
+    assert concurrency_limiter.stats['in_flight'] == 0
+
+
+def test_unreachable_endpoints_do_not_cut_the_limit(monkeypatch, authentication):
+    import requests
+    from pyews import GetItem, ConcurrencyLimiter
+    authentication.concurrency_limiter = ConcurrencyLimiter(initial_limit=8)
+    get_item = GetItem('AAMkADk0N2E4NDEzLTc4')
+    def send(endpoint, version, stream=False):
+        raise requests.ConnectionError('unreachable')
+    monkeypatch.setattr(get_item, '_send', send)
+    assert get_item.run() is None
+    assert authentication.concurrency_limiter.stats == {'limit': 8, 'in_flight': 0, 'increases': 0, 'decreases': 0}
+
+
+def test_interrupted_requests_release_the_concurrency_limiter(monkeypatch, authentication):
+    import pytest
+    from pyews import GetItem, ConcurrencyLimiter
+    authentication.concurrency_limiter = ConcurrencyLimiter(initial_limit=8)
+    get_item = GetItem('AAMkADk0N2E4NDEzLTc4')
+    def send(endpoint, version, stream=False):
+        raise KeyboardInterrupt()
+    monkeypatch.setattr(get_item, '_send', send)
+    with pytest.raises(KeyboardInterrupt):
+        get_item.run()
+    assert authentication.concurrency_limiter.stats['in_flight'] == 0
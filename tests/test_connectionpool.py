@@ -0,0 +1,22 @@
+def test_connection_pool_reuses_session_per_host():
+    from pyews import ConnectionPool
+    pool = ConnectionPool(pool_maxsize=5, max_retries=1)
+    first = pool.session('https://outlook.office365.com/EWS/Exchange.asmx')
+    second = pool.session('https://outlook.office365.com/autodiscover/autodiscover.svc')
+    other = pool.session('https://autodiscover.company.com/autodiscover/autodiscover.svc')
+    assert first is second
+    assert first is not other
+    adapter = first.get_adapter('https://outlook.office365.com')
+    assert adapter.max_retries.total == 1
+    assert adapter._pool_maxsize == 5
+    pool.close()
+    assert pool.session('https://outlook.office365.com/EWS/Exchange.asmx') is not first
+
+
+def test_authentication_connection_pool():
+    from pyews import Authentication, ConnectionPool
+    authentication = Authentication.scoped()
+    assert isinstance(authentication.connection_pool, ConnectionPool)
+    pool = ConnectionPool()
+    authentication.connection_pool = pool
+    assert authentication.connection_pool is pool
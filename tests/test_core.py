@@ -55,3 +55,67 @@ def test_core_can_parse_soap_response():
     soap_response = BeautifulSoup(snyc_folder_items_response, 'xml')
     assert isinstance(core.parse_response(soap_response), dict)
 
+
+
+def _parse_with_backend(operation, response, backend):
+    from pyews import Operation
+    namespace_dict = {value: None for value in Operation.NAMESPACE_MAP.values()}
+    operation.PARSER_BACKEND = backend
+    if backend == 'xmltodict':
+        response = BeautifulSoup(response, 'xml')
+    return operation.parse_response(response, namespace_dict=namespace_dict)
+
+def test_lxml_parser_matches_xmltodict_parser(load_response):
+    from pyews import GetItem, SearchMailboxes, SyncFolderItems, DeleteItem
+    recorded = [
+        (GetItem('AAMkADk0N2E4NDEzLTc4'), load_response('getitem_response.xml')),
+        (SearchMailboxes('subject:invoice', 'first.last'), load_response('searchmailboxes_response.xml')),
+        (SyncFolderItems('AQApAHRwA=='), snyc_folder_items_response.encode('utf-8')),
+        (DeleteItem('AAMkADk0N2E4NDEzLTc4'), load_response('getitem_response.xml'))
+    ]
+    for operation, response in recorded:
+        expected = _parse_with_backend(operation, response, 'xmltodict')
+        assert expected
+        assert _parse_with_backend(operation, response, 'lxml') == expected
+
+
+def test_lazy_payload_truncates_when_formatted():
+    from lxml import etree
+    from pyews.utils.logger import LazyPayload
+    assert str(LazyPayload(b'<a>\xc3\xa9</a>')) == '<a>é</a>'
+    LazyPayload.max_length = 4
+    try:
+        assert str(LazyPayload(b'<a>1234567890</a>')) == '<a>1... (truncated from 17 characters)'
+        assert str(LazyPayload(etree.fromstring('<a>1234567890</a>'))) == '<a>1... (truncated from 17 characters)'
+    finally:
+        LazyPayload.max_length = None
+
+
+def test_payloads_are_only_formatted_when_logged(monkeypatch, caplog, authentication, fake_response, load_response):
+    import logging
+    from pyews import GetItem
+    from pyews.utils.logger import LazyPayload
+
+    class UndecodedResponse(fake_response):
+
+        @property
+        def text(self):
+            raise AssertionError('the response should not be decoded')
+
+    content = load_response('getitem_response.xml')
+    formatted = []
+    format_payload = LazyPayload.__str__
+    def counting_str(self):
+        formatted.append(1)
+        return format_payload(self)
+    monkeypatch.setattr(LazyPayload, '__str__', counting_str)
+    get_item = GetItem('AAMkADk0N2E4NDEzLTc4')
+    monkeypatch.setattr(get_item, '_send', lambda endpoint, version, stream=False: UndecodedResponse(content))
+    with caplog.at_level(logging.INFO):
+        assert get_item.run()
+    assert not formatted
+    monkeypatch.setattr(LazyPayload, 'max_length', 10)
+    with caplog.at_level(logging.DEBUG):
+        assert get_item.run()
+    assert formatted
+    assert any(record.getMessage().startswith('Response content: <?xml vers... (truncated') for record in caplog.records)
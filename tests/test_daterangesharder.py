@@ -0,0 +1,105 @@
+import datetime
+
+
+def test_date_range_sharder_sizes_windows_from_hit_density():
+    from pyews import DateRangeSharder
+    sharder = DateRangeSharder(datetime.date(2020, 1, 1), datetime.date(2020, 3, 1), window=datetime.timedelta(days=10), target_hits=100)
+    windows = sharder.windows()
+    first = next(windows)
+    assert first == (datetime.date(2020, 1, 1), datetime.date(2020, 1, 11))
+    sharder.record(first, 10)
+    assert sharder.stats['days'] == 20
+    second = next(windows)
+    assert second == (datetime.date(2020, 1, 11), datetime.date(2020, 1, 31))
+    sharder.record(second, 400)
+    assert sharder.stats['days'] == 5
+    assert list(windows)[-1][1] == datetime.date(2020, 3, 1)
+
+
+def test_date_range_sharder_splits_and_dedupes():
+    from pyews import DateRangeSharder
+    sharder = DateRangeSharder(datetime.date(2020, 1, 1), datetime.date(2020, 2, 1), max_hits=100)
+    window = (datetime.date(2020, 1, 1), datetime.date(2020, 1, 11))
+    assert sharder.split(window, 100) == []
+    assert sharder.split(window, 101) == [
+        (datetime.date(2020, 1, 1), datetime.date(2020, 1, 6)),
+        (datetime.date(2020, 1, 6), datetime.date(2020, 1, 11))
+    ]
+    assert sharder.split((datetime.date(2020, 1, 1), datetime.date(2020, 1, 2)), 1000) == []
+    assert sharder.first_seen('a')
+    assert not sharder.first_seen('a')
+    assert sharder.stats['splits'] == 1
+    assert sharder.stats['duplicates'] == 1
+    assert DateRangeSharder.aqs('subject:invoice', window) == '(subject:invoice) AND received>=2020-01-01 AND received<2020-01-11'
+
+
+def test_find_item_date_range_uses_restriction_without_query_string():
+    from pyews import FindItem
+    window = (datetime.date(2020, 1, 1), datetime.date(2020, 1, 11))
+    soap = FindItem('subject:invoice', date_range=window).soap()
+    assert soap.find('{*}Restriction') is None
+    assert soap.find('{*}QueryString').text == '(subject:invoice) AND received>=2020-01-01 AND received<2020-01-11'
+    soap = FindItem(None, date_range=window).soap()
+    assert soap.find('{*}QueryString') is None
+    assert [element.get('Value') for element in soap.iter('{*}Constant')] == ['2020-01-01T00:00:00Z', '2020-01-11T00:00:00Z']
+
+
+def test_date_range_sharder_forgets_seen_items_when_windows_restart():
+    from pyews import DateRangeSharder
+    sharder = DateRangeSharder(datetime.date(2020, 1, 1), datetime.date(2020, 1, 11))
+    for window in sharder.windows():
+        assert sharder.first_seen('a')
+    for window in sharder.windows():
+        assert sharder.first_seen('a')
+    assert sharder.stats['duplicates'] == 0
+
+
+def test_find_item_date_range_accepts_datetimes():
+    from pyews import FindItem
+    window = (datetime.datetime(2020, 1, 1, 10, 30), datetime.datetime(2020, 1, 11, 12, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=2))))
+    soap = FindItem(None, date_range=window).soap()
+    assert [element.get('Value') for element in soap.iter('{*}Constant')] == ['2020-01-01T10:30:00Z', '2020-01-11T10:00:00Z']
+    soap = FindItem('subject:invoice', date_range=window).soap()
+    assert soap.find('{*}QueryString').text == '(subject:invoice) AND received>=2020-01-01 AND received<2020-01-11'
+
+
+def test_search_shards_windows_and_merges_results(monkeypatch):
+    import pyews.ews
+    from pyews import Authentication, EWS, AdaptiveChunker, DateRangeSharder
+
+    searched = []
+
+    class FakeSearchMailboxes:
+
+        def __init__(self, query, reference_id=None, search_scope='All', page_size=None):
+            self.query = query
+            self.item_count = None
+
+        def run(self):
+            searched.append(self.query)
+            # the first window matches too many items and is split, the same item is returned by every window
+            self.item_count = 1000 if 'received>=2020-01-01 AND received<2020-01-11' in self.query else 1
+            return [{'id': {'id': 'duplicate'}}, {'id': {'id': self.query}}]
+
+        def _next_page(self, response):
+            return False
+
+    monkeypatch.setattr(pyews.ews, 'SearchMailboxes', FakeSearchMailboxes)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    ews.multi_threading = False
+    ews.executor = None
+    ews.chunker = AdaptiveChunker(initial_size=1)
+    monkeypatch.setattr(ews, 'get_items', lambda item_ids, batch_size=100: {item_id: None for item_id in item_ids})
+    sharder = DateRangeSharder(datetime.date(2020, 1, 1), datetime.date(2020, 1, 21), window=datetime.timedelta(days=10), target_hits=1, max_hits=100)
+    results = ews.execute_ews_search('subject:test', ['mailbox'], thread_count=1, date_range=sharder)
+    assert searched[:3] == [
+        '(subject:test) AND received>=2020-01-01 AND received<2020-01-11',
+        '(subject:test) AND received>=2020-01-01 AND received<2020-01-06',
+        '(subject:test) AND received>=2020-01-06 AND received<2020-01-11'
+    ]
+    assert searched[-1].endswith('received<2020-01-21')
+    ids = [item['id']['id'] for item in results]
+    assert sorted(ids) == sorted(['duplicate'] + searched[1:])
+    assert sharder.stats['splits'] == 1
+    assert sharder.stats['duplicates'] == len(searched) - 2
@@ -0,0 +1,56 @@
+def test_delete_item_sends_item_ids_in_one_request(monkeypatch, authentication, fake_response, load_response):
+    from pyews import DeleteItem
+    content = load_response('deleteitem_response.xml')
+    delete_item = DeleteItem(['AAMkADk0N2E4NDEzLTc4', 'MISSING'], delete_type='HardDelete')
+    sent = []
+    def send(endpoint, version, stream=False):
+        sent.append([element.get('Id') for element in delete_item.soap().iter('{*}ItemId')])
+        return fake_response(content)
+    monkeypatch.setattr(delete_item, '_send', send)
+    delete_item.run()
+    assert sent == [['AAMkADk0N2E4NDEzLTc4', 'MISSING']]
+    assert delete_item.results_by_id['AAMkADk0N2E4NDEzLTc4']['response_code'] == 'NoError'
+    missing = delete_item.results_by_id['MISSING']
+    assert missing['response_class'] == 'Error'
+    assert missing['response_code'] == 'ErrorItemNotFound'
+
+
+def test_ews_delete_item_returns_results_in_input_order(monkeypatch, authentication, fake_response, load_response):
+    from pyews import DeleteItem, EWS
+    content = load_response('deleteitem_response.xml')
+    monkeypatch.setattr(DeleteItem, '_send', lambda self, endpoint, version, stream=False: fake_response(content))
+    ews = EWS.__new__(EWS)
+    ews.authentication = authentication
+    ews.executor = None
+    response = ews.delete_item(['AAMkADk0N2E4NDEzLTc4', 'MISSING', 'AAMkADk0N2E4NDEzLTc4', 'MISSING'], batch_size=2)
+    assert [item['item_id'] for item in response] == ['AAMkADk0N2E4NDEzLTc4', 'MISSING', 'AAMkADk0N2E4NDEzLTc4', 'MISSING']
+    assert [item['response_code'] for item in response] == ['NoError', 'ErrorItemNotFound', 'NoError', 'ErrorItemNotFound']
+    assert response[1]['message_text'] == 'The specified object was not found in the store.'
+
+
+def test_delete_item_is_not_resent_when_every_item_failed(monkeypatch, authentication, fake_response, load_response):
+    from pyews import DeleteItem
+    content = load_response('deleteitem_response.xml').replace(b'<m:ResponseCode>NoError</m:ResponseCode>', b'<m:ResponseCode>ErrorItemNotFound</m:ResponseCode>')
+    delete_item = DeleteItem(['AAMkADk0N2E4NDEzLTc4', 'MISSING'])
+    sent = []
+    def send(endpoint, version, stream=False):
+        sent.append((endpoint, version))
+        return fake_response(content)
+    monkeypatch.setattr(delete_item, '_send', send)
+    assert len(delete_item._candidates()) > 1
+    delete_item.run()
+    assert len(sent) == 1
+    assert [message['response_code'] for message in delete_item.results_by_id.values()] == ['ErrorItemNotFound', 'ErrorItemNotFound']
+
+
+def test_raw_xml_is_a_soup_built_from_the_raw_element(monkeypatch, authentication, fake_response, load_response):
+    from bs4 import BeautifulSoup
+    from pyews import DeleteItem
+    content = load_response('deleteitem_response.xml')
+    delete_item = DeleteItem(['AAMkADk0N2E4NDEzLTc4', 'MISSING'])
+    monkeypatch.setattr(delete_item, '_send', lambda endpoint, version, stream=False: fake_response(content))
+    delete_item.run()
+    assert delete_item.raw_element.find('.//{*}ResponseCode').text == 'NoError'
+    assert isinstance(delete_item.raw_xml, BeautifulSoup)
+    assert [code.text for code in delete_item.raw_xml.find_all('ResponseCode')] == ['NoError', 'ErrorItemNotFound']
+    assert delete_item.raw_xml is delete_item.raw_xml
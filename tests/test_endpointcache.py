@@ -0,0 +1,36 @@
+
+def test_endpoint_cache_persists_between_instances(tmp_path):
+    from pyews import EndpointCache
+    path = str(tmp_path / 'endpoint_cache.json')
+    cache = EndpointCache(path=path, ttl=60)
+    assert cache.get('Operation', 'user@company.com') is None
+    cache.set('Operation', 'User@Company.com', 'https://outlook.office365.com/EWS/Exchange.asmx', 'Exchange2016')
+    assert EndpointCache(path=path).get('Operation', 'user@company.com') == ('https://outlook.office365.com/EWS/Exchange.asmx', 'Exchange2016')
+    assert EndpointCache(path=path).get('Autodiscover', 'user@company.com') is None
+    cache.invalidate('Operation', 'user@company.com')
+    assert EndpointCache(path=path).get('Operation', 'user@company.com') is None
+
+
+def test_endpoint_cache_expires_entries(tmp_path):
+    from pyews import EndpointCache
+    cache = EndpointCache(path=None, ttl=-1)
+    cache.set('Operation', 'user@company.com', 'https://outlook.office365.com/EWS/Exchange.asmx', 'Exchange2016')
+    assert cache.get('Operation', 'user@company.com') is None
+
+
+def test_cached_endpoint_is_attempted_first():
+    from pyews import Authentication, GetItem
+    Authentication.credentials = ('user@company.com','mypassword')
+    candidates = GetItem('AAMkAD')._candidates(('https://outlook.office365.com/EWS/Exchange.asmx', 'Exchange2013'))
+    assert candidates[0] == ('Exchange2013', 'https://outlook.office365.com/EWS/Exchange.asmx')
+    assert all('autodiscover' not in endpoint for version, endpoint in candidates)
+    assert len(candidates) == len(set(candidates))
+
+
+def test_endpoint_cache_is_in_memory_and_keyed_by_domain():
+    from pyews import EndpointCache
+    cache = EndpointCache()
+    assert cache.path is None
+    cache.set('Operation', 'first.last@company.com', 'https://outlook.office365.com/EWS/Exchange.asmx', 'Exchange2016')
+    assert cache.get('Operation', 'other.person@Company.com') == ('https://outlook.office365.com/EWS/Exchange.asmx', 'Exchange2016')
+    assert cache.get('Operation', 'first.last@example.com') is None
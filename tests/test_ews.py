@@ -5,9 +5,29 @@ def test_instantiation_of_ews_interface(pyews_ews_interface):
         'mypassword1'
     )
     assert ews.multi_threading == False
-    from pyews import Authentication
-    assert Authentication.credentials == ('username@company.com','mypassword1')
-    assert Authentication.domain == 'company.com'
-    assert isinstance(Authentication.ews_url, list)
-    assert isinstance(Authentication.exchange_versions, list)
-    assert Authentication.impersonate_as is ''
+    assert ews.authentication.credentials == ('username@company.com','mypassword1')
+    assert ews.authentication.domain == 'company.com'
+    assert isinstance(ews.authentication.ews_url, list)
+    assert isinstance(ews.authentication.exchange_versions, list)
+    assert ews.authentication.impersonate_as is ''
+
+
+def test_ews_instances_do_not_share_authentication(pyews_ews_interface):
+    from pyews import Authentication, FindItem
+    credentials = Authentication.credentials
+    first = pyews_ews_interface('first@tenant1.com', 'password1', ews_url='https://tenant1.com/EWS/Exchange.asmx', impersonate_as='someone@tenant1.com')
+    second = pyews_ews_interface('second@tenant2.com', 'password2')
+    assert first.authentication is not second.authentication
+    assert first.authentication.credentials == ('first@tenant1.com', 'password1')
+    assert second.authentication.credentials == ('second@tenant2.com', 'password2')
+    assert first.authentication.ews_url == ['https://tenant1.com/EWS/Exchange.asmx']
+    assert first.authentication.impersonate_as == 'someone@tenant1.com'
+    assert second.authentication.impersonate_as == ''
+    assert first.authentication.connection_pool is not second.authentication.connection_pool
+    assert first.authentication.token_cache is not second.authentication.token_cache
+    assert Authentication.credentials == credentials
+    with first.authentication.bind():
+        find_item = FindItem('subject:test')
+    assert find_item.authentication is first.authentication
+    assert find_item._mailbox == 'someone@tenant1.com'
+    assert FindItem('subject:test').authentication is Authentication
@@ -0,0 +1,84 @@
+from lxml import etree
+
+
+def test_find_item_soap_includes_indexed_page_view():
+    from pyews import FindItem
+    find_item = FindItem('subject:invoice', page_size=50, offset=100)
+    soap = find_item.soap()
+    view = soap.find('{*}IndexedPageItemView')
+    assert view.get('MaxEntriesReturned') == '50'
+    assert view.get('Offset') == '100'
+    assert view.get('BasePoint') == 'Beginning'
+    assert FindItem('subject:invoice').soap().find('{*}IndexedPageItemView') is None
+
+
+def test_find_item_soap_projects_additional_properties():
+    import pytest
+    from pyews import FindItem
+    from pyews.utils.exceptions import UknownValueError
+    soap = FindItem('subject:invoice', additional_properties=['item:Subject', 'message:InternetMessageId']).soap()
+    item_shape = soap.find('{*}ItemShape')
+    assert item_shape.find('{*}BaseShape').text == 'IdOnly'
+    assert item_shape.find('{*}IncludeMimeContent').text == 'false'
+    assert [element.get('FieldURI') for element in item_shape.iter('{*}FieldURI')] == ['item:Subject', 'message:InternetMessageId']
+    assert FindItem('subject:invoice').soap().find('{*}ItemShape/{*}AdditionalProperties') is None
+    with pytest.raises(UknownValueError):
+        FindItem('subject:invoice', additional_properties=['item:Unknown'])
+
+
+def test_find_item_paginate_follows_paging_offset(monkeypatch):
+    from pyews import FindItem
+    find_item = FindItem('subject:invoice', page_size=2)
+    pages = {
+        0: (['a', 'b'], '<RootFolder IndexedPagingOffset="2" IncludesLastItemInRange="false"/>'),
+        2: (['c', 'd'], '<RootFolder IndexedPagingOffset="4" IncludesLastItemInRange="false"/>'),
+        4: (['e'], '<RootFolder IndexedPagingOffset="5" IncludesLastItemInRange="true"/>')
+    }
+    requested = []
+    def run():
+        requested.append(find_item.offset)
+        items, root_folder = pages[find_item.offset]
+        find_item.raw_element = etree.fromstring('<FindItemResponse>{}</FindItemResponse>'.format(root_folder))
+        return items
+    monkeypatch.setattr(find_item, 'run', run)
+    assert list(find_item.paginate()) == ['a', 'b', 'c', 'd', 'e']
+    assert requested == [0, 2, 4]
+
+
+def test_search_mailboxes_using_find_item_searches_every_user_once(monkeypatch):
+    from pyews import Authentication, EWS
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    ews.executor = None
+    searched = []
+    monkeypatch.setattr(ews, '_EWS__execute_multithreaded_find', lambda query_string, users, *args: searched.append(users) or users)
+    response = ews.search_mailboxes_using_find_item('subject:invoice', ['first@company.com', 'second@company.com', 'third@company.com'], thread_count=8)
+    assert sorted(searched) == [['first@company.com'], ['second@company.com'], ['third@company.com']]
+    assert sorted(response) == ['first@company.com', 'second@company.com', 'third@company.com']
+
+
+def test_find_items_returns_a_list_and_iter_find_items_yields_lazily(monkeypatch):
+    from pyews import Authentication, EWS, FindItem
+    pages = {0: ['a', 'b'], 2: ['c']}
+    def run(self):
+        self.raw_element = etree.fromstring('<FindItemResponse><RootFolder IndexedPagingOffset="{}" IncludesLastItemInRange="{}"/></FindItemResponse>'.format(self.offset + 2, 'false' if self.offset == 0 else 'true'))
+        return [{'item_id': {'id': item_id}} for item_id in pages[self.offset]]
+    monkeypatch.setattr(FindItem, 'run', run)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    ews.executor = None
+    fetched = []
+    def get_items(item_ids, batch_size=100, additional_properties=None):
+        fetched.append(item_ids)
+        return {item_id: [{'message': {'subject': item_id}}] for item_id in item_ids}
+    ews.get_items = get_items
+    items = ews.find_items('subject:invoice', page_size=2)
+    assert isinstance(items, list)
+    assert [item['message']['subject'] for item in items] == ['a', 'b', 'c']
+    assert fetched == [['a', 'b', 'c']]
+    fetched.clear()
+    items = ews.iter_find_items('subject:invoice', page_size=2, batch_size=2)
+    assert next(items)['message']['subject'] == 'a'
+    assert fetched == [['a', 'b']]
+    assert [item['message']['subject'] for item in items] == ['b', 'c']
+    assert fetched == [['a', 'b'], ['c']]
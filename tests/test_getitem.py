@@ -0,0 +1,88 @@
+import pytest
+
+
+def test_get_item_sends_item_ids_in_batches(monkeypatch, authentication, fake_response, load_response):
+    from pyews import GetItem
+    content = load_response('getitem_response.xml')
+    get_item = GetItem(['AAMkADk0N2E4NDEzLTc4', 'MISSING', 'AAMkADk0N2E4NDEzLTc4', 'MISSING'], batch_size=2)
+    sent = []
+    def send(endpoint, version, stream=False):
+        sent.append([element.get('Id') for element in get_item.soap().iter('{*}ItemId')])
+        return fake_response(content)
+    monkeypatch.setattr(get_item, '_send', send)
+    response = get_item.run()
+    assert sent == [['AAMkADk0N2E4NDEzLTc4', 'MISSING'], ['AAMkADk0N2E4NDEzLTc4', 'MISSING']]
+    assert len([item for item in response if item]) == 2
+    found = get_item.results_by_id['AAMkADk0N2E4NDEzLTc4']
+    assert found['response_class'] == 'Success'
+    assert found['items']['message']['item_id']['id'] == 'AAMkADk0N2E4NDEzLTc4'
+    missing = get_item.results_by_id['MISSING']
+    assert missing['response_class'] == 'Error'
+    assert missing['response_code'] == 'ErrorItemNotFound'
+
+
+
+def test_get_item_soap_projects_additional_properties():
+    from pyews import GetItem
+    soap = GetItem('AAMkADk0N2E4NDEzLTc4', additional_properties=['item:Subject']).soap()
+    assert soap.find('{*}ItemShape/{*}BaseShape').text == 'IdOnly'
+    assert soap.find('{*}ItemShape/{*}IncludeMimeContent').text == 'false'
+    assert [element.get('FieldURI') for element in soap.iter('{*}FieldURI')] == ['item:Subject']
+    with pytest.raises(ValueError):
+        GetItem('AAMkADk0N2E4NDEzLTc4', additional_properties=['item:Unknown'])
+
+CONVERT_ID_RESPONSE = b'''<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body>
+    <m:GetItemResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:GetItemResponseMessage ResponseClass="Error">
+          <m:MessageText>Id is malformed. Please use the ConvertId method to convert the Id from EwsId to EwsLegacyId format.</m:MessageText>
+          <m:ResponseCode>ErrorInvalidIdMalformedEwsLegacyIdFormat</m:ResponseCode>
+          <m:Items/>
+        </m:GetItemResponseMessage>
+        <m:GetItemResponseMessage ResponseClass="Error">
+          <m:MessageText>The specified object was not found in the store.</m:MessageText>
+          <m:ResponseCode>ErrorItemNotFound</m:ResponseCode>
+          <m:Items/>
+        </m:GetItemResponseMessage>
+      </m:ResponseMessages>
+    </m:GetItemResponse>
+  </s:Body>
+</s:Envelope>'''
+
+
+def _ews(monkeypatch, authentication, fallback):
+    from pyews import EWS
+    ews = EWS.__new__(EWS)
+    ews.authentication = authentication
+    ews.executor = None
+    monkeypatch.setattr(ews, 'get_item', lambda item_id, additional_properties=None: fallback.append(item_id) or ['converted'])
+    return ews
+
+
+def test_get_items_converts_only_ids_the_server_rejected(monkeypatch, authentication, fake_response):
+    from pyews import GetItem
+    monkeypatch.setattr(GetItem, '_send', lambda self, endpoint, version, stream=False: fake_response(CONVERT_ID_RESPONSE))
+    fallback = []
+    ews = _ews(monkeypatch, authentication, fallback)
+    response = ews.get_items(['LEGACY', 'MISSING'])
+    assert fallback == ['LEGACY']
+    assert response == {'LEGACY': ['converted'], 'MISSING': None}
+
+
+def test_get_items_reports_failed_batches_without_fanning_out(monkeypatch, authentication):
+    import requests
+    from pyews import GetItem
+    sent = []
+    def send(self, endpoint, version, stream=False):
+        sent.append(endpoint)
+        raise requests.ConnectionError('unreachable')
+    monkeypatch.setattr(GetItem, '_send', send)
+    fallback = []
+    ews = _ews(monkeypatch, authentication, fallback)
+    candidates = len(GetItem(['A'])._candidates())
+    response = ews.get_items(['A', 'B', 'C'])
+    assert response == {'A': None, 'B': None, 'C': None}
+    assert fallback == []
+    assert len(sent) == candidates
@@ -25,3 +25,38 @@ def test_operation_soap_body():
     assert soap.select('t|RequestedServerVersion')[0]['Version'] == 'Exchange2016'
     assert soap.find_all('TestElement')[0].string == 'Some Test Value'
     assert soap.select('m|TestElement')[0].string == 'Some Test Value'
+
+
+def test_operation_reuses_envelope_template():
+    from lxml import etree
+    from pyews import Authentication
+    with Authentication.impersonation('someone@company.com'):
+        test_operation = TestOperation()
+        TestOperation._envelope_template.cache_clear()
+        soap_body = test_operation.get('Exchange2013')
+        assert test_operation.get('Exchange2013') == soap_body
+        assert TestOperation._envelope_template.cache_info().misses == 1
+        assert TestOperation._envelope_template.cache_info().hits == 1
+        assert soap_body == etree.tostring(
+            Operation.SOAP_MESSAGE_ELEMENT.Envelope(
+                Operation.SOAP_NAMESPACE.Header(
+                    Operation.T_NAMESPACE.RequestedServerVersion(Version='Exchange2013'),
+                    test_operation._impersonation_header()
+                ),
+                Operation.BODY_ELEMENT(test_operation.soap())
+            )
+        )
+
+
+def test_operation_stream_yields_each_result(monkeypatch, authentication, fake_response, load_response):
+    from pyews import GetItem, SearchMailboxes
+    for operation, name in ((GetItem('AAMkADk0N2E4NDEzLTc4'), 'getitem_response.xml'), (SearchMailboxes('subject:invoice', 'first.last'), 'searchmailboxes_response.xml')):
+        content = load_response(name)
+        responses = []
+        def send(endpoint, version, stream=False):
+            responses.append(fake_response(content))
+            return responses[-1]
+        monkeypatch.setattr(operation, '_send', send)
+        expected = operation.parse_response(content, namespace_dict=operation._namespace_dict)
+        assert list(operation.stream()) == expected
+        assert len(responses) == 1 and responses[0].closed
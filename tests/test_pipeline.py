@@ -0,0 +1,115 @@
+import time
+import threading
+
+
+def test_pipeline_runs_stages_concurrently():
+    from pyews import Pipeline
+    def split(item):
+        return [item, item + 100]
+    def double(item):
+        yield item * 2
+    results = list(Pipeline(range(10), [(split, 3), (double, 2)], queue_size=2))
+    assert sorted(results) == sorted([i * 2 for i in range(10)] + [(i + 100) * 2 for i in range(10)])
+
+
+def test_pipeline_yields_before_source_is_exhausted():
+    from pyews import Pipeline
+    fed = []
+    def source():
+        for i in range(1000):
+            fed.append(i)
+            yield i
+    pipeline = iter(Pipeline(source(), [(lambda item: [item], 1)], queue_size=1))
+    assert next(pipeline) == 0
+    time.sleep(0.05)
+    assert len(fed) < 10
+    pipeline.close()
+
+
+def test_pipeline_raises_stage_errors():
+    from pyews import Pipeline
+    def fail(item):
+        if item == 3:
+            raise ValueError('bad item')
+        return [item]
+    try:
+        list(Pipeline(range(10), [(fail, 2)]))
+    except ValueError as e:
+        assert str(e) == 'bad item'
+    else:
+        assert False
+
+
+def test_iter_ews_search_fetches_each_hit_once(monkeypatch):
+    import pyews.ews
+    from pyews import Authentication, EWS, AdaptiveChunker
+
+    class FakeSearchMailboxes:
+
+        def __init__(self, query, reference_id=None, search_scope='All', page_size=None):
+            self.reference_id = reference_id
+            self.item_count = None
+
+        def run(self):
+            self.item_count = len(self.reference_id) * 3
+            return [{'id': {'id': '{}-{}'.format(mailbox, i)}} for mailbox in self.reference_id for i in range(3)]
+
+        def _next_page(self, response):
+            return False
+
+    monkeypatch.setattr(pyews.ews, 'SearchMailboxes', FakeSearchMailboxes)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    ews.multi_threading = True
+    ews.executor = None
+    ews.chunker = AdaptiveChunker(initial_size=1)
+    fetched = []
+    lock = threading.Lock()
+    def get_items(item_ids, batch_size=100):
+        with lock:
+            fetched.extend(item_ids)
+        return {item_id: [{'message': {'subject': item_id}}] for item_id in item_ids}
+    ews.get_items = get_items
+    results = list(ews.iter_ews_search('subject:test', ['a', 'b', 'c', 'd'], thread_count=2, batch_size=2))
+    assert sorted(item['subject'] for item in results) == sorted('{}-{}'.format(mailbox, i) for mailbox in 'abcd' for i in range(3))
+    assert sorted(fetched) == sorted(item['id']['id'] for item in results)
+
+
+def test_iter_ews_search_without_multi_threading_survives_failed_attachments(monkeypatch):
+    import pyews.ews
+    from pyews import Authentication, EWS, AdaptiveChunker, Pipeline
+
+    class FakeSearchMailboxes:
+
+        def __init__(self, query, reference_id=None, search_scope='All', page_size=None):
+            self.reference_id = reference_id
+            self.item_count = None
+
+        def run(self):
+            self.item_count = len(self.reference_id)
+            return [{'id': {'id': mailbox}} for mailbox in self.reference_id]
+
+        def _next_page(self, response):
+            return False
+
+    workers = []
+
+    class RecordingPipeline(Pipeline):
+
+        def __init__(self, source, stages, **kwargs):
+            workers.extend(count for stage, count in stages)
+            super().__init__(source, stages, **kwargs)
+
+    monkeypatch.setattr(pyews.ews, 'SearchMailboxes', FakeSearchMailboxes)
+    monkeypatch.setattr(pyews.ews, 'Pipeline', RecordingPipeline)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    ews.multi_threading = False
+    ews.executor = None
+    ews.chunker = AdaptiveChunker()
+    attachments = {'file_attachment': {'attachment_id': {'id': 'attachment'}}}
+    ews.get_items = lambda item_ids, batch_size=100: {item_id: [{'message': {'subject': item_id, 'attachments': attachments}}] for item_id in item_ids}
+    ews.get_attachment = lambda attachment_id: None
+    results = list(ews.iter_ews_search('subject:test', ['a', 'b'], thread_count=4))
+    assert sorted(item['subject'] for item in results) == ['a', 'b']
+    assert workers == [1, 1, 1]
@@ -0,0 +1,43 @@
+def test_rate_limiter_buckets_per_mailbox():
+    from pyews import RateLimiter
+    rate_limiter = RateLimiter(mailbox_rate=1, mailbox_burst=2)
+    assert rate_limiter.take('service@company.com', 'first@company.com') == 0.0
+    assert rate_limiter.take('service@company.com', 'first@company.com') == 0.0
+    assert 0 < rate_limiter.take('service@company.com', 'First@Company.com') <= 1.0
+    assert rate_limiter.take('service@company.com', 'second@company.com') == 0.0
+
+
+def test_rate_limiter_buckets_per_account():
+    from pyews import RateLimiter
+    rate_limiter = RateLimiter(mailbox_rate=100, account_rate=1, account_burst=1)
+    assert rate_limiter.take('service@company.com', 'first@company.com') == 0.0
+    assert rate_limiter.take('service@company.com', 'second@company.com') > 0
+    assert rate_limiter.take('other@company.com', 'second@company.com') == 0.0
+
+
+def test_rate_limiter_shares_sqlite_buckets(tmp_path):
+    from pyews import RateLimiter
+    path = str(tmp_path / 'ratelimiter.db')
+    first = RateLimiter(account_rate=0.1, account_burst=2, path=path)
+    second = RateLimiter(account_rate=0.1, account_burst=2, path=path)
+    assert first.take('service@company.com', None) == 0.0
+    assert second.take('service@company.com', None) == 0.0
+    assert first.take('service@company.com', None) > 0
+    assert second.take('service@company.com', None) > 0
+    first.close()
+    second.close()
+
+
+def test_run_waits_for_rate_limiter(monkeypatch, authentication, fake_response, load_response):
+    from pyews import GetItem, RateLimiter
+    content = load_response('getitem_response.xml')
+    slept = []
+    rate_limiter = RateLimiter(mailbox_rate=1, mailbox_burst=1, sleep=slept.append)
+    authentication.rate_limiter = rate_limiter
+    get_item = GetItem('AAMkADk0N2E4NDEzLTc4')
+    monkeypatch.setattr(get_item, '_send', lambda endpoint, version, stream=False: fake_response(content))
+    assert get_item.run()
+    assert not slept
+    assert get_item.run()
+    assert len(slept) >= 1
+    assert rate_limiter.stats['waits'] == len(slept)
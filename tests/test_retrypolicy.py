@@ -0,0 +1,74 @@
+def test_retry_policy_server_delay(load_response):
+    from lxml import etree
+    from pyews import RetryPolicy
+    retry_policy = RetryPolicy()
+    assert retry_policy.server_delay(200, {}, etree.fromstring(load_response('getitem_response.xml'))) is None
+    assert retry_policy.server_delay(500, {}, etree.fromstring(load_response('serverbusy_response.xml'))) == 2.5
+    assert retry_policy.server_delay(429, {'Retry-After': '7'}) == 7.0
+    assert retry_policy.server_delay(503, {}) == 0.0
+
+
+def test_retry_policy_backoff_and_counts():
+    from pyews import RetryPolicy
+    retry_policy = RetryPolicy(max_retries=3, base_delay=1.0, max_delay=3.0, jitter=0.5)
+    delays = [retry_policy.next_delay(attempt) for attempt in range(4)]
+    assert 0.5 <= delays[0] <= 1.0
+    assert 1.0 <= delays[1] <= 2.0
+    assert 1.5 <= delays[2] <= 3.0
+    assert delays[3] is None
+    assert 10.0 <= retry_policy.next_delay(0, 10.0) <= 10.5
+    stats = retry_policy.stats
+    assert stats['throttled'] == 5
+    assert stats['retries'] == 4
+    assert stats['gave_up'] == 1
+
+
+def test_run_waits_for_throttled_requests(monkeypatch, authentication, fake_response, load_response):
+    from pyews import GetItem, RetryPolicy
+    slept = []
+    authentication.retry_policy = RetryPolicy(sleep=slept.append, jitter=0)
+    responses = [
+        fake_response(load_response('serverbusy_response.xml'), status_code=500),
+        fake_response(b'Too many requests', status_code=429, headers={'Retry-After': '4'}),
+        fake_response(load_response('getitem_response.xml'))
+    ]
+    get_item = GetItem('AAMkADk0N2E4NDEzLTc4')
+    sent = []
+    def send(endpoint, version, stream=False):
+        sent.append((endpoint, version))
+        return responses.pop(0)
+    monkeypatch.setattr(get_item, '_send', send)
+    response = get_item.run()
+    assert response[0]['message']['item_id']['id'] == 'AAMkADk0N2E4NDEzLTc4'
+    assert slept == [2.5, 4.0]
+    assert len(set(sent)) == 1
+    assert authentication.retry_policy.stats['retries'] == 2
+
+
+def test_run_gives_up_when_still_throttled(monkeypatch, authentication, fake_response, load_response):
+    from pyews import GetItem, RetryPolicy
+    authentication.retry_policy = RetryPolicy(max_retries=2, sleep=lambda delay: None)
+    get_item = GetItem('AAMkADk0N2E4NDEzLTc4')
+    sent = []
+    def send(endpoint, version, stream=False):
+        sent.append((endpoint, version))
+        return fake_response(b'', status_code=503)
+    monkeypatch.setattr(get_item, '_send', send)
+    assert get_item.run() is None
+    assert len(sent) == 3
+    assert authentication.retry_policy.stats['gave_up'] == 1
+
+
+def test_stream_waits_for_server_busy_faults(monkeypatch, authentication, fake_response, load_response):
+    from pyews import SearchMailboxes, RetryPolicy
+    slept = []
+    authentication.retry_policy = RetryPolicy(sleep=slept.append, jitter=0)
+    responses = [
+        fake_response(load_response('serverbusy_response.xml'), status_code=500),
+        fake_response(load_response('searchmailboxes_response.xml'))
+    ]
+    search_mailboxes = SearchMailboxes('subject:invoice', 'first.last')
+    monkeypatch.setattr(search_mailboxes, '_send', lambda endpoint, version, stream=False: responses.pop(0))
+    results = list(search_mailboxes.stream())
+    assert [item['id']['id'] for item in results] == ['AAMkADk0N2E4NDEzLTc4', 'AAMkADk0N2E4NDEzLTc5']
+    assert slept == [2.5]
@@ -0,0 +1,142 @@
+import re
+
+
+def test_search_mailboxes_soap_includes_page_view():
+    from pyews import SearchMailboxes
+    soap = SearchMailboxes('subject:invoice', 'first.last', page_size=2, page_item_reference='AAAAAA==').soap()
+    assert soap.find('{*}PageSize').text == '2'
+    assert soap.find('{*}PageItemReference').text == 'AAAAAA=='
+    assert soap.find('{*}PageDirection').text == 'Next'
+    assert SearchMailboxes('subject:invoice', 'first.last').soap().find('{*}PageSize') is None
+
+
+def test_search_mailboxes_pages_follow_page_item_reference(monkeypatch, authentication, fake_response, load_response):
+    from pyews import SearchMailboxes
+    content = load_response('searchmailboxes_response.xml')
+    last_page = re.sub(rb'\s*<SearchPreviewItem>\s*<Id Id="AAMkADk0N2E4NDEzLTc5".*?</SearchPreviewItem>', b'', content, flags=re.S)
+    last_page = last_page.replace(b'AAMkADk0N2E4NDEzLTc4"', b'AAMkADk0N2E4NDEzLTc3"')
+    responses = [content, last_page]
+    search_mailboxes = SearchMailboxes('subject:invoice', 'first.last', page_size=2)
+    references = []
+    def send(endpoint, version, stream=False):
+        page_item_reference = search_mailboxes.soap().find('{*}PageItemReference')
+        references.append(page_item_reference.text if page_item_reference is not None else None)
+        return fake_response(responses.pop(0))
+    monkeypatch.setattr(search_mailboxes, '_send', send)
+    pages = list(search_mailboxes.pages())
+    assert references == [None, 'AAAAAB==']
+    assert [len(page) for page in pages] == [2, 1]
+    assert pages[1][0]['id']['id'] == 'AAMkADk0N2E4NDEzLTc3'
+
+
+def test_search_mailboxes_statistics_only(monkeypatch, authentication, fake_response, load_response):
+    from pyews import SearchMailboxes, EWS, AdaptiveChunker
+    content = load_response('searchmailboxes_statistics_response.xml')
+    sent = []
+    def send(self, endpoint, version, stream=False):
+        sent.append(self.soap())
+        return fake_response(content)
+    monkeypatch.setattr(SearchMailboxes, '_send', send)
+    statistics = SearchMailboxes('subject:invoice OR subject:payment', ['first.last', 'other.person'], page_size=10, result_type='StatisticsOnly').run()
+    assert sent[0].find('{*}ResultType').text == 'StatisticsOnly'
+    assert sent[0].find('{*}PageSize') is None
+    assert statistics['item_count'] == 42
+    assert statistics['size'] == 518400
+    assert [(item['display_name'], item['item_count']) for item in statistics['mailbox_stats']] == [('First Last', 42), ('Other Person', 0)]
+    assert [(item['keyword'], item['item_hits']) for item in statistics['keyword_stats']] == [('subject:invoice', 30), ('subject:payment', 12)]
+    assert statistics['failed_mailboxes'][0]['error_message'] == 'The search timed out.'
+    ews = EWS.__new__(EWS)
+    ews.authentication = authentication
+    ews.multi_threading = True
+    ews.executor = None
+    ews.chunker = AdaptiveChunker(initial_size=1)
+    estimate = ews.estimate('subject:invoice OR subject:payment', ['first.last', 'other.person'], thread_count=4)
+    assert [len(list(soap.iter('{*}MailboxSearchScope'))) for soap in sent[1:]] == [1, 1]
+    assert estimate['item_count'] == 84
+    assert len(estimate['mailbox_stats']) == 4
+    assert [(item['keyword'], item['item_hits']) for item in estimate['keyword_stats']] == [('subject:invoice', 60), ('subject:payment', 24)]
+
+
+def test_search_mailboxes_tags_results_with_their_query(monkeypatch, authentication, fake_response, load_response):
+    from pyews import SearchMailboxes
+    content = load_response('searchmailboxes_response.xml')
+    message = re.search(rb'\s*<SearchMailboxesResponseMessage .*?</SearchMailboxesResponseMessage>', content, flags=re.S).group(0)
+    second = message.replace(b'subject:invoice', b'subject:payment').replace(b'AAMkADk0N2E4NDEzLTc', b'AAMkADk0N2E4NDEzLTd')
+    content = content.replace(message, message + second)
+    search_mailboxes = SearchMailboxes(['subject:invoice', 'subject:payment'], 'first.last')
+    assert [query.text for query in search_mailboxes.soap().iter('{*}Query')] == ['subject:invoice', 'subject:payment']
+    monkeypatch.setattr(search_mailboxes, '_send', lambda endpoint, version, stream=False: fake_response(content))
+    results = search_mailboxes.run()
+    assert [(item['id']['id'], item['query']) for item in results] == [
+        ('AAMkADk0N2E4NDEzLTc4', 'subject:invoice'),
+        ('AAMkADk0N2E4NDEzLTc5', 'subject:invoice'),
+        ('AAMkADk0N2E4NDEzLTd4', 'subject:payment'),
+        ('AAMkADk0N2E4NDEzLTd5', 'subject:payment')
+    ]
+    assert search_mailboxes.item_count == 4
+    monkeypatch.setattr(search_mailboxes, '_send', lambda endpoint, version, stream=False: fake_response(content))
+    assert [item['query'] for item in search_mailboxes.stream()] == [item['query'] for item in results]
+
+
+def test_search_batches_queries_and_splits_rejected_batches(monkeypatch):
+    import pyews.ews
+    from pyews import Authentication, EWS, AdaptiveChunker
+
+    searched = []
+
+    class FakeSearchMailboxes:
+
+        def __init__(self, query, reference_id=None, search_scope='All', page_size=None):
+            self.query = query
+            self.item_count = None
+            self.rejected = False
+
+        def run(self):
+            searched.append(list(self.query))
+            if len(self.query) > 2:
+                self.rejected = True
+                return None
+            self.item_count = len(self.query)
+            return [{'id': {'id': 'shared'}, 'query': query} for query in self.query]
+
+        def _next_page(self, response):
+            return False
+
+    monkeypatch.setattr(pyews.ews, 'SearchMailboxes', FakeSearchMailboxes)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    ews.multi_threading = False
+    ews.executor = None
+    ews.chunker = AdaptiveChunker(initial_size=8)
+    monkeypatch.setattr(ews, 'get_items', lambda item_ids, batch_size=100: {item_id: [{'message': {'subject': 'Invoice'}}] for item_id in item_ids})
+    queries = ['indicator-{}'.format(index) for index in range(6)]
+    results = ews.execute_ews_search(queries, ['first.last', 'other.person'], thread_count=1, queries_per_request=4)
+    assert searched == [queries[:4], queries[:2], queries[2:4], queries[4:]]
+    assert [item['query'] for item in results] == queries
+    assert all(item['subject'] == 'Invoice' for item in results)
+
+
+def test_search_sends_a_single_reference_id_as_one_mailbox(monkeypatch, authentication, fake_response, fake_session, load_response):
+    import asyncio
+    from lxml import etree
+    from pyews import SearchMailboxes, EWS, AsyncEWS, AdaptiveChunker
+    content = load_response('searchmailboxes_response.xml')
+    sent = []
+    def send(self, endpoint, version, stream=False):
+        sent.append([element.text for element in self.soap().iter('{*}Mailbox')])
+        return fake_response(content)
+    monkeypatch.setattr(SearchMailboxes, '_send', send)
+    ews = EWS.__new__(EWS)
+    ews.authentication = authentication
+    ews.multi_threading = False
+    ews.executor = None
+    ews.chunker = AdaptiveChunker()
+    monkeypatch.setattr(ews, 'get_items', lambda item_ids, batch_size=100: {item_id: None for item_id in item_ids})
+    ews.execute_ews_search('subject:invoice', 'someone@company.com', thread_count=1)
+    assert sent == [['someone@company.com']]
+
+    async_ews = AsyncEWS('user@company.com', 'mypassword', ews_url='https://outlook.office365.com/EWS/Exchange.asmx', exchange_version='Exchange2016')
+    async_ews.session = fake_session(content)
+    monkeypatch.setattr(async_ews, 'get_items', lambda item_ids, batch_size=100: asyncio.sleep(0, {}))
+    asyncio.run(async_ews.execute_ews_search('subject:invoice', 'someone@company.com'))
+    assert [[element.text for element in etree.fromstring(data).iter('{*}Mailbox')] for url, data, headers in async_ews.session.requests] == [['someone@company.com']]
@@ -0,0 +1,109 @@
+import pytest
+
+SYNC_FOLDER_ITEMS_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body>
+    <m:SyncFolderItemsResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:SyncFolderItemsResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:SyncState>{sync_state}</m:SyncState>
+          <m:IncludesLastItemInRange>{last}</m:IncludesLastItemInRange>
+          <m:Changes>{changes}</m:Changes>
+        </m:SyncFolderItemsResponseMessage>
+      </m:ResponseMessages>
+    </m:SyncFolderItemsResponse>
+  </s:Body>
+</s:Envelope>
+"""
+
+BATCHES = {
+    None: ('STATE1', 'false', '<t:Create><t:Message><t:ItemId Id="A1" ChangeKey="C1"/><t:Subject>First</t:Subject></t:Message></t:Create><t:Create><t:Message><t:ItemId Id="A2" ChangeKey="C2"/><t:Subject>Second</t:Subject></t:Message></t:Create>'),
+    'STATE1': ('STATE2', 'true', '<t:Delete><t:ItemId Id="A1" ChangeKey="C1"/></t:Delete>')
+}
+
+EXPECTED_CHANGES = [
+    {'create': {'message': {'item_id': {'id': 'A1', 'change_key': 'C1'}, 'subject': 'First'}}},
+    {'create': {'message': {'item_id': {'id': 'A2', 'change_key': 'C2'}, 'subject': 'Second'}}},
+    {'delete': {'item_id': {'id': 'A1', 'change_key': 'C1'}}}
+]
+
+
+def _sync_folder_items(monkeypatch, fake_response, **kwargs):
+    from pyews import SyncFolderItems
+    sync = SyncFolderItems('AQApAHRwA==', **kwargs)
+    sent_states = []
+    def send(endpoint, version, stream=False):
+        sent_states.append(sync.sync_state)
+        sync_state, last, changes = BATCHES[sync.sync_state]
+        return fake_response(SYNC_FOLDER_ITEMS_RESPONSE.format(sync_state=sync_state, last=last, changes=changes).encode('utf-8'))
+    monkeypatch.setattr(sync, '_send', send)
+    return sync, sent_states
+
+
+def test_sync_folder_items_soap():
+    from pyews import SyncFolderItems
+    soap = SyncFolderItems('AQApAHRwA==', sync_state='STATE1', max_changes_returned=250).soap()
+    assert soap.find('{*}SyncState').text == 'STATE1'
+    assert soap.find('{*}MaxChangesReturned').text == '250'
+    assert SyncFolderItems('AQApAHRwA==').soap().find('{*}SyncState') is None
+    with pytest.raises(ValueError):
+        SyncFolderItems('AQApAHRwA==', max_changes_returned=1000)
+
+
+def test_sync_folder_items_soap_projects_additional_properties():
+    from pyews import SyncFolderItems
+    soap = SyncFolderItems('AQApAHRwA==', additional_properties=['item:Subject', 'message:From', 'postitem:PostedTime']).soap()
+    item_shape = soap.find('{*}ItemShape')
+    assert item_shape.find('{*}BaseShape').text == 'IdOnly'
+    assert item_shape.find('{*}IncludeMimeContent') is None
+    assert [element.get('FieldURI') for element in item_shape.iter('{*}FieldURI')] == ['item:Subject', 'message:From', 'postitem:PostedTime']
+    with pytest.raises(ValueError):
+        SyncFolderItems('AQApAHRwA==', additional_properties=['item:Unknown'])
+
+
+@pytest.mark.parametrize('stream_changes', [False, True])
+def test_sync_folder_items_follows_sync_state(monkeypatch, authentication, fake_response, stream_changes):
+    sync, sent_states = _sync_folder_items(monkeypatch, fake_response, stream_changes=stream_changes)
+    changes = iter(sync)
+    assert [next(changes), next(changes)] == EXPECTED_CHANGES[:2]
+    assert sync.sync_state is None
+    assert list(changes) == EXPECTED_CHANGES[2:]
+    assert sync.sync_state == 'STATE2'
+    assert sent_states == [None, 'STATE1']
+
+
+def test_sync_folder_items_commits_state_after_each_batch(monkeypatch, authentication, fake_response):
+    from pyews import MemorySyncStateStore
+    store = MemorySyncStateStore()
+    sync, sent_states = _sync_folder_items(monkeypatch, fake_response, sync_state_store=store)
+    changes = iter(sync)
+    next(changes)
+    next(changes)
+    assert store.get('user@company.com', 'AQApAHRwA==') is None
+    assert list(changes) == EXPECTED_CHANGES[2:]
+    assert store.get('user@company.com', 'AQApAHRwA==') == 'STATE2'
+
+    store.set('user@company.com', 'AQApAHRwA==', 'STATE1')
+    sync, sent_states = _sync_folder_items(monkeypatch, fake_response, sync_state_store=store)
+    assert list(sync) == EXPECTED_CHANGES[2:]
+    assert sent_states == ['STATE1']
+
+
+def test_sync_folder_items_run_returns_a_single_batch(monkeypatch, authentication, fake_response):
+    import pyews.ews
+    from pyews import Authentication, EWS
+    sync, sent_states = _sync_folder_items(monkeypatch, fake_response)
+    response = sync.run()
+    assert [list(changes) for changes in response] == [['create']]
+    assert len(response[0]['create']) == 2
+    assert sent_states == [None]
+    class FakeSyncFolderItems:
+        def __init__(self, folder_id, **kwargs):
+            pass
+        def run(self):
+            return response
+    monkeypatch.setattr(pyews.ews, 'SyncFolderItems', FakeSyncFolderItems)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication
+    assert ews.sync_folder_items('AQApAHRwA==') is response
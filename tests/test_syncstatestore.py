@@ -0,0 +1,86 @@
+def test_sqlite_sync_state_store_persists_states(tmp_path):
+    from pyews import SQLiteSyncStateStore
+    path = str(tmp_path / 'sync_state.db')
+    store = SQLiteSyncStateStore(path=path)
+    assert store.get('user@company.com', 'AQApAHRwA==') is None
+    store.set('User@Company.com', 'AQApAHRwA==', 'STATE1')
+    store.set('user@company.com', 'AQApAHRwA==', 'STATE2')
+    store.set('other@company.com', 'AQApAHRwA==', 'OTHER')
+    store.close()
+    store = SQLiteSyncStateStore(path=path)
+    assert store.get('user@company.com', 'AQApAHRwA==') == 'STATE2'
+    assert store.get('other@company.com', 'AQApAHRwA==') == 'OTHER'
+    store.delete('user@company.com', 'AQApAHRwA==')
+    assert store.get('user@company.com', 'AQApAHRwA==') is None
+
+
+def test_memory_sync_state_store():
+    from pyews import MemorySyncStateStore
+    store = MemorySyncStateStore()
+    store.set('user@company.com', 'hierarchy:*', 'STATE1')
+    assert store.get('USER@company.com', 'hierarchy:*') == 'STATE1'
+    store.delete('user@company.com', 'hierarchy:*')
+    assert store.get('user@company.com', 'hierarchy:*') is None
+
+
+def test_sync_folder_hierarchy_is_full_without_a_store(monkeypatch, fake_response):
+    from pyews import Authentication, EWS, EndpointCache, SyncFolderHierarchy, MemorySyncStateStore
+
+    content = (
+        b'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+        b'<m:SyncFolderHierarchyResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages"><m:ResponseMessages>'
+        b'<m:SyncFolderHierarchyResponseMessage ResponseClass="Success"><m:ResponseCode>NoError</m:ResponseCode>'
+        b'<m:SyncState>STATE1</m:SyncState><m:IncludesLastFolderInRange>true</m:IncludesLastFolderInRange><m:Changes/>'
+        b'</m:SyncFolderHierarchyResponseMessage></m:ResponseMessages></m:SyncFolderHierarchyResponse></s:Body></s:Envelope>'
+    )
+
+    sent = []
+    def send(self, endpoint, version, stream=False):
+        sent.append(self.soap().find('{*}SyncState'))
+        return fake_response(content)
+    monkeypatch.setattr(SyncFolderHierarchy, '_send', send)
+    ews = EWS.__new__(EWS)
+    ews.authentication = Authentication.scoped()
+    ews.authentication.credentials = ('user@company.com', 'mypassword')
+    ews.authentication.endpoint_cache = EndpointCache()
+    assert ews.authentication.sync_state_store is None
+    list(ews.iter_sync_folder_hierarchy())
+    list(ews.iter_sync_folder_hierarchy())
+    assert sent == [None, None]
+    ews.authentication.sync_state_store = MemorySyncStateStore()
+    list(ews.iter_sync_folder_hierarchy())
+    list(ews.iter_sync_folder_hierarchy())
+    assert sent[-1].text == 'STATE1'
+
+
+def test_sync_folder_hierarchy_commits_state_after_the_changes_are_processed(monkeypatch, fake_response):
+    from pyews import Authentication, EndpointCache, SyncFolderHierarchy, MemorySyncStateStore
+
+    content = (
+        b'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+        b'<m:SyncFolderHierarchyResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" '
+        b'xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types"><m:ResponseMessages>'
+        b'<m:SyncFolderHierarchyResponseMessage ResponseClass="Success"><m:ResponseCode>NoError</m:ResponseCode>'
+        b'<m:SyncState>STATE2</m:SyncState><m:IncludesLastFolderInRange>true</m:IncludesLastFolderInRange><m:Changes>'
+        b'<t:Create><t:Folder><t:FolderId Id="AAA" ChangeKey="1"/><t:DisplayName>Inbox</t:DisplayName></t:Folder></t:Create>'
+        b'</m:Changes></m:SyncFolderHierarchyResponseMessage></m:ResponseMessages></m:SyncFolderHierarchyResponse></s:Body></s:Envelope>'
+    )
+
+    monkeypatch.setattr(SyncFolderHierarchy, '_send', lambda self, endpoint, version, stream=False: fake_response(content))
+    authentication = Authentication.scoped()
+    authentication.credentials = ('user@company.com', 'mypassword')
+    authentication.endpoint_cache = EndpointCache()
+    store = MemorySyncStateStore()
+    with authentication.bind():
+        sync_folder_hierarchy = SyncFolderHierarchy(sync_state_store=store)
+        store.set(sync_folder_hierarchy._mailbox, sync_folder_hierarchy._sync_state_key, 'STATE1')
+        assert sync_folder_hierarchy.run()
+        assert store.get(sync_folder_hierarchy._mailbox, sync_folder_hierarchy._sync_state_key) == 'STATE1'
+        try:
+            for change in SyncFolderHierarchy(sync_state_store=store):
+                raise RuntimeError('processing failed')
+        except RuntimeError:
+            pass
+        assert store.get(sync_folder_hierarchy._mailbox, sync_folder_hierarchy._sync_state_key) == 'STATE1'
+        assert len(list(SyncFolderHierarchy(sync_state_store=store))) == 1
+        assert store.get(sync_folder_hierarchy._mailbox, sync_folder_hierarchy._sync_state_key) == 'STATE2'
@@ -0,0 +1,73 @@
+import time
+import threading
+
+
+def test_token_cache_reuses_token_until_expiry():
+    from pyews import TokenCache
+    token_cache = TokenCache(refresh_margin=300)
+    calls = []
+    def fetch():
+        calls.append('fetch')
+        return {'access_token': 'token{}'.format(len(calls)), 'expires_in': '3599'}
+    assert token_cache.get(fetch) == 'token1'
+    assert token_cache.get(fetch) == 'token1'
+    assert calls == ['fetch']
+    token_cache.expires_at = time.time() + 60
+    assert token_cache.get(fetch) == 'token2'
+    assert calls == ['fetch', 'fetch']
+
+
+def test_token_cache_refreshes_with_refresh_token():
+    from pyews import TokenCache
+    token_cache = TokenCache()
+    token_cache.set({'access_token': 'first', 'refresh_token': 'refresh', 'expires_at': time.time() - 1})
+    refreshed = []
+    def refresh(refresh_token):
+        refreshed.append(refresh_token)
+        return {'access_token': 'second', 'expires_in': 3600}
+    def fetch():
+        raise AssertionError('fetch should not be called')
+    assert token_cache.get(fetch, refresh) == 'second'
+    assert refreshed == ['refresh']
+    assert token_cache.refresh_token == 'refresh'
+
+
+def test_token_cache_falls_back_to_fetch_when_refresh_fails():
+    from pyews import TokenCache
+    token_cache = TokenCache()
+    token_cache.set({'access_token': 'first', 'refresh_token': 'refresh', 'expires_at': time.time() - 1})
+    def refresh(refresh_token):
+        raise ValueError('invalid_grant')
+    assert token_cache.get(lambda: {'access_token': 'fetched', 'expires_in': 3600}, refresh) == 'fetched'
+    assert token_cache.refresh_token is None
+
+
+def test_token_cache_fetches_once_across_threads():
+    from pyews import TokenCache
+    token_cache = TokenCache()
+    calls = []
+    def fetch():
+        calls.append('fetch')
+        time.sleep(0.05)
+        return {'access_token': 'token', 'expires_in': 3600}
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(token_cache.get(fetch))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['token'] * 10
+    assert calls == ['fetch']
+
+
+def test_auth_header_does_not_reset_authentication():
+    from pyews import Authentication
+    authentication = Authentication.scoped()
+    authentication.credentials = ('user@company.com','mypassword')
+    authentication.ews_url = 'https://outlook.office365.com/EWS/Exchange.asmx'
+    authentication.access_token = 'cached'
+    header = authentication.auth_header
+    assert header['Authorization'] == 'Bearer cached'
+    header['content-type'] = 'text/xml'
+    assert 'content-type' not in authentication.auth_header
+    assert authentication.ews_url == ['https://outlook.office365.com/EWS/Exchange.asmx']